@@ -0,0 +1,61 @@
+#!/usr/bin/env python-sirius
+"""Frame rate of SiriusImageView with calibration grid on and off.
+
+Each frame goes through SiriusImageView.process_image, is set on the
+image item and rendered, which is what PyDMImageView does on each
+redraw. Run with QT_QPA_PLATFORM=offscreen to benchmark without a
+display.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from qtpy.QtWidgets import QApplication
+
+from siriushla.common.cam_basler import SiriusImageView
+
+HEIGHT, WIDTH = 2048, 2448
+NR_FRAMES = 50
+
+
+def _frame_rate(view, frames):
+    item = view.getImageItem()
+    t0 = time.time()
+    for img in frames:
+        img = view.process_image(img)
+        item.setImage(img, autoLevels=False)
+        # build QImages as done when items are painted: the overlay is
+        # only rendered again if its image changed
+        item.render()
+        overlay = view._calibration_grid_item
+        if overlay.isVisible() and overlay.qimage is None:
+            overlay.render()
+    return len(frames) / (time.time() - t0)
+
+
+def main():
+    """Run benchmark."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    view = SiriusImageView()
+    view.readingOrder = view.ReadingOrder.Clike
+    rng = np.random.default_rng(0)
+    frames = [
+        rng.integers(0, 4096, (HEIGHT, WIDTH), dtype=np.uint16)
+        for _ in range(4)]
+    frames = (frames * (NR_FRAMES // len(frames) + 1))[:NR_FRAMES]
+
+    grid = frames[0].ravel()
+    view.calibrationGrid = np.r_[WIDTH, grid]
+
+    for show in (False, True):
+        view.showCalibrationGrid(show)
+        rate = _frame_rate(view, frames)
+        print('grid {0:3s}: {1:6.1f} frames/s ({2:d}x{3:d} pixels)'.format(
+            'on' if show else 'off', rate, WIDTH, HEIGHT))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
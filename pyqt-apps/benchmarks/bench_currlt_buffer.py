@@ -0,0 +1,98 @@
+#!/usr/bin/env python-sirius
+"""Cost of updating the current and lifetime window buffer curves.
+
+The lifetime IOC publishes a window of the last current samples, with
+timestamps relative to the time of publication, that slides by a few
+samples at each update. The window timestamps are converted to absolute
+time at reception, with some jitter, as done by CurrLTWindow. The
+previous fill_curve_buffer, which allocated a new buffer and computed
+the extrema in Python, is compared to the current fill_curve_buffer and
+to update_curve_buffer, which appends only the new samples. No PV is
+needed.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from qtpy.QtWidgets import QApplication
+
+from siriushla.widgets import SiriusTimePlot
+
+BUFFER_SIZE = 100000
+SMPL_INTVL = 0.1  # [s]
+NEW_SMPLS = 5  # per update
+NR_UPDATES = 50
+
+
+def _legacy_fill_curve_buffer(graph, curve, datax, datay, factor=None):
+    """Previous implementation."""
+    nrpts = len(datax)
+    if not nrpts:
+        return
+    buff = np.zeros((2, graph.bufferSize), order='f', dtype=float)
+    if nrpts > graph.bufferSize:
+        smpls2discard = nrpts - graph.bufferSize
+        datax = datax[smpls2discard:]
+        datay = datay[smpls2discard:]
+        nrpts = len(datax)
+    firstsmpl2fill = graph.bufferSize - nrpts
+    buff[0, firstsmpl2fill:] = datax
+    buff[1, firstsmpl2fill:] = datay
+    if factor:
+        buff[1, firstsmpl2fill:] /= factor
+    curve.data_buffer = buff
+    curve.points_accumulated = nrpts
+    curve._min_y_value = min(datay)
+    curve._max_y_value = max(datay)
+    curve.latest_value = datay[-1]
+
+
+def _windows():
+    """Yield IOC windows converted to absolute time."""
+    rng = np.random.default_rng(0)
+    nrtot = BUFFER_SIZE + NEW_SMPLS*NR_UPDATES
+    values = 100 - 1e-4*np.arange(nrtot) + 1e-3*rng.standard_normal(nrtot)
+    tstamps = SMPL_INTVL * np.arange(nrtot)
+    for i in range(NR_UPDATES + 1):
+        last = BUFFER_SIZE + NEW_SMPLS*i
+        now = tstamps[last-1]
+        reltime = tstamps[last-BUFFER_SIZE:last] - now
+        recv = now + 5e-3*rng.random()
+        yield reltime + recv, values[last-BUFFER_SIZE:last]
+
+
+def _update_cost(graph, method):
+    curve = graph.curveAtIndex(0)
+    curve.initialize_buffer()
+    windows = list(_windows())
+    method(curve, *windows[0])
+    tini = time.time()
+    for datax, datay in windows[1:]:
+        method(curve, datax, datay)
+    return 1000 * (time.time() - tini) / NR_UPDATES
+
+
+def main():
+    """Run benchmark."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    graph = SiriusTimePlot()
+    graph.bufferSize = BUFFER_SIZE
+    graph.addYChannel(y_channel='FAKE:DCCTBuffer', name='DCCTBuffer')
+
+    methods = (
+        ('legacy fill', lambda *args: _legacy_fill_curve_buffer(
+            graph, *args)),
+        ('fill', graph.fill_curve_buffer),
+        ('update', graph.update_curve_buffer),
+    )
+    for name, method in methods:
+        cost = _update_cost(graph, method)
+        print('{0:12s}: {1:8.2f} ms per update'.format(name, cost))
+    graph.deleteLater()
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python-sirius
+"""Update latency of DCCTMonitor raw readings smoothing.
+
+Each update adds a new raw readings waveform to the smoothing buffer
+and computes the smoothed curve, as done by DCCTMonitor on each new
+RawReadings-Mon value. The previous implementation, a list of
+waveforms converted to an array on each update, is compared to
+SmoothingBuffer for several numbers of acquisitions. No PV is needed.
+"""
+
+import time
+
+import numpy as np
+
+from siriushla.widgets import SmoothingBuffer
+
+NR_SAMPLES = 10000
+NR_ACQS = (10, 100, 1000)
+NR_UPDATES = 50
+
+
+class _LegacyBuffer:
+    """Previous implementation: list of waveforms."""
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = list()
+
+    def update(self, data, method):
+        self.buffer.append(data)
+        if len(self.buffer) > self.size:
+            self.buffer.pop(0)
+        buff = np.array(self.buffer, dtype=float)
+        if method == 'Average':
+            return np.mean(buff, axis=0)
+        return np.median(buff, axis=0)
+
+
+class _RingBuffer:
+    """Current implementation."""
+
+    def __init__(self, size):
+        self.buffer = SmoothingBuffer(size)
+
+    def update(self, data, method):
+        self.buffer.append(data)
+        if method == 'Average':
+            return self.buffer.average()
+        return self.buffer.median()
+
+
+def _latency(cls, size, waveforms, method):
+    buff = cls(size)
+    # fill buffer first, as in steady state operation
+    for i in range(size):
+        buff.update(waveforms[i % len(waveforms)], 'Average')
+    tini = time.time()
+    for i in range(NR_UPDATES):
+        fdata = buff.update(waveforms[i % len(waveforms)], method)
+    return 1000 * (time.time() - tini) / NR_UPDATES, fdata
+
+
+def main():
+    """Run benchmark."""
+    rng = np.random.default_rng(0)
+    waveforms = rng.normal(size=(NR_UPDATES, NR_SAMPLES))
+    print('{0:d} samples per waveform, latency per update [ms]'.format(
+        NR_SAMPLES))
+    print('{0:>6s}  {1:>8s}  {2:>10s}  {3:>10s}'.format(
+        'acqs', 'method', 'list', 'ring'))
+    for size in NR_ACQS:
+        for method in ('Average', 'Median'):
+            legacy, ref = _latency(_LegacyBuffer, size, waveforms, method)
+            current, res = _latency(_RingBuffer, size, waveforms, method)
+            if not np.allclose(ref, res):
+                raise ValueError('Smoothed curves differ.')
+            print('{0:6d}  {1:>8s}  {2:10.2f}  {3:10.2f}'.format(
+                size, method, legacy, current))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python-sirius
+"""Redraw cost per frame of the ICT monitor raw readings graph.
+
+The graph has the RawPulse and RawNoise curves. In each frame one of
+them receives a new waveform, as the two PVs update independently,
+and the plot redraws its curves. The previous curve implementation,
+which converted both waveforms at every redraw, is compared to the
+current one. Painting is not included. No PV is needed.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from qtpy.QtWidgets import QApplication
+from pydm.widgets.waveformplot import WaveformCurveItem
+
+from siriushla.as_di_icts import ICT_monitor
+from siriushla.as_di_icts.ICT_monitor import _MyWaveformPlot
+
+NR_POINTS = 1000
+NR_FRAMES = 2000
+
+
+class _LegacyCurveItem(WaveformCurveItem):
+    """Previous implementation."""
+
+    def redrawCurve(self):
+        if self.y_waveform is None:
+            return
+        npts = ICT_monitor.POINTS_TO_PLOT
+        if self.x_waveform is None:
+            self.setData(y=self.y_waveform[0:npts].astype(np.float_))
+            return
+        self.setData(x=self.x_waveform[0:npts].astype(np.float_),
+                     y=self.y_waveform[0:npts].astype(np.float_))
+        self.needs_new_x = True
+        self.needs_new_y = True
+
+
+class _LegacyPlot(_MyWaveformPlot):
+
+    def createCurveItem(self, *args, **kwargs):
+        return _LegacyCurveItem(*args, **kwargs)
+
+
+def _redraw_cost(graph, waveforms):
+    curves = [graph.curveAtIndex(0), graph.curveAtIndex(1)]
+    for curve in curves:
+        curve.receiveYWaveform(waveforms[0])
+    graph.redrawPlot()
+
+    tini = time.time()
+    for i in range(NR_FRAMES):
+        curves[i % 2].receiveYWaveform(waveforms[i % len(waveforms)])
+        graph.redrawPlot()
+    return 1e6 * (time.time() - tini) / NR_FRAMES
+
+
+def main():
+    """Run benchmark."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = np.random.default_rng(0)
+    waveforms = [
+        rng.integers(-2**15, 2**15, NR_POINTS, dtype=np.int32)
+        for _ in range(16)]
+    for cls in (_LegacyPlot, _MyWaveformPlot):
+        graph = cls()
+        graph.addChannel(y_channel='', name='RawPulse', color='blue')
+        graph.addChannel(y_channel='', name='RawNoise', color='red')
+        cost = _redraw_cost(graph, waveforms)
+        print('{0:15s}: {1:8.1f} us per frame'.format(cls.__name__, cost))
+        graph.deleteLater()
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python-sirius
+"""Redraw time of SiriusWaveformPlot curves vs. waveform length.
+
+A waveform is set on a curve of a SiriusWaveformPlot, as done when a
+new value arrives, and the plot is painted. Then the view is zoomed
+and painted again. Times are measured with decimation for display on
+and off. No PV is needed. Run with QT_QPA_PLATFORM=offscreen to
+benchmark without a display.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from qtpy.QtWidgets import QApplication
+
+from siriushla.widgets import SiriusWaveformPlot
+
+LENGTHS = (1000, 10000, 100000, 500000, 2000000)
+NR_REDRAWS = 10
+
+
+def _create_graph(decimation):
+    graph = SiriusWaveformPlot()
+    graph.decimation = decimation
+    graph.setAutoRangeX(True)
+    graph.setAutoRangeY(True)
+    graph.addChannel(y_channel='', name='curve', color='blue')
+    graph.resize(1200, 400)
+    graph.show()
+    return graph
+
+
+def _redraw_times(app, graph, waveforms):
+    curve = graph.curveAtIndex(0)
+    size = waveforms[0].size
+
+    tini = time.time()
+    for wfm in waveforms:
+        curve.receiveYWaveform(wfm)
+        graph.redrawPlot()
+        graph.viewport().repaint()
+    data = (time.time() - tini) / len(waveforms)
+
+    graph.setAutoRangeX(False)
+    tini = time.time()
+    for i in range(NR_REDRAWS):
+        wid = size / (2 + i)
+        graph.plotItem.setXRange(size/2 - wid/2, size/2 + wid/2, padding=0)
+        graph.viewport().repaint()
+    zoom = (time.time() - tini) / NR_REDRAWS
+    graph.setAutoRangeX(True)
+    app.processEvents()
+    return 1000*data, 1000*zoom
+
+
+def main():
+    """Run benchmark."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = np.random.default_rng(0)
+    print('{0:>9s}  {1:>21s}  {2:>21s}'.format(
+        'points', 'new data [ms]', 'zoom [ms]'))
+    print('{0:>9s}  {1:>10s} {2:>10s}  {1:>10s} {2:>10s}'.format(
+        '', 'full', 'decimated'))
+    for size in LENGTHS:
+        waveforms = [
+            np.cumsum(rng.normal(size=size)) for _ in range(NR_REDRAWS)]
+        times = []
+        for decimation in (False, True):
+            graph = _create_graph(decimation)
+            app.processEvents()
+            times.extend(_redraw_times(app, graph, waveforms))
+            graph.close()
+            graph.deleteLater()
+            app.processEvents()
+        print('{0:9d}  {1:10.1f} {3:10.1f}  {2:10.1f} {4:10.1f}'.format(
+            size, *times))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python-sirius
+"""Latency of font size changes in large Sirius windows.
+
+Windows with the widget counts of the SI power supplies and timing
+control windows are built from plain widgets and a few plots, so no
+PV is needed. The font size is changed by the previous method, which
+set the font on each child widget, and by SiriusMainWindow
+changeFontSize, which propagates the font from the window while its
+central widget is hidden. The time reported includes processing the
+resulting layout and paint events. Run with QT_QPA_PLATFORM=offscreen to
+benchmark without a display.
+"""
+
+import sys
+import time
+
+from qtpy.QtWidgets import QApplication, QWidget, QGridLayout, QLabel, \
+    QPushButton, QLineEdit, QCheckBox, QScrollArea
+
+from siriushla.widgets import SiriusMainWindow, SiriusWaveformPlot
+
+# (name, rows, widgets per row, plots)
+WINDOWS = (
+    ('SI PS control', 1300, 12, 0),
+    ('SI timing', 600, 24, 0),
+    ('SI orbit', 320, 8, 8),
+)
+NR_CHANGES = 4
+_WIDGET_TYPES = (QLabel, QLabel, QPushButton, QLineEdit, QCheckBox, QLabel)
+
+
+def _create_window(rows, cols, plots):
+    win = SiriusMainWindow()
+    cwid = QWidget()
+    lay = QGridLayout(cwid)
+    for row in range(rows):
+        for col in range(cols):
+            wtype = _WIDGET_TYPES[col % len(_WIDGET_TYPES)]
+            wid = wtype(str(row)) if wtype != QLineEdit else wtype()
+            lay.addWidget(wid, row, col)
+    for idx in range(plots):
+        graph = SiriusWaveformPlot(cwid)
+        graph.setLabel('bottom', 'BPM index')
+        graph.setShowLegend(True)
+        graph.addChannel(y_channel='', name='curve', color='blue')
+        lay.addWidget(graph, rows + idx, 0, 1, cols)
+    scr = QScrollArea(win)
+    scr.setWidget(cwid)
+    scr.setWidgetResizable(True)
+    win.setCentralWidget(scr)
+    return win
+
+
+def _legacy_change_font_size(win):
+    """Previous implementation: set font on every child."""
+    fontsize = win.app.font().pointSize()
+    win.ensurePolished()
+    for wid in win.findChildren(QWidget):
+        font = wid.font()
+        font.setPointSize(fontsize)
+        wid.setFont(font)
+    win.adjustSize()
+
+
+def _latency(app, win, method):
+    base = app.font().pointSize()
+    times = []
+    for i in range(NR_CHANGES):
+        font = app.font()
+        font.setPointSize(base + (1 if i % 2 == 0 else 0))
+        app.setFont(font)
+        t0 = time.time()
+        method(win)
+        app.processEvents()
+        times.append(time.time() - t0)
+    return 1000 * sum(times) / len(times)
+
+
+def main():
+    """Run benchmark."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    for name, rows, cols, plots in WINDOWS:
+        win = _create_window(rows, cols, plots)
+        win.show()
+        app.processEvents()
+        nrwids = len(win.findChildren(QWidget))
+        legacy = _latency(app, win, _legacy_change_font_size)
+        win.close()
+        win.deleteLater()
+        app.processEvents()
+
+        win = _create_window(rows, cols, plots)
+        win.show()
+        app.processEvents()
+        current = _latency(app, win, SiriusMainWindow.changeFontSize)
+        win.close()
+        win.deleteLater()
+        app.processEvents()
+        print('{0:15s} ({1:6d} widgets): per widget {2:8.1f} ms, '
+              'propagated {3:8.1f} ms'.format(name, nrwids, legacy, current))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
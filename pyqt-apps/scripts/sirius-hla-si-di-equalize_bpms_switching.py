@@ -9,10 +9,13 @@ from siriushla.sirius_application import SiriusApplication
 from siriushla.si_di_equalize_bpms import BPMsEqualizeSwitching
 
 
-parser = _argparse.ArgumentParser(
-    description="Run BPMs Equalization Interface.")
-args = parser.parse_args()
+# analysis worker processes import this module, so the application
+# must only run in the main process.
+if __name__ == '__main__':
+    parser = _argparse.ArgumentParser(
+        description="Run BPMs Equalization Interface.")
+    args = parser.parse_args()
 
-app = SiriusApplication()
-app.open_window(BPMsEqualizeSwitching, parent=None)
-sys.exit(app.exec_())
+    app = SiriusApplication()
+    app.open_window(BPMsEqualizeSwitching, parent=None)
+    sys.exit(app.exec_())
@@ -3,6 +3,13 @@ from qtpy.QtCore import Qt, QAbstractTableModel
 from siriuspy.clientconfigdb import ConfigDBClient
 
 
+def _to_native(value):
+    """Convert numpy values to JSON serializable types."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return value
+
+
 class PVConfigurationTableModel(QAbstractTableModel):
     """Table model with PVs from a given type of configuration."""
 
@@ -14,7 +21,11 @@ class PVConfigurationTableModel(QAbstractTableModel):
         """
         super().__init__(parent)
         self._config_type = config_type
+        self._client = ConfigDBClient()
+        self._config = dict()
         self._data = list()
+        self._refs = list()
+        self._invalid = list()
         self.setupModelData()
 
     @property
@@ -22,6 +33,13 @@ class PVConfigurationTableModel(QAbstractTableModel):
         """Data."""
         return self._data
 
+    @property
+    def invalid_pvs(self):
+        """PVs whose values are not accepted by the server client."""
+        if self._invalid is None:
+            self._invalid = self._find_invalid(list(range(len(self._data))))
+        return [self._data[row][0] for row in self._invalid]
+
     @property
     def config_type(self):
         """Configuration type."""
@@ -72,10 +90,13 @@ class PVConfigurationTableModel(QAbstractTableModel):
         if self._config_type is None:
             return
         self.beginResetModel()
-        config = ConfigDBClient().get_value_from_template(self._config_type)
+        config = self._client.get_value_from_template(self._config_type)
         if 'pvs' in config:
             self._data = config['pvs']
             # self._data.sort(key=lambda x: x[0])
+        self._config = config
+        self._refs = [row[1] for row in self._data]
+        self._invalid = list()
         self.endResetModel()
 
     def flags(self, index):
@@ -99,7 +120,7 @@ class PVConfigurationTableModel(QAbstractTableModel):
             return False
 
         if column == 1:
-            self._data[row][column] = value
+            self._set_value(row, value)
             self.dataChanged.emit(index, index)
 
         if column == 2:
@@ -107,3 +128,41 @@ class PVConfigurationTableModel(QAbstractTableModel):
             self.dataChanged.emit(index, index)
 
         return True
+
+    def setValues(self, values):
+        """Set values of several rows emitting a single dataChanged.
+
+        values: list of (row, value) tuples.
+        Values are converted to JSON serializable types.
+        """
+        if not values:
+            return
+        for row, value in values:
+            self._set_value(row, value)
+        rows = [row for row, _ in values]
+        self.dataChanged.emit(
+            self.index(min(rows), 1), self.index(max(rows), 1))
+
+    def _set_value(self, row, value):
+        value = _to_native(value)
+        self._data[row][1] = value
+        self._invalid = None
+
+    def _is_valid(self, rows):
+        """Whether values of rows are accepted, others set to template."""
+        pvs = [row[:1] + [ref] + row[2:]
+               for row, ref in zip(self._data, self._refs)]
+        for row in rows:
+            pvs[row] = self._data[row]
+        config = dict(self._config, pvs=pvs)
+        return self._client.check_valid_value(config, self._config_type)
+
+    def _find_invalid(self, rows):
+        """Bisect rows to find the ones with values not accepted."""
+        if not rows or self._is_valid(rows):
+            return list()
+        if len(rows) == 1:
+            return rows
+        half = len(rows) // 2
+        return self._find_invalid(rows[:half]) + \
+            self._find_invalid(rows[half:])
@@ -1,11 +1,22 @@
 import os
-from epics import caget
+import time
+from threading import Condition
+from epics import PV
 from qtpy.QtCore import Signal, QThread
 from qtpy.QtWidgets import QDialog
 
 
 class LoadingThread(QThread):
+    """Read current values of configuration PVs.
+
+    All channels are created at once and their first monitor update is
+    used as the current value, so the whole configuration is read in
+    about one round trip. PVs without value before TIMEOUT seconds are
+    loaded as -1.
+    """
+
     VACA_PREFIX = os.environ.get('VACA_PREFIX', default='')
+    TIMEOUT = 2.0
 
     taskUpdated = Signal(int)
     taskFinished = Signal(int)
@@ -15,16 +26,45 @@ class LoadingThread(QThread):
         self.name = name
         self.pv_list = pv_list
         self.parent = parent
+        self._cond = Condition()
+        self._values = dict()
 
     def run(self):
+        self._values = dict()
+        pvnames = {self.VACA_PREFIX + pvn['name'] for pvn in self.pv_list}
+        pvs = [PV(pvn, form='native', callback=self._callback_value)
+               for pvn in pvnames]
+
+        nr_read = 0
+        tini = time.time()
+        with self._cond:
+            while True:
+                if len(self._values) != nr_read:
+                    nr_read = len(self._values)
+                    self.taskUpdated.emit(nr_read)
+                remain = self.TIMEOUT - (time.time() - tini)
+                if nr_read == len(pvs) or remain <= 0:
+                    break
+                self._cond.wait(remain)
+            read = self._values
+
+        for pv in pvs:
+            pv.clear_callbacks()
+            pv.disconnect()
+
         values = dict()
-        for i, pvname in enumerate(self.pv_list):
-            # current_pv = ':'.join(pvname['name'].split(':')[:2]) + ':Current-RB'
-            force = caget(self.VACA_PREFIX + pvname["name"], timeout=0.3)  # readForce
-            if force is None:
-                force = -1
-            values[pvname['name']] = force
-            self.taskUpdated.emit(i + 1)
+        for pvname in self.pv_list:
+            force = read.get(self.VACA_PREFIX + pvname['name'])  # readForce
+            values[pvname['name']] = -1 if force is None else force
+        self.taskUpdated.emit(len(self.pv_list))
 
         self.parent._model.loadConfiguration(name=self.name, values=values)
         self.taskFinished.emit(QDialog.Accepted)
+
+    def _callback_value(self, pvname, value, **kws):
+        if value is None:
+            return
+        with self._cond:
+            if pvname not in self._values:
+                self._values[pvname] = value
+                self._cond.notify()
@@ -1,17 +1,15 @@
 """Read configuration window."""
 import logging
-import time
 
 from qtpy.QtCore import Slot
 from qtpy.QtGui import QKeySequence, QKeyEvent
 from qtpy.QtWidgets import QWidget, QComboBox, QPushButton, \
     QVBoxLayout, QTableView, QMessageBox, QApplication
 
-from siriuspy.envars import VACA_PREFIX as _VACA_PREFIX
 from siriuspy.clientconfigdb import ConfigDBException, ConfigDBClient
 from siriushla.widgets.windows import SiriusMainWindow
 from siriushla.common.epics.wrapper import PyEpicsWrapper
-from siriushla.common.epics.task import EpicsConnector, EpicsGetter
+from siriushla.common.epics.task import EpicsBulkGetter
 from siriushla.widgets.dialog import ReportDialog, ProgressDialog
 from ..models import ConfigPVsTypeModel, PVConfigurationTableModel
 from .. import SaveConfigDialog
@@ -127,46 +125,53 @@ class ReadAndSaveConfig2ServerWindow(SiriusMainWindow):
     @Slot()
     def _read(self):
         failed_items = []
-        tbl_data = self._table.model().model_data
+        model = self._table.model()
+        tbl_data = model.model_data
         # Get PVs
-        vp = _VACA_PREFIX
-        pvs = {data[0]: i for i, data in enumerate(tbl_data)}
+        pvsl = [data[0] for data in tbl_data]
         defvals = [data[1] for data in tbl_data]
-        if len(pvs) != len(tbl_data):
+        if len(set(pvsl)) != len(pvsl):
             QMessageBox.warning(
                 self, 'Error', 'Configuration has duplicated values')
             return
         # Create thread to read PVs
-        pvsl = list(pvs)
-        connt = EpicsConnector(pvsl, self._wrapper, parent=self)
-        task = EpicsGetter(pvsl, defvals, self._wrapper, parent=self)
-        task.itemRead.connect(
-            lambda pv, value: self._fill_value(pvs[pv.replace(vp, '')], value))
+        task = EpicsBulkGetter(pvsl, defvals, self._wrapper, parent=self)
+        task.itemsRead.connect(model.setValues)
         task.itemNotRead.connect(failed_items.append)
         # Show progress dialog
-        time.sleep(1)
-        dlg = ProgressDialog(
-            ['Connecting to PVs', 'Reading PVs...'], [connt, task], self)
+        dlg = ProgressDialog('Reading PVs...', task, self)
         ret = dlg.exec_()
         if ret == dlg.Rejected:
             return
-        # Show failed items
-        for item in failed_items:
-            self.logger.warn('Failed to get {}'.format(item))
-        self._report = ReportDialog(failed_items, self)
-        self._report.show()
         self._table.resizeColumnsToContents()
-        # if not failed_items:
         self._save_btn.setEnabled(True)
-
-    @Slot()
-    def _fill_value(self, row, value):
-        self.logger.debug('Setting value {} in row {}'.format(value, row))
-        index = self._table.model().createIndex(row, 1)
-        self._table.model().setData(index, value)
+        # values are validated as they are read
+        invalid = model.invalid_pvs
+        if not failed_items and not invalid:
+            self._save()
+            return
+        # Show failed items
+        for item in failed_items:
+            self.logger.warning('Failed to get {}'.format(item))
+        if failed_items:
+            self._report = ReportDialog(failed_items, self)
+            self._report.show()
+        if invalid:
+            self._report_invalid(invalid)
+
+    def _report_invalid(self, invalid):
+        for item in invalid:
+            self.logger.warning('Invalid value for {}'.format(item))
+        self._invalid_report = ReportDialog(
+            invalid, self, header='PVs with invalid values')
+        self._invalid_report.show()
 
     def _save(self):
         config_type = self._type_cb.currentText()
+        invalid = self._table.model().invalid_pvs
+        if invalid:
+            self._report_invalid(invalid)
+            return
 
         success = False
         error = ''
@@ -700,7 +700,7 @@ class CurrLTWindow(SiriusMainWindow):
             if not self._flag_need_bpmy and not self._flag_need_bpmx:
                 if len(self.bpm_wavx) != len(self.bpm_wavy):
                     return
-                self.graph.fill_curve_buffer(
+                self.graph.update_curve_buffer(
                     self._curve_bpm_buff, self.bpm_wavx, self.bpm_wavy)
                 self._flag_need_bpmx = True
                 self._flag_need_bpmy = True
@@ -714,7 +714,7 @@ class CurrLTWindow(SiriusMainWindow):
             if not self._flag_need_dccty and not self._flag_need_dcctx:
                 if len(self.dcct_wavx) != len(self.dcct_wavy):
                     return
-                self.graph.fill_curve_buffer(
+                self.graph.update_curve_buffer(
                     self._curve_dcct_buff, self.dcct_wavx, self.dcct_wavy)
                 self._flag_need_dcctx = True
                 self._flag_need_dccty = True
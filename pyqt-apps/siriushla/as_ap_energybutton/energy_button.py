@@ -1,19 +1,17 @@
 """Interface to set dipole energies with constant normalization."""
 
-from qtpy.QtCore import Slot, QVariant
 from qtpy.QtWidgets import QVBoxLayout, QWidget, QPushButton, \
     QHBoxLayout, QLabel
 from qtpy.QtGui import QPalette, QColor
 
 from siriuspy.envars import VACA_PREFIX as _VACA_PREFIX
 from siriuspy.namesys import SiriusPVName as _PVName
-from siriushla.common.epics.task import EpicsConnector, EpicsSetter, \
-    EpicsChecker, EpicsGetter, EpicsWait
 from siriushla.widgets.dialog import ReportDialog, ProgressDialog
 from siriushla.widgets import PVNameTree, QDoubleSpinBoxPlus, SiriusLabel
 from siriushla.util import get_appropriate_color
 
 from .set_energy import init_section
+from .energy_changer import EnergyChanger
 
 
 class EnergyButton(QWidget):
@@ -24,8 +22,6 @@ class EnergyButton(QWidget):
         super().__init__(parent)
         self._section = section
         self.dips, self.mags = init_section(section.upper())
-        self._items_fail = []
-        self._items_success = []
         self._setup_ui()
         color = QColor(get_appropriate_color(section.upper()))
         pal = self.palette()
@@ -112,9 +108,6 @@ class EnergyButton(QWidget):
             raise RuntimeError
 
     def _process(self):
-        self._items_success = []
-        self._items_fail = []
-
         # Get selected PVs
         selected_pvs = set(self._tree.checked_items())
         mags = [mag for mag in self.mags if mag in selected_pvs]
@@ -123,82 +116,20 @@ class EnergyButton(QWidget):
             report.exec_()
             return
 
-        pvs = self.dips + mags
-
-        conn = EpicsConnector(pvs, parent=self)
-        get_task = EpicsGetter(pvs, parent=self)
-        get_task.itemRead.connect(self._read_success)
-        get_task.itemNotRead.connect(self._read_fail)
-        dlg = ProgressDialog(
-            ['Connecting', 'Reading'], [conn, get_task], parent=self)
-        ret = dlg.exec_()
-        if ret == dlg.Rejected:
-            return
-        if self._items_fail:
-            failed = ['Failed to read some PVs', ]
-            failed += self._items_fail + ['Aborting!', ]
-            report = ReportDialog(failed, self)
-            report.exec_()
-            return
-
         energy = self.energy_value.value()
-        # remove dipole
-        pvs, values = zip(*self._items_success[len(self.dips):])
-        delays = [0.0, ] * len(pvs)
-        self._items_success = []
-
-        energies = [energy, ] * len(self.dips)
-        dly_dips = [0.0, ] * len(self.dips)
-        conn = EpicsConnector(self.dips, parent=self)
-        set_dip = EpicsSetter(self.dips, energies, dly_dips, parent=self)
-        sleep_task = EpicsWait([None, ]*10, wait_time=2.0, parent=self)
-        check_dip = EpicsChecker(self.dips, energies, dly_dips, parent=self)
-        check_dip.itemChecked.connect(self._check_status)
-
-        dlg = ProgressDialog(
-            ['Connecting', 'Setting Dipole', 'Waiting Dipole',
-             'Checking Dipole'],
-            [conn, set_dip, sleep_task, check_dip], parent=self)
-        ret = dlg.exec_()
-        if ret == dlg.Rejected:
-            return
-        if self._items_fail:
-            failed = ['Failed to set Dipole. Aborting!']
-            report = ReportDialog(failed, self)
-            report.exec_()
-            return
-
-        conn = EpicsConnector(pvs, parent=self)
-        set_mags = EpicsSetter(pvs, values, delays, parent=self)
-        sleep_task = EpicsWait([None, ]*10, wait_time=2.0, parent=self)
-        check_mags = EpicsChecker(pvs, values, delays, parent=self)
-        check_mags.itemChecked.connect(self._check_status)
-
-        dlg = ProgressDialog(
-            ['Connecting to Magnets', 'Setting Magnets', 'Waiting Magnets',
-             'Checking Magnets'],
-            [conn, set_mags, sleep_task, check_mags], parent=self)
+        task = EnergyChanger(self.dips, mags, energy, parent=self)
+        dlg = ProgressDialog('Changing Energy', task, parent=self)
         ret = dlg.exec_()
         if ret == dlg.Rejected:
             return
 
-        failed = []
-        if self._items_fail:
-            failed = ['Failed to set magnets:', ] + self._items_fail
-        report = ReportDialog(failed, self)
-        report.exec_()
-
-    @Slot(str)
-    def _read_fail(self, item):
-        self._items_fail.append(item)
-
-    @Slot(str, QVariant)
-    def _read_success(self, item, value):
-        self._items_success.append((item, value))
-
-    @Slot(str, bool)
-    def _check_status(self, item, status):
-        if status:
-            self._items_success.append((item, True))
+        if task.failed:
+            report = ReportDialog([task.error, ] + task.failed, self)
         else:
-            self._items_fail.append(item)
+            times = sorted(
+                ((dtime, pvn) for pvn, dtime in task.settle_times.items()),
+                reverse=True)
+            items = ['{0:s}: {1:.3f} s'.format(pvn, dtime)
+                     for dtime, pvn in times]
+            report = ReportDialog(items, self, header='Done. Settle times:')
+        report.exec_()
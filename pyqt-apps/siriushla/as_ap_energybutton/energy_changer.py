@@ -0,0 +1,198 @@
+"""Energy change task."""
+
+import time as _time
+import logging as _log
+from math import isclose as _isclose
+from threading import Condition as _Condition
+
+from epics import get_pv as _get_pv
+from qtpy.QtCore import Signal, QThread
+
+from siriuspy.namesys import SiriusPVName as _PVName
+
+
+class EnergyChanger(QThread):
+    """Set dipoles energy keeping the magnets strengths.
+
+    Setpoints of all magnets are read at once, then the dipoles energy
+    is set and the magnets setpoints are written back in a single pass.
+    Readbacks are monitored, so each step only waits until they reach
+    the setpoints. The time each readback took to settle, counted from
+    the write, is kept in `settle_times`.
+
+    Implements the task interface used by ProgressDialog.
+    """
+
+    currentItem = Signal(str)
+    itemDone = Signal()
+    completed = Signal()
+
+    TIMEOUT_CONN = 2.0
+    TIMEOUT_DIPOLE = 10.0
+    TIMEOUT_MAGNETS = 10.0
+    REL_TOL = 1e-5
+    ABS_TOL = 1e-6
+
+    def __init__(self, dips, mags, energy, parent=None):
+        """Init.
+
+        Parameters
+        ----------
+        dips - dipoles energy setpoint PV names
+        mags - magnets strength setpoint PV names
+        energy - new dipoles energy
+        parent - parent QObject [optional]
+        """
+        super().__init__(parent)
+        self._dips = list(dips)
+        self._mags = list(mags)
+        self._energy = energy
+        self._quit_task = False
+        self._cond = _Condition()
+        self._sp_pvs = dict()
+        self._rb_pvs = dict()
+        self._rb2sp = dict()
+        self._targets = dict()
+        self.values = dict()
+        self.settle_times = dict()
+        self.failed = list()
+        self.error = ''
+
+    def size(self):
+        """Task Size."""
+        return 2*len(self._dips) + 2*len(self._mags)
+
+    def exit_task(self):
+        """Set flag to exit thread."""
+        self._quit_task = True
+
+    def run(self):
+        """Thread execution."""
+        cbidx = dict()
+        try:
+            self._create_pvs()
+            for rbn, pv in self._rb_pvs.items():
+                cbidx[rbn] = pv.add_callback(self._callback_readback)
+            self._change_energy()
+        finally:
+            for rbn, idx in cbidx.items():
+                self._rb_pvs[rbn].remove_callback(idx)
+        self.completed.emit()
+
+    def _change_energy(self):
+        if not self._quit_task:
+            self.currentItem.emit('Reading setpoints...')
+            self.failed = self._read_values()
+            if self.failed:
+                self.error = 'Failed to read some PVs. Aborting!'
+                return
+
+        if not self._quit_task:
+            self.currentItem.emit('Setting dipoles energy...')
+            values = {dip: self._energy for dip in self._dips}
+            self.failed = self._set_and_wait(values, self.TIMEOUT_DIPOLE)
+            if self.failed:
+                self.error = 'Failed to set Dipole. Aborting!'
+                return
+
+        if not self._quit_task:
+            self.currentItem.emit('Setting magnets...')
+            # if the energy changed, magnets readbacks must be updated by
+            # their IOCs before they are compared to the setpoints
+            changed = any(
+                not self._isclose(self.values[dip], self._energy)
+                for dip in self._dips)
+            values = {mag: self.values[mag] for mag in self._mags}
+            self.failed = self._set_and_wait(
+                values, self.TIMEOUT_MAGNETS, check_now=not changed)
+            if self.failed:
+                self.error = 'Failed to set magnets:'
+            times = sorted(
+                ((self.settle_times[mag], mag) for mag in self._mags
+                 if mag in self.settle_times), reverse=True)
+            for dtime, mag in times[:5]:
+                _log.info('{0:s} settled in {1:.3f} s'.format(mag, dtime))
+
+    def _create_pvs(self):
+        # create all PVs first so that they connect concurrently
+        for spn in self._dips + self._mags:
+            rbn = _PVName(spn).substitute(propty_suffix='RB')
+            self._sp_pvs[spn] = _get_pv(spn)
+            self._rb_pvs[rbn] = _get_pv(rbn)
+            self._rb2sp[rbn] = spn
+
+    def _read_values(self):
+        failed = list()
+        tini = _time.time()
+        for spn, pv in self._sp_pvs.items():
+            if self._quit_task:
+                break
+            remain = max(self.TIMEOUT_CONN - (_time.time() - tini), 0.01)
+            value = None
+            if pv.wait_for_connection(remain):
+                value = pv.get(timeout=remain)
+            if value is None:
+                failed.append(spn)
+            else:
+                self.values[spn] = value
+            self.itemDone.emit()
+        return failed
+
+    def _set_and_wait(self, values, timeout, check_now=True):
+        with self._cond:
+            tini = _time.time()
+            for spn, value in values.items():
+                self._targets[spn] = (value, tini)
+                self.settle_times.pop(spn, None)
+            if check_now:
+                # readbacks may already be at the setpoints
+                self._check_readbacks()
+
+        for spn, value in values.items():
+            self._sp_pvs[spn].put(value, wait=False)
+
+        pending = set(values)
+        with self._cond:
+            while pending and not self._quit_task:
+                for spn in pending & set(self.settle_times):
+                    pending.discard(spn)
+                    self.itemDone.emit()
+                remain = timeout - (_time.time() - tini)
+                if not pending:
+                    break
+                if remain <= 0:
+                    # no monitor event is received if a readback was
+                    # updated to its previous value
+                    self._check_readbacks()
+                    pending -= set(self.settle_times)
+                    break
+                self._cond.wait(min(remain, 0.5))
+            for spn in values:
+                self._targets.pop(spn, None)
+        return sorted(pending)
+
+    def _check_readbacks(self):
+        for rbn, pv in self._rb_pvs.items():
+            self._check_readback(rbn, pv.value)
+
+    def _callback_readback(self, pvname, value, **kws):
+        with self._cond:
+            if self._check_readback(pvname, value):
+                self._cond.notify_all()
+
+    def _check_readback(self, rbname, value):
+        spn = self._rb2sp.get(rbname)
+        if spn not in self._targets or spn in self.settle_times:
+            return False
+        target, tini = self._targets[spn]
+        if not self._isclose(value, target):
+            return False
+        self.settle_times[spn] = _time.time() - tini
+        return True
+
+    def _isclose(self, value, target):
+        try:
+            return _isclose(
+                value, target, rel_tol=self.REL_TOL, abs_tol=self.ABS_TOL)
+        except TypeError:
+            return False
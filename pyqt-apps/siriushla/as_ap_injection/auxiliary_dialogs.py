@@ -2,13 +2,13 @@
 
 import numpy as _np
 
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QObject, Signal
 from qtpy.QtGui import QColor
 from qtpy.QtWidgets import QVBoxLayout, QHBoxLayout, QGridLayout, \
     QTabWidget, QWidget, QLabel, QGroupBox, QSizePolicy as QSzPlcy, \
-    QSpacerItem
+    QSpacerItem, QGraphicsPathItem
 
-from pyqtgraph import mkBrush, FillBetweenItem
+from pyqtgraph import mkBrush, mkPen, PlotDataItem, arrayToQPath
 
 from pydm.widgets import PyDMPushButton
 
@@ -20,6 +20,83 @@ from ..widgets import SiriusDialog, SiriusWaveformPlot, \
     SiriusLedState, PyDMStateButton, SiriusConnectionSignal
 
 
+class _GPPrediction(QObject):
+    """Gaussian process model prediction with its confidence band.
+
+    Each PV is subscribed once. The band is computed only after both
+    average and standard deviation of a new model are received.
+    """
+
+    CONF_FACTOR = 1.96  # 95% confidence
+
+    predictionUpdated = Signal(
+        _np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray)
+
+    def __init__(self, inj_prefix, parent=None):
+        super().__init__(parent)
+        self._bias = None
+        self._avg = None
+        self._std = None
+        self._new_avg = False
+        self._new_std = False
+        self._band = _np.array([])
+        self._lower = _np.array([])
+        self._upper = _np.array([])
+
+        self._chn_bias = SiriusConnectionSignal(
+            inj_prefix.substitute(propty='BiasFBGPModPredBias-Mon'))
+        self._chn_bias.new_value_signal[_np.ndarray].connect(
+            self._update_bias)
+        self._chn_avg = SiriusConnectionSignal(
+            inj_prefix.substitute(propty='BiasFBGPModPredInjCurrAvg-Mon'))
+        self._chn_avg.new_value_signal[_np.ndarray].connect(
+            self._update_avg)
+        self._chn_std = SiriusConnectionSignal(
+            inj_prefix.substitute(propty='BiasFBGPModPredInjCurrStd-Mon'))
+        self._chn_std.new_value_signal[_np.ndarray].connect(
+            self._update_std)
+
+    def _update_bias(self, value):
+        self._bias = value
+        self._emit()
+
+    def _update_avg(self, value):
+        self._avg = value
+        self._new_avg = True
+        self._update_band()
+
+    def _update_std(self, value):
+        self._std = value
+        self._new_std = True
+        self._update_band()
+
+    def _update_band(self):
+        if not (self._new_avg and self._new_std):
+            return
+        self._new_avg = self._new_std = False
+        avg, std = self._avg, self._std
+        if avg.size != std.size:
+            return
+        if self._band.size != avg.size:
+            self._band = _np.empty(avg.size)
+            self._lower = _np.empty(avg.size)
+            self._upper = _np.empty(avg.size)
+        _np.multiply(std, self.CONF_FACTOR, out=self._band)
+        _np.subtract(avg, self._band, out=self._lower)
+        _np.add(avg, self._band, out=self._upper)
+        self._emit()
+
+    def _emit(self):
+        if self._bias is None or self._avg is None:
+            return
+        if self._new_avg or self._new_std:
+            return
+        if not self._bias.size == self._avg.size == self._upper.size:
+            return
+        self.predictionUpdated.emit(
+            self._bias, self._avg, self._lower, self._upper)
+
+
 class BiasFBDetailDialog(SiriusDialog):
     """Bias FB detail dialog."""
 
@@ -385,32 +462,16 @@ class BiasFBDetailDialog(SiriusDialog):
         # Bias x InjCurr: model prediction about current (check sanity)
         self.graph_pred = SiriusWaveformPlot()
         self.graph_pred.addChannel(
-            x_channel=self._inj_prefix.substitute(
-                propty='BiasFBGPModPredBias-Mon'),
-            y_channel=self._inj_prefix.substitute(
-                propty='BiasFBGPModPredInjCurrAvg-Mon'),
             name='GP with 95% Conf.', color=QColor(80, 80, 80), lineWidth=2)
+        self._curve_gp_pred_avg = self.graph_pred.curveAtIndex(-1)
 
-        self.graph_pred.addChannel(
-            x_channel=self._inj_prefix.substitute(
-                propty='BiasFBGPModPredBias-Mon'),
-            y_channel='FAKE:GP_Avg_plus_Std',
-            name='extra1', color='gray',
-            lineWidth=2, lineStyle=Qt.DashLine)
-        self.graph_pred.legend.removeItem('extra1')
-        self._curve_gp_pred_avg_p_std = self.graph_pred.curveAtIndex(-1)
-
-        self.graph_pred.addChannel(
-            x_channel=self._inj_prefix.substitute(
-                propty='BiasFBGPModPredBias-Mon'),
-            y_channel='FAKE:GP_Avg_minus_Std', name='extra2', color='gray',
-            lineWidth=2, lineStyle=Qt.DashLine)
-        self.graph_pred.legend.removeItem('extra2')
-        self._curve_gp_pred_avg_m_std = self.graph_pred.curveAtIndex(-1)
-
-        self._curve_gp_fill_std = FillBetweenItem(
-            self._curve_gp_pred_avg_p_std, self._curve_gp_pred_avg_m_std,
-            brush=mkBrush(QColor('lightGray')))
+        pen = mkPen(QColor('gray'), width=2, style=Qt.DashLine)
+        self._curve_gp_pred_avg_p_std = PlotDataItem(pen=pen)
+        self._curve_gp_pred_avg_m_std = PlotDataItem(pen=pen)
+        self._curve_gp_fill_std = QGraphicsPathItem()
+        self._curve_gp_fill_std.setBrush(mkBrush(QColor('lightGray')))
+        self._curve_gp_fill_std.setPen(mkPen(None))
+        self._curve_gp_fill_std.setZValue(-1)
 
         self.graph_pred.addChannel(
             x_channel=self._inj_prefix.substitute(
@@ -438,6 +499,8 @@ class BiasFBDetailDialog(SiriusDialog):
         self._curve_bias_vs_injcurr = curve
 
         self.graph_pred.addItem(self._curve_gp_fill_std)
+        self.graph_pred.addItem(self._curve_gp_pred_avg_p_std)
+        self.graph_pred.addItem(self._curve_gp_pred_avg_m_std)
         self.graph_pred.autoRangeX = True
         self.graph_pred.autoRangeY = True
         self.graph_pred.showXGrid = True
@@ -450,16 +513,8 @@ class BiasFBDetailDialog(SiriusDialog):
             'left', text='Inj. current [mA]', color='gray')
         self.graph_pred.setBackgroundColor(QColor(255, 255, 255))
 
-        self._chn_gp_injcurr_avg = SiriusConnectionSignal(
-            self._inj_prefix.substitute(
-                propty='BiasFBGPModPredInjCurrAvg-Mon'))
-        self._chn_gp_injcurr_std = SiriusConnectionSignal(
-            self._inj_prefix.substitute(
-                propty='BiasFBGPModPredInjCurrStd-Mon'))
-        self._chn_gp_injcurr_avg.new_value_signal[_np.ndarray].connect(
-            self._plot_gp_prediction_confidance)
-        self._chn_gp_injcurr_std.new_value_signal[_np.ndarray].connect(
-            self._plot_gp_prediction_confidance)
+        self._gp_pred = _GPPrediction(self._inj_prefix, self)
+        self._gp_pred.predictionUpdated.connect(self._plot_gp_prediction)
 
         self._chn_bias = SiriusConnectionSignal(
             self._inj_prefix.substitute(propty='MultBunBiasVolt-RB'))
@@ -470,17 +525,16 @@ class BiasFBDetailDialog(SiriusDialog):
 
         return self.graph_pred
 
-    def _plot_gp_prediction_confidance(self, _):
-        avg = self._chn_gp_injcurr_avg.value
-        std = self._chn_gp_injcurr_std.value
-        if avg is None or std is None:
-            return
-        avg = _np.asarray(avg)
-        std = _np.asarray(std)
-        if avg.size != std.size:
-            return
-        self._curve_gp_pred_avg_p_std.receiveYWaveform(avg + 1.96*std)
-        self._curve_gp_pred_avg_m_std.receiveYWaveform(avg - 1.96*std)
+    def _plot_gp_prediction(self, bias, avg, lower, upper):
+        self._curve_gp_pred_avg.receiveXWaveform(bias)
+        self._curve_gp_pred_avg.receiveYWaveform(avg)
+        self._curve_gp_pred_avg_p_std.setData(bias, upper)
+        self._curve_gp_pred_avg_m_std.setData(bias, lower)
+        # band contour: upper limit forward and lower limit backwards
+        path = arrayToQPath(
+            _np.r_[bias, bias[::-1]], _np.r_[upper, lower[::-1]])
+        path.closeSubpath()
+        self._curve_gp_fill_std.setPath(path)
 
     def _plot_bias_vs_injcurr(self, _):
         bias = self._chn_bias.value
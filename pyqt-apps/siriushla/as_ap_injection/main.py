@@ -582,7 +582,7 @@ class InjCtrlWindow(SiriusMainWindow):
     def _setupLogWidget(self):
         self._log = PyDMLogLabel(
             self, self._inj_prefix.substitute(propty='Log-Mon'),
-            ['Remaining time', ])
+            ['Remaining time', ], persist=True)
 
         wid = QGroupBox('Log')
         lay = QHBoxLayout(wid)
@@ -1,7 +1,9 @@
 #!/usr/bin/env python-sirius
 
 import logging as _log
-from threading import Thread, Event
+import time as _time
+from functools import partial as _partial
+from threading import Thread, Event, Lock, Condition
 import numpy as np
 from scipy.optimize import curve_fit
 from epics import PV
@@ -30,6 +32,9 @@ from siriushla.widgets import SiriusSpinbox, SiriusLabel, MatplotlibWidget, \
     QSpinBoxPlus, QDoubleSpinBoxPlus
 from siriushla.as_ti_control import HLTriggerSimple
 
+from .quadscan import QuadScanEngine, QuadScanHWSource, \
+    QuadScanReplaySource, ScanRecorder
+
 rcParams.update({
     'font.size': 9, 'axes.grid': True, 'grid.linestyle': '--',
     'grid.alpha': 0.5})
@@ -64,6 +69,8 @@ class EmittanceMeasure(QWidget):
         self.alphax_parf = []
         self.alphay_parf = []
         self.measurement = None
+        self._record_fname = None
+        self._replay_fname = None
         self.I_meas = None
         self.sigma = None
         self.plane_meas = None
@@ -71,8 +78,8 @@ class EmittanceMeasure(QWidget):
         self._setupUi()
 
     def meas_emittance(self):
-        self._acquire_data()
-        self._perform_analysis()
+        if self._acquire_data():
+            self._perform_analysis()
 
     def _select_experimental_setup(self):
         if self._place.lower().startswith('li'):
@@ -113,14 +120,11 @@ class EmittanceMeasure(QWidget):
             _log.warning(
                 'Number of samples must be larger than number o outliers.')
             _log.warning('Acquisition aborted.')
-            return
+            return False
         nsteps = self.spbox_steps.value()
         I_ini = self.spbox_I_ini.value()
         I_end = self.spbox_I_end.value()
 
-        outs = outlier // 2    # outliers below median
-        outg = outlier - outs  # outliers above median
-
         self.line_sigmax.set_xdata([])
         self.line_sigmax.set_ydata([])
         self.line_sigmay.set_xdata([])
@@ -130,62 +134,73 @@ class EmittanceMeasure(QWidget):
         self.fig_sigma.figure.canvas.draw()
 
         pl = 'y' if self.cbbox_plane.currentIndex() else 'x'
-        curr_list = np.linspace(I_ini, I_end, nsteps)
-        init_curr = self.quad_I_sp.value
-        sigma = []
-        I_meas = []
-        for i, I in enumerate(curr_list):
-            _log.info('setting quadrupole to {0:8.3f} A'.format(I))
-            if not SIMUL:
-                self.quad_I_sp.put(I, wait=True)
-            self._measuring.wait(5 if i else 15)
-            j = 0
-            I_tmp = []
-            sig_tmp = []
-            while j < samples:
-                if self._measuring.is_set():
-                    self.pb_stop.setEnabled(False)
-                    self.pb_start.setEnabled(True)
-                    _log.info('Stopped')
-                    return
-                _log.info('    sample {0:02d}'.format(j))
-                I_now = self.quad_I_rb.value
-                cen_x, sigma_x, cen_y, sigma_y = self.plt_image.get_params()
-                mu, sig = (cen_x, sigma_x) if pl == 'x' else (cen_y, sigma_y)
-                max_size = self.spbox_threshold.value()*1e-3
-                if sig > max_size:
-                    self._measuring.wait(1)
-                    continue
-                I_tmp.append(I_now)
-                sig_tmp.append(abs(sig))
-                self._measuring.wait(0.5)
-                j += 1
-            ind = np.argsort(sig_tmp)
-            I_tmp = np.array(I_tmp)[ind]
-            sig_tmp = np.array(sig_tmp)[ind]
-            I_meas.extend(I_tmp[outs:-outg])
-            sigma.extend(sig_tmp[outs:-outg])
-            if pl == 'x':
-                self.line_sigmax.set_xdata(I_meas)
-                self.line_sigmax.set_ydata(np.array(sigma)*1e3)
-            else:
-                self.line_sigmay.set_xdata(I_meas)
-                self.line_sigmay.set_ydata(np.array(sigma)*1e3)
-            self.fig_sigma.figure.axes[0].set_xlim(
-                    [min(I_meas)*(1-DT*10), max(I_meas)*(1+DT*10)])
-            self.fig_sigma.figure.axes[0].set_ylim(
-                    [min(sigma)*(1-DT)*1e3, max(sigma)*(1+DT)*1e3])
-            self.fig_sigma.figure.canvas.draw()
-        self._measuring.set()
-        _log.info('Returning Quad to Initial Current')
-        self.quad_I_sp.put(init_curr, wait=True)
+        if self._replay_fname:
+            source = QuadScanReplaySource(self._replay_fname)
+            curr_list = source.currents
+            pl = source.meta.get('plane', pl)
+        else:
+            source = QuadScanHWSource(
+                self.quad_I_sp, self.quad_I_rb, self.plt_image,
+                tol=self.spbox_settle_tol.value(),
+                settle_time=self.spbox_settle_time.value(),
+                simul=SIMUL)
+            curr_list = np.linspace(I_ini, I_end, nsteps)
+        init_curr = source.initial_current
+
+        recorder = None
+        if self._record_fname:
+            recorder = ScanRecorder(self._record_fname, meta=dict(
+                place=self._place, plane=pl, samples=samples,
+                outliers=outlier, initial_current=init_curr))
+
+        self.plane_meas = pl
+        engine = QuadScanEngine(
+            source, curr_list, samples, outlier,
+            self.spbox_threshold.value()*1e-3, plane=pl, recorder=recorder,
+            step_callback=self._update_scan_plot,
+            analysis_callback=self._preview_analysis,
+            stop_event=self._measuring)
+        try:
+            finished = engine.run()
+        finally:
+            source.close()
+            if recorder is not None:
+                recorder.close()
+                _log.info('Raw data recorded to ' + recorder.fname)
 
         self.pb_stop.setEnabled(False)
         self.pb_start.setEnabled(True)
+        self.pb_replay.setEnabled(True)
+        if not self._replay_fname:
+            _log.info('Returning Quad to Initial Current')
+            source.set_current(init_curr)
+        if not finished:
+            _log.info('Stopped')
+            return False
+        self._measuring.set()
         _log.info('Finished!')
-        self.I_meas = I_meas
-        self.sigma = sigma
-        self.plane_meas = pl
+        self.I_meas = engine.I_meas
+        self.sigma = engine.sigma
+        return True
+
+    def _update_scan_plot(self, I_meas, sigma):
+        line = self.line_sigmax if self.plane_meas == 'x' else \
+            self.line_sigmay
+        line.set_xdata(I_meas)
+        line.set_ydata(sigma*1e3)
+        self.fig_sigma.figure.axes[0].set_xlim(
+                [min(I_meas)*(1-DT*10), max(I_meas)*(1+DT*10)])
+        self.fig_sigma.figure.axes[0].set_ylim(
+                [min(sigma)*(1-DT)*1e3, max(sigma)*(1+DT)*1e3])
+        self.fig_sigma.figure.canvas.draw()
+
+    def _preview_analysis(self, I_meas, sigma):
+        try:
+            K1 = self._get_K1_from_I(I_meas)
+            self._thin_lens_approx(
+                K1, sigma, pl=self.plane_meas, I_meas=I_meas)
+        except Exception as err:
+            _log.warning('Preview analysis failed: {}'.format(err))
 
     def _perform_analysis(self):
         sigma = np.array(self.sigma)
@@ -238,11 +253,11 @@ class EmittanceMeasure(QWidget):
         nemit, beta, alpha, gamma = self._twiss(s_11, s_12, s_22)
         return nemit, beta, alpha
 
-    def _thin_lens_approx(self, K1, sigma, pl='x'):
+    def _thin_lens_approx(self, K1, sigma, pl='x', I_meas=None):
         K1 = K1 if pl == 'x' else -K1
         a, b, c = np.polyfit(K1, sigma*sigma, 2)
         yd = np.sqrt(np.polyval([a, b, c], K1))
-        self.line_fit.set_xdata(self.I_meas)
+        self.line_fit.set_xdata(self.I_meas if I_meas is None else I_meas)
         self.line_fit.set_ydata(yd*1e3)
         self.fig_sigma.figure.canvas.draw()
 
@@ -387,6 +402,20 @@ class EmittanceMeasure(QWidget):
         self.spbox_threshold.setValue(4)
         self.spbox_threshold.setDecimals(2)
         fl.addRow(QLabel('Max. Size Accpbl. [mm]', gb), self.spbox_threshold)
+        self.spbox_settle_tol = QDoubleSpinBoxPlus(gb)
+        self.spbox_settle_tol.setMinimum(0)
+        self.spbox_settle_tol.setMaximum(1)
+        self.spbox_settle_tol.setDecimals(3)
+        self.spbox_settle_tol.setValue(0.005)
+        fl.addRow(QLabel('Settling Tol. [A]', gb), self.spbox_settle_tol)
+        self.spbox_settle_time = QDoubleSpinBoxPlus(gb)
+        self.spbox_settle_time.setMinimum(0)
+        self.spbox_settle_time.setMaximum(15)
+        self.spbox_settle_time.setDecimals(1)
+        self.spbox_settle_time.setValue(0.5)
+        fl.addRow(QLabel('Settling Time [s]', gb), self.spbox_settle_time)
+        self.cbbox_record = QCheckBox('Record Raw Scan', gb)
+        fl.addRow(self.cbbox_record)
 
         measlay.setStretch(0, 2)
         measlay.setStretch(1, 8)
@@ -412,9 +441,12 @@ class EmittanceMeasure(QWidget):
         self.pb_save_data.clicked.connect(self.pb_save_data_clicked)
         self.pb_load_data = QPushButton('Load Raw', gb)
         self.pb_load_data.clicked.connect(self.pb_load_data_clicked)
+        self.pb_replay = QPushButton('Replay Scan', gb)
+        self.pb_replay.clicked.connect(self.pb_replay_clicked)
         hl = QHBoxLayout()
         hl.addWidget(self.pb_save_data)
         hl.addWidget(self.pb_load_data)
+        hl.addWidget(self.pb_replay)
         vl.addLayout(hl)
         self.logdisplay = PyDMLogDisplay(self, level=_log.INFO)
         vl.addWidget(self.logdisplay)
@@ -530,11 +562,35 @@ class EmittanceMeasure(QWidget):
         """
         Slot documentation goes here.
         """
-        _log.info('Starting...')
-        if self.measurement is not None and self.measurement.isAlive():
+        if self.measurement is not None and self.measurement.is_alive():
+            return
+        self._record_fname = None
+        if self.cbbox_record.isChecked():
+            fname = QFileDialog.getSaveFileName(
+                self, 'Record scan to', '', 'Scan Files (*.qscan)')
+            if not fname[0]:
+                return
+            self._record_fname = fname[0]
+        self._replay_fname = None
+        self._start_measurement()
+
+    def pb_replay_clicked(self):
+        """Replay a recorded scan, without acting on hardware."""
+        if self.measurement is not None and self.measurement.is_alive():
             return
+        fname = QFileDialog.getOpenFileName(
+            self, 'Replay scan', '', 'Scan Files (*.qscan)')
+        if not fname[0]:
+            return
+        self._record_fname = None
+        self._replay_fname = fname[0]
+        self._start_measurement()
+
+    def _start_measurement(self):
+        _log.info('Starting...')
         self.pb_stop.setEnabled(True)
         self.pb_start.setEnabled(False)
+        self.pb_replay.setEnabled(False)
         self._measuring = Event()
         self.measurement = Thread(target=self.meas_emittance, daemon=True)
         self.measurement.start()
@@ -607,6 +663,62 @@ def _fit_gaussian(x, y, amp=None, mu=None, sigma=None, y0=None):
     return p_opt
 
 
+def _fit_gaussian_linear(x, y, thres=0.05):
+    """Estimate gaussian parameters with a linearized fit.
+
+    Fit a parabola to log(y - y0) with weights proportional to y - y0,
+    which is equivalent to a gaussian fit for points well above the
+    noise, but needs a single linear least squares solution.
+    """
+    y0 = np.amin(y)
+    ycor = y - y0
+    amp = np.amax(ycor)
+    mask = ycor > amp*thres
+    if amp <= 0 or np.count_nonzero(mask) < 3:
+        mu, sigma = _calc_moments(x, y)
+        return amp, mu, sigma, y0
+    xm = x[mask]
+    ym = ycor[mask]
+    x0 = xm[np.argmax(ym)]
+    a, b, c = np.polyfit(xm - x0, np.log(ym), 2, w=ym)
+    if a >= 0:
+        mu, sigma = _calc_moments(x, y)
+        return amp, mu, sigma, y0
+    sigma = np.sqrt(-1/(2*a))
+    mu = x0 - b/(2*a)
+    amp = np.exp(c - b*b/(4*a))
+    return amp, mu, sigma, y0
+
+
+def _calc_roi(image, auto_center, roi_center, roi_size):
+    """Return projections and axes of image inside the ROI."""
+    if auto_center:
+        cen_x, _ = _calc_moments(
+            np.arange(image.shape[1]), image.sum(axis=0))
+        cen_y, _ = _calc_moments(
+            np.arange(image.shape[0]), image.sum(axis=1))
+    else:
+        cen_x, cen_y = roi_center
+    if not np.isfinite(cen_x):
+        cen_x = image.shape[1]//2
+    if not np.isfinite(cen_y):
+        cen_y = image.shape[0]//2
+
+    strt_x, end_x = np.array([-1, 1])*roi_size[0] + int(cen_x)
+    strt_y, end_y = np.array([-1, 1])*roi_size[1] + int(cen_y)
+    strt_x = max(strt_x, 0)
+    strt_y = max(strt_y, 0)
+    end_x = min(end_x, image.shape[1])
+    end_y = min(end_y, image.shape[0])
+
+    image = image[strt_y:end_y, strt_x:end_x]
+    proj_x = image.sum(axis=0)
+    proj_y = image.sum(axis=1)
+    axis_x = np.arange(strt_x, end_x)
+    axis_y = np.arange(strt_y, end_y)
+    return proj_x, proj_y, axis_x, axis_y, (strt_x, end_x, strt_y, end_y)
+
+
 class ImageView(PyDMImageView):
 
     def __init__(self, callback, **kwargs):
@@ -620,6 +732,12 @@ class ImageView(PyDMImageView):
         super().image_value_changed(image)
 
 
+def _stop_analysis_loop(stop, new_frame, *args):
+    """Stop frame analysis thread of a destroyed ProcessImage."""
+    stop.set()
+    new_frame.set()
+
+
 class ProcessImage(QWidget):
     def __init__(self, parent=None, place='LI-Energy', prefix=_VACA_PREFIX):
         super().__init__(parent)
@@ -633,7 +751,40 @@ class ProcessImage(QWidget):
         self.bg_ready = False
         self.bg = None
         self.nbg = 0
+        self._frame = None
+        self._pending = None
+        self._pending_params = None
+        self._working = None
+        self._result = None
+        self._result_drawn = None
+        self._nr_params = 0
+        self._lock = Lock()
+        self._params_updated = Condition(self._lock)
+        self._new_frame = Event()
+        self._stop_analysis = Event()
+        self.reset_timing_stats()
         self._setupUi()
+        self._analysis = Thread(target=self._analysis_loop, daemon=True)
+        self._analysis.start()
+        # widget methods can not be called once it is destroyed
+        self.destroyed.connect(_partial(
+            _stop_analysis_loop, self._stop_analysis, self._new_frame))
+
+    @property
+    def nr_params(self):
+        """Number of frames analysed since creation."""
+        return self._nr_params
+
+    def wait_params(self, nr_params, timeout=None):
+        """Wait for parameters of a frame newer than nr_params.
+
+        Returns:
+            int: current number of analysed frames, or None on timeout.
+        """
+        with self._params_updated:
+            ok = self._params_updated.wait_for(
+                lambda: self._nr_params > nr_params, timeout=timeout)
+            return self._nr_params if ok else None
 
     def _select_experimental_setup(self):
         pref = self._prefix
@@ -705,6 +856,7 @@ class ProcessImage(QWidget):
         self.cbox_method = QComboBox(gb_pos)
         self.cbox_method.addItem('Gauss Fit')
         self.cbox_method.addItem('Moments')
+        self.cbox_method.addItem('Gauss Fit (Fast)')
         fl.addRow(QLabel('Method', gb_pos), self.cbox_method)
         self.spbox_roi_size_x = QSpinBoxPlus(gb_pos)
         self.spbox_roi_size_y = QSpinBoxPlus(gb_pos)
@@ -754,6 +906,9 @@ class ProcessImage(QWidget):
         fl.addRow(QLabel('Beam Size', gb_pos))
         fl.addRow(QLabel('x = ', gb_pos), self.lb_xstd)
         fl.addRow(QLabel('y = ', gb_pos), self.lb_ystd)
+        self.lb_proc = QLabel('-', gb_pos)
+        fl.addRow(QLabel('Analysis [ms]', gb_pos))
+        fl.addRow(self.lb_proc)
 
         hl.setSpacing(12)
         hl.setStretch(0, 1)
@@ -771,43 +926,48 @@ class ProcessImage(QWidget):
     def cbbox_acq_bg_checked(self, check):
         if check:
             self.pb_reset_bg_clicked()
-        else:
-            if self.bg is not None:
-                self.bg /= self.nbg
-                self.bg_ready = True
+        elif self.bg is not None:
+            self.bg_ready = True
 
     def calc_roi(self, image):
-        proj_x = image.sum(axis=0)
-        proj_y = image.sum(axis=1)
-        axis_x = np.arange(image.shape[1])
-        axis_y = np.arange(image.shape[0])
-
-        if self.cbbox_auto_center.isChecked():
-            cen_x, _ = _calc_moments(axis_x, proj_x)
-            cen_y, _ = _calc_moments(axis_y, proj_y)
-        else:
-            cen_x = self.spbox_roi_center_x.value()
-            cen_y = self.spbox_roi_center_y.value()
-
-        roi_size_x = self.spbox_roi_size_x.value()
-        roi_size_y = self.spbox_roi_size_y.value()
-        strt_x, end_x = np.array([-1, 1])*roi_size_x + int(cen_x)
-        strt_y, end_y = np.array([-1, 1])*roi_size_y + int(cen_y)
-        strt_x = max(strt_x, 0)
-        strt_y = max(strt_y, 0)
-        end_x = min(end_x, image.shape[1])
-        end_y = min(end_y, image.shape[0])
+        roi_center = (
+            self.spbox_roi_center_x.value(), self.spbox_roi_center_y.value())
+        roi_size = (
+            self.spbox_roi_size_x.value(), self.spbox_roi_size_y.value())
+        proj_x, proj_y, axis_x, axis_y, roi = _calc_roi(
+            image, self.cbbox_auto_center.isChecked(), roi_center, roi_size)
+        strt_x, end_x, strt_y, end_y = roi
         self.plt_roi.setData(
             np.array([strt_x, strt_x, end_x, end_x, strt_x]),
             np.array([strt_y, end_y, end_y, strt_y, strt_y]))
-
-        image = image[strt_y:end_y, strt_x:end_x]
-        proj_x = image.sum(axis=0)
-        proj_y = image.sum(axis=1)
-        axis_x = axis_x[strt_x:end_x]
-        axis_y = axis_y[strt_y:end_y]
         return proj_x, proj_y, axis_x, axis_y
 
+    def reset_timing_stats(self):
+        """Reset per-frame timing statistics."""
+        self._stats = dict(
+            nr_frames=0, nr_analysed=0, nr_dropped=0,
+            prep_time=0.0, proc_time=0.0, proc_time_max=0.0,
+            last_frame=None, frame_interval=0.0)
+
+    def get_timing_stats(self):
+        """Return per-frame timing statistics.
+
+        Returns:
+            dict: number of received, analysed and dropped frames, the
+                average frame interval and the average time spent in
+                frame preparation (GUI thread) and analysis (worker
+                thread), all in seconds, and the maximum analysis time.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats.pop('last_frame')
+        nrf = max(stats['nr_frames'], 1)
+        nra = max(stats['nr_analysed'], 1)
+        stats['prep_time'] /= nrf
+        stats['proc_time'] /= nra
+        stats['frame_interval'] /= max(stats['nr_frames'] - 1, 1)
+        return stats
+
     def process_image(self, image, wid):
         if wid <= 0:
             return image
@@ -815,67 +975,166 @@ class ProcessImage(QWidget):
             image = image.reshape((-1, wid))
         except (TypeError, ValueError, AttributeError):
             return image
+
+        t0 = _time.time()
+        if self._frame is None or self._frame.shape != image.shape:
+            self._frame = np.empty(image.shape, dtype=float)
+            self.pb_reset_bg_clicked()
+        frame = self._frame
+        frame[:] = image
+
         if self.cbbox_acq_bg.isChecked():
+            # running mean of background frames
             if self.bg is None:
-                self.bg = np.array(image, dtype=float)
-            else:
-                self.bg += np.array(image, dtype=float)
+                self.bg = np.zeros(image.shape, dtype=float)
             self.nbg += 1
+            frame -= self.bg
+            frame /= self.nbg
+            self.bg += frame
             return image
-        if self.bg_ready:
-            image -= np.array(self.bg, dtype=image.dtype)
-            b = np.where(image < 0)
-            image[b] = 0
 
         maxi = self.spbox_img_max.value()
+        if self.bg_ready:
+            frame -= self.bg
+            np.clip(frame, 0, maxi if maxi > 0 else None, out=frame)
+        elif maxi > 0:
+            np.minimum(frame, maxi, out=frame)
         if maxi > 0:
-            b = np.where(image > maxi)
             self.image_view.colorMapMax = maxi
-            image[b] = maxi
 
-        proj_x, proj_y, axis_x, axis_y = self.calc_roi(image)
-        x_max = max(proj_x)
-        y_max = max(proj_y)
-        if self.cbox_method.currentIndex():
+        params = dict(
+            method=self.cbox_method.currentText(),
+            auto_center=self.cbbox_auto_center.isChecked(),
+            roi_center=(
+                self.spbox_roi_center_x.value(),
+                self.spbox_roi_center_y.value()),
+            roi_size=(
+                self.spbox_roi_size_x.value(),
+                self.spbox_roi_size_y.value()))
+        with self._lock:
+            if self._pending is None or self._pending.shape != frame.shape:
+                self._pending = np.empty_like(frame)
+            if self._pending_params is not None:
+                self._stats['nr_dropped'] += 1
+            np.copyto(self._pending, frame)
+            self._pending_params = params
+
+            stats = self._stats
+            if stats['last_frame'] is not None:
+                stats['frame_interval'] += t0 - stats['last_frame']
+            stats['last_frame'] = t0
+            stats['nr_frames'] += 1
+            stats['prep_time'] += _time.time() - t0
+        self._new_frame.set()
+
+        self._draw_result()
+        return frame.copy()
+
+    def _analysis_loop(self):
+        while True:
+            self._new_frame.wait()
+            self._new_frame.clear()
+            if self._stop_analysis.is_set():
+                break
+            with self._lock:
+                if self._pending_params is None:
+                    continue
+                self._pending, self._working = self._working, self._pending
+                params = self._pending_params
+                self._pending_params = None
+
+            t0 = _time.time()
+            try:
+                result = self._analyse(self._working, **params)
+            except Exception as err:
+                _log.error('Problem analysing image: {}'.format(err))
+                continue
+            dt = _time.time() - t0
+
+            with self._lock:
+                self._result = result
+                self._stats['nr_analysed'] += 1
+                self._stats['proc_time'] += dt
+                self._stats['proc_time_max'] = max(
+                    self._stats['proc_time_max'], dt)
+                if result['coefx'] is not None and \
+                        result['coefy'] is not None:
+                    cen_x = result['cen_x'] - result['shape'][1]/2
+                    cen_y = result['cen_y'] - result['shape'][0]/2
+                    coefx = result['coefx']*1e-3  # transform to meter
+                    coefy = result['coefy']*1e-3
+                    self.cen_x = cen_x * coefx
+                    self.cen_y = cen_y * coefy
+                    self.sigma_x = result['std_x'] * coefx
+                    self.sigma_y = result['std_y'] * coefy
+                    self._nr_params += 1
+                    self._params_updated.notify_all()
+
+    def _analyse(self, image, method, auto_center, roi_center, roi_size):
+        proj_x, proj_y, axis_x, axis_y, roi = _calc_roi(
+            image, auto_center, roi_center, roi_size)
+        x_max = np.amax(proj_x)
+        y_max = np.amax(proj_y)
+        if method == 'Moments':
             cen_x, std_x = _calc_moments(axis_x, proj_x)
             cen_y, std_y = _calc_moments(axis_y, proj_y)
             amp_x = x_max
             amp_y = y_max
             off_x = 0
             off_y = 0
-        else:
+        elif method == 'Gauss Fit':
             amp_x, cen_x, std_x, off_x = _fit_gaussian(axis_x, proj_x)
             amp_y, cen_y, std_y, off_y = _fit_gaussian(axis_y, proj_y)
-        std_x = abs(std_x)
-        std_y = abs(std_y)
-        yd = _gaussian(axis_x, amp_x, cen_x, std_x, off_x)/x_max*400
-        self.plt_fit_x.setData(axis_x, yd + axis_y[0])
-        self.plt_his_x.setData(axis_x, proj_x/x_max*400 + axis_y[0])
-
-        yd = _gaussian(axis_y, amp_y, cen_y, std_y, off_y)/y_max*400
-        self.plt_fit_y.setData(yd + axis_x[0], axis_y)
-        self.plt_his_y.setData(proj_y/y_max*400 + axis_x[0], axis_y)
-
-        offset_x = image.shape[1]/2
-        offset_y = image.shape[0]/2
-        self.lb_xave.setText('{0:4d}'.format(int(cen_x or 0)))
-        self.lb_yave.setText('{0:4d}'.format(int(cen_y or 0)))
-        self.lb_xstd.setText('{0:4d}'.format(int(std_x or 0)))
-        self.lb_ystd.setText('{0:4d}'.format(int(std_y or 0)))
-
-        coefx = self.conv_coefx.value
-        coefy = self.conv_coefy.value
-        if coefx is None or coefy is None:
+        else:
+            amp_x, cen_x, std_x, off_x = _fit_gaussian_linear(axis_x, proj_x)
+            amp_y, cen_y, std_y, off_y = _fit_gaussian_linear(axis_y, proj_y)
+        return dict(
+            shape=image.shape, roi=roi,
+            proj_x=proj_x, proj_y=proj_y, axis_x=axis_x, axis_y=axis_y,
+            x_max=x_max, y_max=y_max,
+            amp_x=amp_x, cen_x=cen_x, std_x=abs(std_x), off_x=off_x,
+            amp_y=amp_y, cen_y=cen_y, std_y=abs(std_y), off_y=off_y,
+            coefx=self.conv_coefx.value, coefy=self.conv_coefy.value)
+
+    def _draw_result(self):
+        with self._lock:
+            res = self._result
+        if res is None or res is self._result_drawn:
             return
+        self._result_drawn = res
 
-        cen_x -= offset_x
-        cen_y -= offset_y
-        self.cen_x = cen_x * coefx*1e-3  # transform to meter
-        self.cen_y = cen_y * coefy*1e-3
-        self.sigma_x = std_x * coefx*1e-3
-        self.sigma_y = std_y * coefy*1e-3
+        strt_x, end_x, strt_y, end_y = res['roi']
+        self.plt_roi.setData(
+            np.array([strt_x, strt_x, end_x, end_x, strt_x]),
+            np.array([strt_y, end_y, end_y, strt_y, strt_y]))
 
-        return image
+        axis_x, axis_y = res['axis_x'], res['axis_y']
+        x_max = res['x_max'] or 1
+        y_max = res['y_max'] or 1
+        if axis_x.size and axis_y.size:
+            yd = _gaussian(
+                axis_x, res['amp_x'], res['cen_x'], res['std_x'],
+                res['off_x'])/x_max*400
+            self.plt_fit_x.setData(axis_x, yd + axis_y[0])
+            self.plt_his_x.setData(
+                axis_x, res['proj_x']/x_max*400 + axis_y[0])
+
+            yd = _gaussian(
+                axis_y, res['amp_y'], res['cen_y'], res['std_y'],
+                res['off_y'])/y_max*400
+            self.plt_fit_y.setData(yd + axis_x[0], axis_y)
+            self.plt_his_y.setData(
+                res['proj_y']/y_max*400 + axis_x[0], axis_y)
+
+        self.lb_xave.setText('{0:4d}'.format(int(res['cen_x'] or 0)))
+        self.lb_yave.setText('{0:4d}'.format(int(res['cen_y'] or 0)))
+        self.lb_xstd.setText('{0:4d}'.format(int(res['std_x'] or 0)))
+        self.lb_ystd.setText('{0:4d}'.format(int(res['std_y'] or 0)))
+
+        stats = self.get_timing_stats()
+        self.lb_proc.setText('{0:.1f} (max {1:.1f}), dropped {2:d}'.format(
+            stats['proc_time']*1e3, stats['proc_time_max']*1e3,
+            stats['nr_dropped']))
 
     def get_params(self):
         return self.cen_x, self.sigma_x, self.cen_y, self.sigma_y
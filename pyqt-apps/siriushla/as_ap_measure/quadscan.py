@@ -0,0 +1,315 @@
+"""Quadrupole scan engine used in emittance measurements."""
+
+import json as _json
+import logging as _log
+import time as _time
+from threading import Condition as _Condition, Event as _Event
+
+import numpy as np
+
+
+SCAN_DTYPE = np.dtype([
+    ('step', '<u2'), ('curr_sp', '<f4'), ('curr_rb', '<f4'),
+    ('cen_x', '<f4'), ('sigma_x', '<f4'),
+    ('cen_y', '<f4'), ('sigma_y', '<f4'), ('timestamp', '<f8')])
+_MAGIC = b'QSCAN1\n'
+
+
+class ScanRecorder:
+    """Record raw scan samples to a compact binary file.
+
+    The file has a magic line, a JSON line with the scan metadata and
+    then one fixed size record per sample (see SCAN_DTYPE). Records are
+    appended as they are acquired, so partial scans are also readable.
+    """
+
+    def __init__(self, fname, meta=None):
+        """."""
+        self._fname = fname
+        self._fh = open(fname, 'wb')
+        self._fh.write(_MAGIC)
+        self._fh.write(_json.dumps(meta or dict()).encode() + b'\n')
+        self._rec = np.zeros(1, dtype=SCAN_DTYPE)
+
+    @property
+    def fname(self):
+        """Return file name."""
+        return self._fname
+
+    def record(self, step, curr_sp, curr_rb, params):
+        """Append one sample.
+
+        Args:
+            step (int): scan step index.
+            curr_sp (float): current setpoint [A].
+            curr_rb (float): current readback [A].
+            params (tuple): (cen_x, sigma_x, cen_y, sigma_y) [m].
+        """
+        rec = self._rec[0]
+        rec['step'] = step
+        rec['curr_sp'] = curr_sp
+        rec['curr_rb'] = curr_rb
+        rec['cen_x'], rec['sigma_x'], rec['cen_y'], rec['sigma_y'] = [
+            np.nan if p is None else p for p in params]
+        rec['timestamp'] = _time.time()
+        self._rec.tofile(self._fh)
+        self._fh.flush()
+
+    def close(self):
+        """Close file."""
+        self._fh.close()
+
+
+def load_scan_record(fname):
+    """Load file written by ScanRecorder.
+
+    Returns:
+        dict: scan metadata.
+        numpy.ndarray: records with dtype SCAN_DTYPE.
+    """
+    with open(fname, 'rb') as fil:
+        if fil.readline() != _MAGIC:
+            raise ValueError('File is not a quadrupole scan record.')
+        meta = _json.loads(fil.readline().decode())
+        data = np.frombuffer(fil.read(), dtype=SCAN_DTYPE)
+    return meta, data
+
+
+class QuadScanHWSource:
+    """Scan source using quadrupole PVs and a ProcessImage widget.
+
+    A step is considered settled when the readback, delivered by monitor
+    callbacks, stays within `tol` of the setpoint for `settle_time`
+    seconds. Samples are taken only from frames analysed after that.
+    """
+
+    def __init__(self, curr_sp_pv, curr_rb_pv, proc_image,
+                 tol=0.005, settle_time=0.5, simul=False):
+        """."""
+        self._sp_pv = curr_sp_pv
+        self._rb_pv = curr_rb_pv
+        self._proc = proc_image
+        self.tol = tol
+        self.settle_time = settle_time
+        self._simul = simul
+        self._cond = _Condition()
+        self._target = None
+        self._t_in_tol = None
+        self._last_nr = 0
+        self._cbidx = self._rb_pv.add_callback(self._callback_readback)
+
+    @property
+    def initial_current(self):
+        """Return current setpoint before the scan."""
+        return self._sp_pv.value
+
+    def set_current(self, value):
+        """Set quadrupole current, without waiting."""
+        with self._cond:
+            self._target = value
+            self._t_in_tol = None
+            self._check_readback(self._rb_pv.value)
+        if not self._simul:
+            self._sp_pv.put(value, wait=False)
+
+    def wait_settled(self, timeout):
+        """Wait for readback to settle at the last setpoint."""
+        tini = _time.time()
+        with self._cond:
+            while True:
+                now = _time.time()
+                if self._simul or (
+                        self._t_in_tol is not None and
+                        now - self._t_in_tol >= self.settle_time):
+                    break
+                remain = timeout - (now - tini)
+                if remain <= 0:
+                    return False
+                if self._t_in_tol is not None:
+                    remain = min(
+                        remain, self.settle_time - (now - self._t_in_tol))
+                self._cond.wait(remain)
+        # ignore frames that may have been exposed before settling
+        self._last_nr = self._proc.nr_params + 1
+        return True
+
+    def wait_sample(self, timeout):
+        """Return (curr_rb, params) of next fresh frame or None."""
+        nr = self._proc.wait_params(self._last_nr, timeout=timeout)
+        if nr is None:
+            return None
+        self._last_nr = nr
+        return self._rb_pv.value, self._proc.get_params()
+
+    def close(self):
+        """Remove readback callback."""
+        self._rb_pv.remove_callback(self._cbidx)
+
+    def _callback_readback(self, value, **kws):
+        with self._cond:
+            self._check_readback(value)
+            self._cond.notify_all()
+
+    def _check_readback(self, value):
+        if self._target is None or value is None:
+            return
+        if abs(value - self._target) <= self.tol:
+            if self._t_in_tol is None:
+                self._t_in_tol = _time.time()
+        else:
+            self._t_in_tol = None
+
+
+class QuadScanReplaySource:
+    """Scan source replaying a file written by ScanRecorder.
+
+    Only steps with recorded samples are replayed, so steps skipped
+    during the recording are also skipped in the replay.
+    """
+
+    def __init__(self, fname):
+        """."""
+        self.meta, self._data = load_scan_record(fname)
+        self._steps = np.unique(self._data['step'])
+        self._step = -1
+        self._samples = iter(())
+
+    @property
+    def initial_current(self):
+        """Return current setpoint before the scan."""
+        return self.meta.get('initial_current')
+
+    @property
+    def currents(self):
+        """Return setpoints of the recorded scan."""
+        _, idx = np.unique(self._data['step'], return_index=True)
+        return self._data['curr_sp'][idx].astype(float)
+
+    def set_current(self, value):
+        """Go to next recorded step."""
+        self._step += 1
+        if self._step >= self._steps.size:
+            self._samples = iter(())
+            return
+        data = self._data[self._data['step'] == self._steps[self._step]]
+        self._samples = iter(data)
+
+    def wait_settled(self, timeout):
+        """Recorded steps are always settled."""
+        return True
+
+    def wait_sample(self, timeout):
+        """Return (curr_rb, params) of next recorded sample or None."""
+        rec = next(self._samples, None)
+        if rec is None:
+            return None
+        params = tuple(
+            float(rec[n]) for n in ('cen_x', 'sigma_x', 'cen_y', 'sigma_y'))
+        return float(rec['curr_rb']), params
+
+    def close(self):
+        """."""
+
+
+class QuadScanEngine:
+    """Quadrupole scan driven by readback settling and fresh frames.
+
+    Magnet ramping to the next setpoint is started as soon as a step is
+    finished, and `analysis_callback` runs while the magnet settles, so
+    intermediate analysis does not delay the acquisition.
+    """
+
+    def __init__(self, source, currents, samples, outliers, max_size,
+                 plane='x', recorder=None, step_callback=None,
+                 analysis_callback=None, stop_event=None,
+                 settle_timeout=15, sample_timeout=2, max_sample_fails=3):
+        """."""
+        self.source = source
+        self.currents = np.asarray(currents, dtype=float)
+        self.samples = samples
+        self.outliers = outliers
+        self.max_size = max_size
+        self.plane = plane
+        self.recorder = recorder
+        self.step_callback = step_callback
+        self.analysis_callback = analysis_callback
+        self.stop_event = stop_event or _Event()
+        self.settle_timeout = settle_timeout
+        self.sample_timeout = sample_timeout
+        self.max_sample_fails = max_sample_fails
+        self.I_meas = []
+        self.sigma = []
+        self.step_times = []
+
+    @property
+    def stopped(self):
+        """Return whether scan was stopped."""
+        return self.stop_event.is_set()
+
+    def run(self):
+        """Run scan.
+
+        Returns:
+            bool: True if scan finished, False if it was stopped.
+        """
+        outs = self.outliers // 2    # outliers below median
+        outg = self.outliers - outs  # outliers above median
+        idx = 1 if self.plane == 'x' else 3
+
+        if not self.currents.size:
+            return True
+        self.source.set_current(self.currents[0])
+        for step, curr in enumerate(self.currents):
+            tini = _time.time()
+            _log.info('setting quadrupole to {0:8.3f} A'.format(curr))
+            if step and self.analysis_callback is not None and \
+                    len(self.I_meas) >= 3:
+                self.analysis_callback(
+                    np.array(self.I_meas), np.array(self.sigma))
+            if not self.source.wait_settled(self.settle_timeout):
+                _log.warning('    readback did not settle, continuing.')
+            tset = _time.time()
+
+            I_tmp, sig_tmp = [], []
+            fails = 0
+            while len(I_tmp) < self.samples:
+                if self.stopped:
+                    return False
+                smp = self.source.wait_sample(self.sample_timeout)
+                if smp is None:
+                    fails += 1
+                    if fails >= self.max_sample_fails:
+                        _log.warning('    no new frames, skipping step.')
+                        break
+                    continue
+                fails = 0
+                curr_rb, params = smp
+                if self.recorder is not None:
+                    self.recorder.record(step, curr, curr_rb, params)
+                sig = params[idx]
+                if sig is None or not np.isfinite(sig) or \
+                        sig > self.max_size:
+                    continue
+                _log.info('    sample {0:02d}'.format(len(I_tmp)))
+                I_tmp.append(curr_rb)
+                sig_tmp.append(abs(sig))
+
+            # start ramping to next point before processing this one
+            if step + 1 < self.currents.size:
+                self.source.set_current(self.currents[step+1])
+
+            if len(I_tmp) > self.outliers:
+                ind = np.argsort(sig_tmp)
+                I_tmp = np.array(I_tmp)[ind]
+                sig_tmp = np.array(sig_tmp)[ind]
+                end = len(I_tmp) - outg
+                self.I_meas.extend(I_tmp[outs:end])
+                self.sigma.extend(sig_tmp[outs:end])
+            tend = _time.time()
+            self.step_times.append((tset - tini, tend - tset))
+            _log.info('    settling {0:.2f} s, sampling {1:.2f} s'.format(
+                *self.step_times[-1]))
+            if self.step_callback is not None and self.I_meas:
+                self.step_callback(
+                    np.array(self.I_meas), np.array(self.sigma))
+        return True
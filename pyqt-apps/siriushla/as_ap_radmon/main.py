@@ -1,20 +1,24 @@
 """Rad Monitor."""
 
 import re as _re
+import logging as _log
 import time as _time
-from functools import partial as _part
+from functools import partial as _part, lru_cache as _lru_cache
+from threading import Thread as _Thread
 import numpy as np
 
-from qtpy.QtCore import Qt, QEvent, QTimer
+from qtpy.QtCore import Qt, QEvent, QObject, Signal
 from qtpy.QtGui import QColor, QPalette
 from qtpy.QtWidgets import QWidget, QLabel, QCheckBox, QGridLayout, \
     QApplication, QVBoxLayout, QSizePolicy as QSzPol, QMenu, QHBoxLayout
 
 import qtawesome as qta
+from pyqtgraph import InfiniteLine, mkPen
 
 from pydm.connection_inspector import ConnectionInspector
 
 from siriuspy.envars import VACA_PREFIX
+from siriuspy.clientarch import ClientArchiver
 from siriuspy.clientarch.time import Time
 from siriuspy.epics import PV
 from ..widgets import SiriusAlarmFrame, SiriusTimePlot, SiriusLabel
@@ -145,10 +149,6 @@ class RadTotDoseMonitor(QWidget):
         self.timeplot.setObjectName('timeplot')
         self.timeplot.setStyleSheet(
             '#timeplot{min-width:12em; min-height: 10em;}')
-        self.timeplot.bufferReset.connect(self._fill_refline)
-        self.timeplot.timeSpanChanged.connect(self._fill_refline)
-        t_end = Time.now()
-        t_init = t_end - timespan
 
         widplot = QWidget()
         widplot.setSizePolicy(QSzPol.Expanding, QSzPol.Expanding)
@@ -191,10 +191,7 @@ class RadTotDoseMonitor(QWidget):
             self.timeplot.addYChannel(
                 pvname, name=pvname, color=coloro, lineWidth=6)
             curve = self.timeplot.curveAtIndex(-1)
-            self._curves[mon] = curve
-            self.timeplot.fill_curve_with_archdata(
-                self._curves[mon], pvname,
-                t_init=t_init.get_iso8601(), t_end=t_end.get_iso8601())
+            self._curves[pvname] = curve
 
             cbx = QCheckBox(self)
             cbx.setChecked(True)
@@ -239,10 +236,10 @@ class RadTotDoseMonitor(QWidget):
         laygrid.setColumnStretch(1, 1)
         laygrid.setColumnStretch(2, 1)
 
-        self.timeplot.addYChannel(
-            'Reference', color='black', lineWidth=6, lineStyle=Qt.DashLine)
-        self.refline = self.timeplot.curveAtIndex(-1)
-        self._fill_refline()
+        self.refline = InfiniteLine(
+            pos=RadTotDoseMonitor.REF_TOT_DOSE, angle=0,
+            pen=mkPen(color='black', width=6, style=Qt.DashLine))
+        self.timeplot.addItem(self.refline)
 
         lay = QGridLayout(self)
         lay.setSpacing(20)
@@ -258,10 +255,13 @@ class RadTotDoseMonitor(QWidget):
                 height: 0.7em;
             }""")
 
-        self._timer = QTimer()
-        self._timer.timeout.connect(self._update_graph_ref)
-        self._timer.setInterval(2000)
-        self._timer.start()
+        # fill curves with archiver data without blocking the window
+        t_end = Time.now()
+        t_init = t_end - timespan
+        self._arch_fetcher = _ArchDataFetcher(
+            list(self._curves), t_init.get_iso8601(), t_end.get_iso8601())
+        self._arch_fetcher.newData.connect(self._fill_curve_with_archdata)
+        self._arch_fetcher.start()
 
     # ---------- events ----------
 
@@ -306,21 +306,19 @@ class RadTotDoseMonitor(QWidget):
 
     # ---------- private methods ----------
 
-    def _fill_refline(self):
-        basecurve = self.timeplot.curveAtIndex(0)
-        timebuffer = basecurve.data_buffer[0]
-        firstvalid = (timebuffer != 0).argmax()
-        if timebuffer[firstvalid] == 0:
-            timebuffer = np.array([Time.now().timestamp(), ])
-        else:
-            timebuffer = timebuffer[firstvalid:]
-        valuebuffer = [RadTotDoseMonitor.REF_TOT_DOSE]*timebuffer.size
-        self.timeplot.fill_curve_buffer(
-            self.refline, timebuffer, valuebuffer)
-
-    def _update_graph_ref(self):
-        self.refline.receiveNewValue(RadTotDoseMonitor.REF_TOT_DOSE)
-        self.refline.redrawCurve()
+    def _fill_curve_with_archdata(self, pvname, datax, datay):
+        if not len(datax):
+            return
+        curve = self._curves[pvname]
+        # keep values received while archiver data was requested
+        nrpts = curve.points_accumulated
+        if nrpts:
+            live = curve.data_buffer[:, -nrpts:]
+            live = live[:, live[0] > datax[-1]]
+            datax = np.r_[datax, live[0]]
+            datay = np.r_[datay, live[1]]
+        self.timeplot.fill_curve_buffer(curve, datax, datay)
+        self.timeplot.register_archdata_curve(curve, pvname)
 
     def _show_connections(self, checked):
         """Show connections action."""
@@ -337,12 +335,65 @@ class RadTotDoseMonitor(QWidget):
             value = bytes(value).decode('utf-8')
         value = value.replace('corredor', 'corr.')  # abbreviations
         mon = self._locn2mon[pvname]
-        if self._mon2locv[mon] is not None and self._mon2locv[mon] != value:
+        if self._mon2locv[mon] == value:
+            return
+        if self._mon2locv[mon] is not None:
             self.lb_warn.setVisible(True)
             return
         self._mon2locv[mon] = value
-        sec = 1 if 'corr.' in value.split(',')[0]\
-            else float(_re.findall(r'SI-(\d+)', value)[0])
-        axi = 18.5 if 'chicane 1' in value.split(',')[-1]\
-            else float(_re.findall(r'eixo (\d+)', value)[0])
-        self._mon2pos[mon] = 100*sec+axi
+        self._mon2pos[mon] = _get_location_position(value)
+
+
+_SEC_REGEX = _re.compile(r'SI-(\d+)')
+_AXIS_REGEX = _re.compile(r'eixo (\d+)')
+
+
+@_lru_cache(maxsize=None)
+def _get_location_position(location):
+    """Return position used to sort monitors by location."""
+    sec = 1 if 'corr.' in location.split(',')[0]\
+        else float(_SEC_REGEX.findall(location)[0])
+    axi = 18.5 if 'chicane 1' in location.split(',')[-1]\
+        else float(_AXIS_REGEX.findall(location)[0])
+    return 100*sec + axi
+
+
+class _ArchDataFetcher(QObject):
+    """Get archiver data of PVs in a single request.
+
+    The request runs in a daemon thread and this object has no parent,
+    so closing the window or the application while the request is
+    pending does not wait for it.
+    """
+
+    newData = Signal(str, np.ndarray, np.ndarray)
+
+    def __init__(self, pvnames, t_init, t_end):
+        super().__init__()
+        self._pvnames = pvnames
+        self._t_init = t_init
+        self._t_end = t_end
+
+    def start(self):
+        """Start request."""
+        _Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        carch = ClientArchiver()
+        carch.timeout = 120
+        try:
+            data = carch.get_data(self._pvnames, self._t_init, self._t_end)
+        except Exception as err:
+            _log.warning('Could not get archiver data: %s', err)
+            return
+        if not data:
+            return
+        if len(self._pvnames) == 1:
+            data = {self._pvnames[0]: data}
+        for pvname in self._pvnames:
+            pvdata = data.get(pvname)
+            if not pvdata or pvdata['timestamp'] is None:
+                continue
+            self.newData.emit(
+                pvname, np.asarray(pvdata['timestamp'], dtype=float),
+                np.asarray(pvdata['value'], dtype=float))
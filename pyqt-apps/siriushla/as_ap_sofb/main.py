@@ -117,7 +117,8 @@ class MainWindow(SiriusMainWindow):
         vbl = QVBoxLayout(wid_cont)
         vbl.setContentsMargins(0, 0, 0, 0)
         pdm_log = PyDMLogLabel(
-            wid_cont, init_channel=self.devpref.substitute(propty='Log-Mon'))
+            wid_cont, init_channel=self.devpref.substitute(propty='Log-Mon'),
+            persist=True)
         pdm_log.setAlternatingRowColors(True)
         pdm_log.maxCount = 2000
         vbl.addWidget(pdm_log)
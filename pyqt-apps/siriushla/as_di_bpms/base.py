@@ -245,12 +245,15 @@ class GraphWave(BaseGraph):
 
     def addChannel(self, **opts):
         scale = opts.pop('add_scale', None)
+        ychan = opts.get('y_channel', '')
+        if scale:
+            # curve only receives scaled data, avoid a second connection
+            opts['y_channel'] = None
         self.graph.addChannel(**opts)
         name = opts.get('name', '')
         self._add_channel(name)
         if scale:
-            channel = opts.get('y_channel', '')
-            self._add_scale(channel, scale)
+            self._add_scale(ychan, scale)
 
 
 class GraphTime(BaseGraph):
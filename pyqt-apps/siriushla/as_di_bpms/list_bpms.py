@@ -1,7 +1,12 @@
 import re
+from functools import partial as _part
+from threading import Lock as _Lock
+import numpy as np
 from qtpy.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QLineEdit, \
-    QLabel, QHBoxLayout, QGridLayout, QPushButton
-from qtpy.QtCore import Qt, Slot
+    QLabel, QHBoxLayout, QGridLayout, QPushButton, QCheckBox
+from qtpy.QtCore import Qt, Slot, QTimer
+from siriuspy.epics import PV as _PV
+from siriuspy.namesys import SiriusPVName as _PVName
 from siriushla.as_di_bpms.base import BaseWidget, GraphTime, GraphWave, \
     get_custom_widget_class
 from siriushla.widgets import PyDMLedMultiChannel
@@ -81,7 +86,113 @@ class SelectBPMs(BaseWidget):
         self.scarea.verticalScrollBar().setValue(0)
 
 
+class AcqDataHub:
+    """Acquisition waveforms shared by BPM summary graphs.
+
+    Each waveform PV is created once. Its callback scales the data into a
+    buffer that is only reallocated when the waveform grows and increments
+    a version counter, so graphs only copy data changed since last drawn.
+    Subscriptions are counted and a PV is released when its last
+    subscriber unsubscribes.
+    """
+
+    _instance = None
+    _instance_lock = _Lock()
+
+    def __init__(self):
+        self._lock = _Lock()
+        self._pvs = dict()
+        self._data = dict()
+        self._sizes = dict()
+        self._scales = dict()
+        self._versions = dict()
+        self._nrsubs = dict()
+
+    @classmethod
+    def get_instance(cls):
+        """Return data hub shared by all summaries."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def subscribe(self, pvname, scale=1):
+        """Create monitored PV for pvname, if not created yet."""
+        with self._lock:
+            self._nrsubs[pvname] = self._nrsubs.get(pvname, 0) + 1
+            if pvname in self._scales:
+                return
+            self._data[pvname] = np.zeros(0)
+            self._sizes[pvname] = 0
+            self._scales[pvname] = scale
+            self._versions[pvname] = 0
+        self._pvs[pvname] = _PV(pvname, callback=self._callback_value)
+
+    def unsubscribe(self, pvnames):
+        """Remove a subscription of each PV, releasing unused PVs."""
+        release = list()
+        with self._lock:
+            for pvname in pvnames:
+                if pvname not in self._nrsubs:
+                    continue
+                self._nrsubs[pvname] -= 1
+                if self._nrsubs[pvname]:
+                    continue
+                del self._nrsubs[pvname]
+                for dic in (self._data, self._sizes, self._scales,
+                            self._versions):
+                    dic.pop(pvname, None)
+                release.append(self._pvs.pop(pvname))
+        for pv in release:
+            pv.clear_callbacks()
+            pv.disconnect()
+
+    def version(self, pvname):
+        """Return number of value updates of pvname."""
+        return self._versions.get(pvname, -1)
+
+    def copy_value(self, pvname, out=None):
+        """Copy last scaled value of pvname to out.
+
+        Returns:
+            numpy.ndarray: view of out with the valid points, or a new
+                array if out is None or smaller than the waveform.
+        """
+        with self._lock:
+            size = self._sizes[pvname]
+            if out is None or out.size < size:
+                out = np.empty(size)
+            out = out[:size]
+            out[:] = self._data[pvname][:size]
+        return out
+
+    def _callback_value(self, pvname, value, **kws):
+        if value is None:
+            return
+        value = np.asarray(value)
+        with self._lock:
+            if pvname not in self._data:
+                # released
+                return
+            data = self._data[pvname]
+            if data.size < value.size:
+                data = np.empty(value.size)
+                self._data[pvname] = data
+            np.multiply(value, self._scales[pvname], out=data[:value.size])
+            self._sizes[pvname] = value.size
+            self._versions[pvname] += 1
+
+
 class AcqDataSummary(BaseWidget):
+    """Multi-turn data of a list of BPMs.
+
+    Waveforms are read from a shared AcqDataHub and only graphs currently
+    visible in the scroll area are updated. In ring overview mode a single
+    graph shows the waveforms of all BPMs averaged to OVERVIEW_POINTS.
+    """
+
+    UPDATE_RATE = 2  # [Hz]
+    OVERVIEW_POINTS = 50
 
     def __init__(self, parent=None, prefix='', bpm_list=[], mode='pos'):
         super().__init__(
@@ -91,8 +202,23 @@ class AcqDataSummary(BaseWidget):
         self._name = bpm_list[0][:2] + 'App'
         self.setObjectName(self._name)
         self.setStyleSheet('#'+self._name+'{min-width:65em;min-height:38em;}')
+        self._hub = AcqDataHub.get_instance()
+        self._graph_curves = dict()
+        self._overview_buffer = np.zeros(0)
         self.setupui()
 
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._update_graphs)
+        self._timer.start(int(1000/self.UPDATE_RATE))
+
+        # release hub PVs not used by other summaries
+        pvnames = [
+            cinfo[1] for curves in self._graph_curves.values()
+            for cinfo in curves]
+        pvnames += [
+            pvn for cinfo in self._overview_curves for pvn in cinfo[2]]
+        self.destroyed.connect(_part(self._hub.unsubscribe, pvnames))
+
     def setupui(self):
         vbl = QVBoxLayout(self)
         lab = QLabel('<h2>BPMs List</h2>', alignment=Qt.AlignCenter)
@@ -105,6 +231,9 @@ class AcqDataSummary(BaseWidget):
         search.textEdited.connect(self._filter_bpms)
         hbl.addWidget(search)
         hbl.addStretch()
+        self.cb_overview = QCheckBox('Ring Overview', self)
+        self.cb_overview.toggled.connect(self._set_overview_mode)
+        hbl.addWidget(self.cb_overview)
         self.btnautorange = QPushButton('Auto Range graphics', self)
         hbl.addWidget(self.btnautorange)
         vbl.addItem(hbl)
@@ -131,8 +260,13 @@ class AcqDataSummary(BaseWidget):
         self.gdl = gdl
         vbl.addWidget(scarea)
         scarea.setWidget(wid)
+        scarea.verticalScrollBar().valueChanged.connect(self._update_graphs)
         self.scarea = scarea
 
+        self.overview = self.create_overview_graph(self, typ=self.mode)
+        self.overview.setVisible(False)
+        vbl.addWidget(self.overview)
+
     def create_graph(self, wid, bpm, typ='pos'):
         text, unit, names, colors = self._get_properties(typ)
         if typ.startswith('pos'):
@@ -146,22 +280,57 @@ class AcqDataSummary(BaseWidget):
         self.btnautorange.clicked.connect(graph.graph.plotItem.vb.autoRange)
         graph.setObjectName('MultiTurnDataGraph')
         graph.setLabel('left', text=text, units=unit)
+        scale = 1e-9 if typ.startswith('pos') else 1
+        curves = list()
         for name, cor in zip(names, colors):
-            opts = dict(
-                y_channel=name+'Data',
-                name=name,
-                color=cor,
-                lineStyle=1,
+            # data comes from the hub, so curves have no channel
+            graph.addChannel(
+                name=name, color=cor, lineStyle=1,
                 lineWidth=1)  # NOTE: If > 1: very low performance
-            opts['y_channel'] = graph.get_pvname(opts['y_channel'])
-            if typ.startswith('pos'):
-                graph.addChannel(add_scale=1e-9, **opts)
-            else:
-                graph.addChannel(**opts)
+            pvname = graph.get_pvname(name+'Data')
+            self._hub.subscribe(pvname, scale)
+            curves.append([graph.curveAtIndex(-1), pvname, None, -1])
+        self._graph_curves[graph] = curves
         graph.setObjectName('graph')
         graph.setStyleSheet('#graph{min-width: 18em; min-height: 12em;}')
         return graph
 
+    def create_overview_graph(self, wid, typ='pos'):
+        text, unit, names, colors = self._get_properties(typ)
+        if typ.startswith('pos'):
+            unit = unit[1:]
+
+        graph = GraphWave(
+            wid, prefix=self.prefix, data_prefix=self.data_prefix)
+        graph.maxRedrawRate = 2.1
+        self.btnautorange.clicked.connect(graph.graph.plotItem.vb.autoRange)
+        graph.setLabel('left', text=text, units=unit)
+        graph.setLabel('bottom', text='BPM index')
+        npts = self.OVERVIEW_POINTS
+        # BPMs in the given order, which is the ring order for lists
+        # returned by BPMSearch
+        bpms = list(self.bpm_dict)
+        scale = 1e-9 if typ.startswith('pos') else 1
+        xdata = np.repeat(np.arange(len(bpms)), npts) + \
+            np.tile(np.arange(npts)/npts, len(bpms))
+        self._overview_curves = list()
+        for name, cor in zip(names, colors):
+            graph.addChannel(name=name, color=cor, lineStyle=1, lineWidth=1)
+            curve = graph.curveAtIndex(-1)
+            curve.receiveXWaveform(xdata)
+            ydata = np.zeros(xdata.size)
+            pvnames = [
+                _PVName(bpm).substitute(
+                    prefix=self.prefix, propty=self.data_prefix+name+'Data')
+                for bpm in bpms]
+            for pvname in pvnames:
+                self._hub.subscribe(pvname, scale)
+            self._overview_curves.append(
+                [curve, ydata, pvnames, [-1]*len(bpms)])
+        graph.setObjectName('overview')
+        graph.setStyleSheet('#overview{min-width: 40em; min-height: 20em;}')
+        return graph
+
     def _get_properties(self, typ):
         if typ.startswith('pos'):
             text = 'Positions'
@@ -175,6 +344,47 @@ class AcqDataSummary(BaseWidget):
             colors = ('blue', 'red', 'green', 'magenta')
         return text, unit, names, colors
 
+    @Slot(bool)
+    def _set_overview_mode(self, overview):
+        self.scarea.setVisible(not overview)
+        self.overview.setVisible(overview)
+        self._update_graphs()
+
+    @Slot()
+    def _update_graphs(self):
+        if self.overview.isVisible():
+            self._update_overview()
+            return
+        for graph, curves in self._graph_curves.items():
+            # graphs scrolled out of view or filtered have no visible region
+            if graph.visibleRegion().isEmpty():
+                continue
+            for cinfo in curves:
+                curve, pvname, data, version = cinfo
+                new_version = self._hub.version(pvname)
+                if new_version == version:
+                    continue
+                data = self._hub.copy_value(pvname, data)
+                cinfo[2:] = data, new_version
+                curve.receiveYWaveform(data)
+
+    def _update_overview(self):
+        npts = self.OVERVIEW_POINTS
+        for curve, ydata, pvnames, versions in self._overview_curves:
+            changed = False
+            for i, pvname in enumerate(pvnames):
+                new_version = self._hub.version(pvname)
+                if new_version == versions[i]:
+                    continue
+                versions[i] = new_version
+                changed = True
+                data = self._hub.copy_value(pvname, self._overview_buffer)
+                if data.size > self._overview_buffer.size:
+                    self._overview_buffer = data
+                _downsample(data, ydata[i*npts:(i+1)*npts])
+            if changed:
+                curve.receiveYWaveform(ydata)
+
     @Slot(str)
     def _filter_bpms(self, text):
         """Filter power supply widgets based on text inserted at line edit."""
@@ -197,3 +407,16 @@ class AcqDataSummary(BaseWidget):
             self.gdl.addWidget(wid, i // 3, i % 3)
         # Sroll to top
         self.scarea.verticalScrollBar().setValue(0)
+
+
+def _downsample(data, out):
+    """Average data into out.size bins, interpolating short waveforms."""
+    npts = out.size
+    if not data.size:
+        out[:] = 0
+    elif data.size < npts:
+        out[:] = np.interp(
+            np.linspace(0, data.size-1, npts), np.arange(data.size), data)
+    else:
+        size = data.size // npts * npts
+        out[:] = data[:size].reshape(npts, -1).mean(axis=1)
@@ -1,5 +1,7 @@
 """DCCT graphics module."""
 
+from functools import partial as _part
+
 import numpy as np
 
 from qtpy.QtCore import Qt
@@ -14,7 +16,8 @@ from siriuspy.namesys import SiriusPVName
 from siriuspy.diagbeam.dcct.csdev import Const as _DCCTc
 from siriuspy.search import LLTimeSearch as _LLTimeSearch
 from siriushla.widgets import SiriusConnectionSignal as SignalChannel, \
-    SiriusTimePlot, QSpinBoxPlus, SiriusWaveformPlot, SiriusLabel
+    SiriusTimePlot, QSpinBoxPlus, SiriusWaveformPlot, SiriusLabel, \
+    SmoothingBuffer
 
 
 class DCCTMonitor(QWidget):
@@ -46,7 +49,7 @@ class DCCTMonitor(QWidget):
         self._downsampling = 1
         self._smooth_method = 'Average'
         self._smooth_nracq = 1
-        self._smooth_buffer = list()
+        self._smooth_buffer = SmoothingBuffer(self._smooth_nracq)
 
         self._setupUi()
 
@@ -136,20 +139,25 @@ class DCCTMonitor(QWidget):
         lay.addWidget(self.label_waveread, 0, 0)
         lay.addWidget(self.wavegraph, 1, 0)
 
-        # Smoothing
+        # X axis, computed from values delivered by monitors
         evgname = SiriusPVName(_LLTimeSearch.get_evg_name())
+        self._xaxis_params = dict.fromkeys(('evnt', 'trig', 'smpl', 'peri'))
+        self._xaxis_key = None
         self._evnt_dly = SignalChannel(evgname.substitute(
             prefix=self.prefix, propty='LinacDelay-RB'))
-        self._evnt_dly.new_value_signal[float].connect(self.updateRawXAxis)
         self._trig_dly = SignalChannel(
             self.dcct_prefix.substitute(dis='TI', propty='Delay-RB'))
-        self._trig_dly.new_value_signal[float].connect(self.updateRawXAxis)
         self._smpl_cnt = SignalChannel(
             self.dcct_prefix.substitute(propty='FastSampleCnt-RB'))
-        self._smpl_cnt.new_value_signal[float].connect(self.updateRawXAxis)
         self._meas_per = SignalChannel(
             self.dcct_prefix.substitute(propty='FastMeasPeriod-RB'))
-        self._meas_per.new_value_signal[float].connect(self.updateRawXAxis)
+        chans = {
+            'evnt': self._evnt_dly, 'trig': self._trig_dly,
+            'smpl': self._smpl_cnt, 'peri': self._meas_per}
+        for param, chan in chans.items():
+            slot = _part(self._setRawXAxisParam, param)
+            chan.new_value_signal[int].connect(slot)
+            chan.new_value_signal[float].connect(slot)
 
         self.cb_timeaxis = QCheckBox('Use time axis', self)
         self.cb_timeaxis.setChecked(True)
@@ -232,24 +240,22 @@ class DCCTMonitor(QWidget):
         data = raw[:samp]
 
         self._smooth_buffer.append(data)
-        if len(self._smooth_buffer) > self._smooth_nracq:
-            self._smooth_buffer.pop(0)
 
         self._updateRawCurve()
 
     def _updateRawCurve(self):
-        buff = np.array(self._smooth_buffer, dtype=float)
+        buff = self._smooth_buffer
         self.label_buffsize.setText(str(self.smoothBufferSize))
 
-        if not len(buff):
+        if not buff.count:
             return
-        if len(buff) > 1:
+        if buff.count > 1:
             if self._smooth_method == 'Average':
-                fdata = np.mean(buff, axis=0)
+                fdata = buff.average()
             elif self._smooth_method == 'Median':
-                fdata = np.median(buff, axis=0)
+                fdata = buff.median()
         else:
-            fdata = buff[0]
+            fdata = buff.last()
 
         down = self._downsampling
         if down > 1:
@@ -271,19 +277,16 @@ class DCCTMonitor(QWidget):
     def setRawSmoothNrAcq(self, new_value):
         """Update number of samples to use in smoothing."""
         self._smooth_nracq = new_value
-        exc = len(self._smooth_buffer) - self._smooth_nracq
-        if exc > 0:
-            for i in range(exc):
-                self._smooth_buffer.pop(0)
+        self._smooth_buffer.size = new_value
 
     @property
     def smoothBufferSize(self):
         """Smoothing buffer length."""
-        return len(self._smooth_buffer)
+        return self._smooth_buffer.count
 
     def resetRawBuffer(self):
         """Reset smoothing buffer."""
-        self._smooth_buffer = list()
+        self._smooth_buffer.reset()
         self._updateRawCurve()
 
     def updateParams(self, new_value):
@@ -297,24 +300,34 @@ class DCCTMonitor(QWidget):
             self._acq_normalnrsamp = new_value
         self.resetRawBuffer()
 
-    def updateRawXAxis(self):
-        """Update X axis of waveform graph."""
-        smpl = self._smpl_cnt.getvalue()
-        if self.cb_timeaxis.checkState():
-            evnt = self._evnt_dly.getvalue()
-            trig = self._trig_dly.getvalue()
-            peri = self._meas_per.getvalue()
+    def _setRawXAxisParam(self, param, value):
+        self._xaxis_params[param] = value
+        self.updateRawXAxis()
 
-            if any([val is None for val in [evnt, trig, smpl, peri]]):
-                return
+    def updateRawXAxis(self):
+        """Update X axis of waveform graph.
+
+        Uses the last values received from monitors and only rebuilds
+        the axis if any of them changed.
+        """
+        pars = self._xaxis_params
+        smpl = pars['smpl']
+        if self.cb_timeaxis.isChecked():
+            key = (True, pars['evnt'], pars['trig'], smpl, pars['peri'])
+        else:
+            key = (False, smpl)
+        if None in key or key == self._xaxis_key:
+            return
+        self._xaxis_key = key
 
-            init = (evnt+trig)/1e3
-            endt = init + peri*1e3
+        if key[0]:
+            init = (pars['evnt'] + pars['trig'])/1e3
+            endt = init + pars['peri']*1e3
 
-            xdata = np.linspace(init, endt, smpl)
+            xdata = np.linspace(init, endt, int(smpl))
             xlabel = 'Time [ms]'
         else:
-            xdata = np.arange(0, smpl)
+            xdata = np.arange(0, int(smpl))
             xlabel = 'Index'
         self.wavegraph.setLabel('bottom', text=xlabel)
         self.wavecurve.receiveXWaveform(xdata)
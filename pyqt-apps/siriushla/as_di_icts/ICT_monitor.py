@@ -23,7 +23,8 @@ from siriuspy.epics import PV
 from siriushla.widgets import SiriusMainWindow, SiriusDialog, \
     SiriusLedAlert, PyDMStateButton, PyDMLedMultiChannel, QSpinBoxPlus, \
     SiriusWaveformPlot, SiriusLabel, SiriusSpinbox
-from siriushla.widgets.windows import create_window_from_widget
+from siriushla.widgets.windows import create_window_from_widget, \
+    register_plot_widget
 from siriushla import util
 from siriushla.as_ti_control.hl_trigger import HLTriggerDetailed
 
@@ -107,6 +108,8 @@ class ICTMonitoring(SiriusMainWindow):
         self.setObjectName(self.tl+'App')
         self.centralwidget.setObjectName(self.tl+'App')
         self.setCentralWidget(self.centralwidget)
+        register_plot_widget(self.centralwidget.PyDMTimePlot_Charge)
+        register_plot_widget(self.centralwidget.PyDMWaveformPlot_ChargeHstr)
 
         # Add curves accordingly
         self.centralwidget.PyDMTimePlot_Charge.addYChannel(
@@ -620,43 +623,51 @@ class _ICTCalibration(QWidget):
 
 
 class _MyWaveformCurveItem(WaveformCurveItem):
+    """Curve showing only the first POINTS_TO_PLOT points.
+
+    Float copies of the waveforms are kept in buffers refreshed only
+    when new waveforms arrive, and curve data is only set again when the
+    waveforms or the number of points changed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        self._xbuf = np.zeros(POINTS_TO_PLOT)
+        self._ybuf = np.zeros(POINTS_TO_PLOT)
+        self._plotted = (None, None, None)
 
     def redrawCurve(self):
         if self.y_waveform is None:
             return
-        if self.x_waveform is None:
-            self.setData(y=self.y_waveform[0:POINTS_TO_PLOT].astype(np.float_))
+        xwfm, ywfm = self.x_waveform, self.y_waveform
+        nrpts = min(ywfm.shape[0], POINTS_TO_PLOT)
+        if xwfm is not None:
+            nrpts = min(nrpts, xwfm.shape[0])
+        oldx, oldy, oldn = self._plotted
+        if xwfm is oldx and ywfm is oldy and nrpts == oldn:
             return
-        if self.x_waveform.shape[0] > self.y_waveform.shape[0]:
-            self.x_waveform = self.x_waveform[:self.y_waveform.shape[0]]
-        elif self.x_waveform.shape[0] < self.y_waveform.shape[0]:
-            self.y_waveform = self.y_waveform[:self.x_waveform.shape[0]]
-        self.setData(x=self.x_waveform[0:POINTS_TO_PLOT].astype(np.float_),
-                     y=self.y_waveform[0:POINTS_TO_PLOT].astype(np.float_))
+        self._plotted = (xwfm, ywfm, nrpts)
+
+        self._ybuf = self._update_buffer(self._ybuf, ywfm, nrpts)
+        if xwfm is None:
+            self.setData(y=self._ybuf[:nrpts])
+        else:
+            self._xbuf = self._update_buffer(self._xbuf, xwfm, nrpts)
+            self.setData(x=self._xbuf[:nrpts], y=self._ybuf[:nrpts])
         self.needs_new_x = True
         self.needs_new_y = True
 
+    @staticmethod
+    def _update_buffer(buf, wfm, nrpts):
+        if buf.size < nrpts:
+            buf = np.zeros(nrpts)
+        np.copyto(buf[:nrpts], wfm[:nrpts], casting='unsafe')
+        return buf
+
 
 class _MyWaveformPlot(SiriusWaveformPlot):
 
-    def addChannel(self, y_channel=None, x_channel=None, name=None,
-                   color=None, lineStyle=None, lineWidth=None,
-                   symbol=None, symbolSize=None, redraw_mode=None):
+    def createCurveItem(self, *args, **kwargs):
         """Reimplement to use _MyWaveformCurveItem."""
-        plot_opts = {}
-        plot_opts['symbol'] = symbol
-        if symbolSize is not None:
-            plot_opts['symbolSize'] = symbolSize
-        if lineStyle is not None:
-            plot_opts['lineStyle'] = lineStyle
-        if lineWidth is not None:
-            plot_opts['lineWidth'] = lineWidth
-        if redraw_mode is not None:
-            plot_opts['redraw_mode'] = redraw_mode
-        self._needs_redraw = False
-        curve = _MyWaveformCurveItem(
-            y_addr=y_channel, x_addr=x_channel, name=name,
-            color=color, **plot_opts)
-        self.channel_pairs[(y_channel, x_channel)] = curve
-        self.addCurve(curve, curve_color=color)
-        curve.data_changed.connect(self.set_needs_redraw)
+        return _MyWaveformCurveItem(*args, **kwargs)
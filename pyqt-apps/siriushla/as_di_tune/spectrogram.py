@@ -1,7 +1,7 @@
 """."""
 
 import logging
-import time as _time
+from threading import Lock as _Lock
 
 import numpy as np
 import qtawesome as qta
@@ -21,7 +21,8 @@ from siriuspy.namesys import SiriusPVName
 from siriushla.widgets import (
     QSpinBoxPlus,
     SiriusConnectionSignal,
-    SiriusSpectrogramView
+    SiriusSpectrogramView,
+    SmoothingBuffer
 )
 
 
@@ -78,10 +79,16 @@ class BOTuneSpectrogram(SiriusSpectrogramView):
         self.ROIColor = QColor('cyan')
         self.format_tooltip = '{0:.3f}, {1:.3f}'
         self._idx2send = 0
-        self.buffer = list()
         self.last_data = None
         self.nravgs = 1
 
+        self._buffer_lock = _Lock()
+        self._buffer = SmoothingBuffer(self.nravgs)
+
+        for sig in (self.frame_count_sig, self.timing_count_sig):
+            sig.new_value_signal[int].connect(self._count_changed)
+            sig.new_value_signal[float].connect(self._count_changed)
+
     @Slot(np.ndarray)
     def image_value_changed(self, new_image):
         """Reimplement image_value_changed slot."""
@@ -92,45 +99,40 @@ class BOTuneSpectrogram(SiriusSpectrogramView):
         self.needs_update_buffer = True
         self.needs_redraw = True
 
+    @Slot(int)
+    @Slot(float)
+    def _count_changed(self, _):
+        # a spectrogram received before all its acquisitions were counted
+        # is added to the buffer as soon as counts match
+        if self.needs_update_buffer and self._frame_complete():
+            self.needs_redraw = True
+
+    def _frame_complete(self):
+        fr_cnt = int(self.frame_count_sig.value or 0)
+        tim_cnt = int(self.timing_count_sig.value or 1)
+        return fr_cnt == tim_cnt
+
     def process_image(self, image):
         """Process data."""
-        # Wait some time so frame counts can update:
-        _time.sleep(0.2)
-
         # Flip data in X axis
         image = np.flip(image, 0)
 
-        # Truncate image
-        if self.nravgs > 1 and self.buffer:
-            last_buff_shape = self.buffer[-1].shape
-            image_shape = image.shape
-            aux = np.zeros(last_buff_shape)
-            if last_buff_shape > image_shape:
-                aux[: image_shape[0], : image_shape[1]] += image
-            elif last_buff_shape < image_shape:
-                aux += image[: last_buff_shape[0], : last_buff_shape[1]]
-            else:
-                aux += image
-            image = aux
-
-        # Manage buffer
-        fr_cnt = int(self.frame_count_sig.value or 0)
-        tim_cnt = int(self.timing_count_sig.value or 1)
-        if fr_cnt == tim_cnt:
+        with self._buffer_lock:
+            # Manage buffer
             if self.needs_update_buffer:
-                self.buffer.append(image)
-                if len(self.buffer) > self.nravgs:
-                    self.buffer.pop(0)
-                self.needs_update_buffer = False
-        else:
-            logging.debug(
-                'Not all acquisition were made. Ignoring current spectrogram'
-            )
-        self.buffer_curr_size.emit(str(len(self.buffer)))
-
-        # Perform average
-        if self.buffer:
-            image = np.mean(self.buffer, axis=0)
+                if self._frame_complete():
+                    self._add_to_buffer(image)
+                    self.needs_update_buffer = False
+                else:
+                    logging.debug(
+                        'Not all acquisitions were made. Waiting counts to '
+                        'add current spectrogram')
+            count = self._buffer.count
+
+            # Perform average
+            if count:
+                image = self._buffer.average()
+        self.buffer_curr_size.emit(str(count))
 
         # update last data
         self.last_data = image
@@ -143,6 +145,14 @@ class BOTuneSpectrogram(SiriusSpectrogramView):
         # Return image
         return image
 
+    def _add_to_buffer(self, image):
+        # spectrograms of different shapes can not be averaged, so the
+        # buffer restarts with the new shape
+        shape = self._buffer.shape
+        if shape is not None and shape != image.shape:
+            logging.debug('Spectrogram shape changed, resetting buffer')
+        self._buffer.append(image)
+
     def toggleXChannel(self):
         """Toggle X channel between FreqArray and TuneFracArray."""
         if 'TuneFracArray' in self._xaxischannel.address:
@@ -157,16 +167,20 @@ class BOTuneSpectrogram(SiriusSpectrogramView):
         """Set number of averages, or, buffer size."""
         if new_size < 1:
             return
-        self.nravgs = new_size
-        del self.buffer[:-new_size]
+        with self._buffer_lock:
+            self.nravgs = new_size
+            # keep the newest spectrograms
+            self._buffer.size = new_size
+            count = self._buffer.count
         self.buffer_size_changed.emit(self.nravgs)
-        self.buffer_curr_size.emit(str(len(self.buffer)))
+        self.buffer_curr_size.emit(str(count))
 
     def resetBuffer(self):
         """Reset buffer."""
-        self.buffer = list()
+        with self._buffer_lock:
+            self._buffer.reset()
         self.buffer_size_changed.emit(self.nravgs)
-        self.buffer_curr_size.emit(str(len(self.buffer)))
+        self.buffer_curr_size.emit('0')
         self.image_waveform *= 0
         self.needs_update_buffer = False
         self.needs_redraw = True
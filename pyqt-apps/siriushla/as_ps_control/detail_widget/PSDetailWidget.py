@@ -2374,8 +2374,7 @@ class PSParamsWidget(SiriusDialog):
 
 class CustomLabel(SiriusLabel):
 
-    def value_changed(self, new_value):
-        super().value_changed(new_value)
+    def format_value(self, new_value):
         new_value = parse_value_for_display(
             value=new_value, precision=self.precision,
             display_format_type=self._display_format_type,
@@ -2383,21 +2382,17 @@ class CustomLabel(SiriusLabel):
         if isinstance(new_value, str):
             if self._show_units and self._unit != "":
                 new_value = "{} {}".format(new_value, self._unit)
-            self.setText(new_value)
-            return
+            return new_value
         if self.enum_strings and isinstance(new_value, (int, float)):
             try:
-                self.setText(self.enum_strings[int(new_value)])
+                return self.enum_strings[int(new_value)]
             except IndexError:
-                self.setText(f'Index Overflow [{new_value}]')
-            return
+                return f'Index Overflow [{new_value}]'
         if self.enum_strings and isinstance(new_value, _np.ndarray):
             text = '['+', '.join([self.enum_strings[int(idx)]
                                   if idx < len(self.enum_strings) else 'UNDEF'
                                   for idx in new_value])+']'
-            self.setText(text)
-            return
+            return text
         if isinstance(new_value, (int, float)):
-            self.setText(self.format_string.format(new_value))
-            return
-        self.setText(str(new_value))
+            return self.format_string.format(new_value)
+        return str(new_value)
@@ -23,9 +23,7 @@ from ..widgets import SiriusMainWindow, \
 from ..widgets.pvnames_tree import PVNameTree
 from ..widgets.dialog import ProgressDialog, PSStatusDialog
 from .tasks import CreateCyclers, VerifyPS, \
-    SaveTiming, PrepareTiming, RestoreTiming, PreparePSIDFFMode, \
-    PreparePSOpModeSlowRef, PreparePSCurrentZero, \
-    PreparePSParams, PreparePSOpModeCycle, Cycle, CycleTrims
+    RestoreTiming, Cycle, CycleTrims, PreparationPipeline
 
 
 errorcolor = QColor(255, 0, 0)
@@ -35,6 +33,11 @@ warncolor = QColor(200, 200, 0)
 class CycleWindow(SiriusMainWindow):
     """Power supplies cycle window."""
 
+    # messages updated in place while a step runs
+    _PROGRESS_MSGS = (
+        'Remaining time', 'Sent ', 'Successfully checked ',
+        'Created connections ')
+
     def __init__(self, parent=None, checked_accs=(), adv_mode=False):
         """Constructor."""
         super().__init__(parent)
@@ -68,15 +71,10 @@ class CycleWindow(SiriusMainWindow):
         self._icon_not = qta.icon('fa5s.times')
         self._pixmap_not = self._icon_not.pixmap(
             self._icon_not.actualSize(QSize(16, 16)))
-        # Tasks
+        # Tasks, preparation steps are run by PreparationPipeline
+        self.pipeline = None
+        self._pipeline_items = dict()
         self._step_2_task = {
-            'save_timing': SaveTiming,
-            'timing': PrepareTiming,
-            'ps_idffmode': PreparePSIDFFMode,
-            'ps_om_slowref': PreparePSOpModeSlowRef,
-            'ps_current': PreparePSCurrentZero,
-            'ps_params': PreparePSParams,
-            'ps_om_cycle': PreparePSOpModeCycle,
             'trims': CycleTrims,
             'cycle': Cycle,
             'restore_timing': RestoreTiming,
@@ -111,6 +109,13 @@ class CycleWindow(SiriusMainWindow):
                  for name in self._timing.get_pvnames_by_psnames()]
         self.ticonn_led = PyDMLedMultiConn(self, channels=ti_ch)
 
+        self.prepare_all_bt = QPushButton('Prepare All (1-7)', self)
+        self.prepare_all_bt.setToolTip(
+            'Run steps 1 to 7, preparing timing and\n'
+            'power supplies concurrently.')
+        self.prepare_all_bt.clicked.connect(self._run_prepare_all)
+        self.prepare_all_bt.clicked.connect(self._set_lastcomm)
+
         self.save_timing_bt = QPushButton(
             '1. Save Timing Initial State', self)
         self.save_timing_bt.setToolTip(
@@ -237,8 +242,7 @@ class CycleWindow(SiriusMainWindow):
             QPushButton{min-height:1.5em;}
             QLabel{qproperty-alignment: AlignCenter;}""")
         lay_commsts = QGridLayout(gb_commsts)
-        lay_commsts.addItem(
-            QSpacerItem(1, 1, QSzPlcy.Ignored, QSzPlcy.Expanding), 0, 0, 1, 2)
+        lay_commsts.addWidget(self.prepare_all_bt, 0, 0)
         lay_commsts.addWidget(lb_prep_ti, 1, 0)
         lay_commsts.addWidget(self.ticonn_led, 1, 1)
         lay_commsts.addWidget(self.save_timing_bt, 2, 0)
@@ -325,6 +329,10 @@ class CycleWindow(SiriusMainWindow):
     # --- handle tasks ---
 
     def _run_task(self, control=''):
+        if control in PreparationPipeline.STEP_2_TASK:
+            self._run_pipeline([control, ])
+            return
+
         if not self._check_connected(control):
             return
         pwrsupplies = self._get_ps_list()
@@ -363,6 +371,88 @@ class CycleWindow(SiriusMainWindow):
         task.start()
         self.update_bar.start()
 
+    def _run_prepare_all(self):
+        self._run_pipeline(list(PreparationPipeline.STEP_2_TASK))
+
+    def _run_pipeline(self, steps):
+        for control in steps:
+            if not self._check_connected(control):
+                return
+        pwrsupplies = self._get_ps_list()
+        if not pwrsupplies:
+            return
+
+        if any('ps' in stp for stp in steps) and \
+                not self._verify_ps(pwrsupplies):
+            return
+
+        self._is_preparing = 'pipeline'
+        self._handle_buttons_enabled(False)
+        self.progress_list.clear()
+        self._pipeline_items = dict()
+
+        self.pipeline = PreparationPipeline(
+            parent=self, steps=steps, psnames=pwrsupplies,
+            timing=self._timing, isadv=self._is_adv_mode)
+        self.pipeline.updated.connect(self._update_pipeline_log)
+        self.pipeline.progressChanged.connect(self._update_pipeline_progress)
+        self.pipeline.stepFinished.connect(self._handle_pipeline_step)
+        self.pipeline.finished.connect(self._handle_pipeline_finished)
+
+        self.progress_bar.setMinimum(0)
+        self.progress_bar.setMaximum(1000)
+        self.progress_bar.setValue(0)
+        pal = self.progress_bar.palette()
+        pal.setColor(QPalette.Highlight, self.progress_bar.default_color)
+        self.progress_bar.setPalette(pal)
+
+        self.pipeline.start()
+
+    def _update_pipeline_progress(self, fraction):
+        self.progress_bar.setValue(int(fraction*self.progress_bar.maximum()))
+
+    def _handle_pipeline_step(self, step, status):
+        if step in self._prepared:
+            self._prepared[step] = status
+        if not status:
+            pal = self.progress_bar.palette()
+            pal.setColor(QPalette.Highlight, self.progress_bar.warning_color)
+            self.progress_bar.setPalette(pal)
+        self._handle_stslabels_content()
+
+    def _handle_pipeline_finished(self):
+        durations = self.pipeline.durations
+        text = ', '.join(
+            '{0}: {1:.1f}s'.format(stp, durations[stp])
+            for stp in self.pipeline.steps if stp in durations)
+        self.progress_list.addItem('Steps duration: ' + text)
+        self.progress_list.scrollToBottom()
+        self._is_preparing = ''
+        self._handle_buttons_enabled(True, cycle=all(self._prepared.values()))
+
+    def _update_pipeline_log(self, step, text, done, warning, error):
+        """Update progress list keeping the last line of each step."""
+        last_item = self._pipeline_items.get(step)
+        if done:
+            if last_item is not None:
+                last_item.setText(last_item.text()+' done.')
+            return
+        for msg in self._PROGRESS_MSGS:
+            if msg not in text:
+                continue
+            if last_item is not None and msg in last_item.text():
+                last_item.setText(text)
+                return
+            break
+        item = QListWidgetItem(text)
+        if error:
+            item.setForeground(errorcolor)
+        elif warning:
+            item.setForeground(warncolor)
+        self.progress_list.addItem(item)
+        self.progress_list.scrollToBottom()
+        self._pipeline_items[step] = item
+
     def _update_progress(self, text, done, warning=False, error=False):
         """Update automated cycle progress list and bar."""
         if done:
@@ -432,6 +522,7 @@ class CycleWindow(SiriusMainWindow):
             self.progress_list.scrollToBottom()
 
     def _handle_buttons_enabled(self, enable, cycle=False):
+        self.prepare_all_bt.setEnabled(enable)
         self.save_timing_bt.setEnabled(enable)
         self.prepare_timing_bt.setEnabled(enable)
         self.set_ps_idffmode_off_bt.setEnabled(enable)
@@ -646,6 +737,10 @@ class CycleWindow(SiriusMainWindow):
 
     def closeEvent(self, ev):
         self._update_setup_timer.stop()
+        if self.pipeline is not None and self.pipeline.isRunning():
+            # running steps use the shared cycle controller
+            self.pipeline.exit_task()
+            self.pipeline.wait()
         super().closeEvent(ev)
 
 
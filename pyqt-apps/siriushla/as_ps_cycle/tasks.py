@@ -1,7 +1,14 @@
 
 from copy import deepcopy as _dcopy
+import re as _re
 import time as _time
+import logging as _log
 from datetime import datetime as _datetime
+from functools import partial as _partial
+from threading import get_ident as _get_ident, Lock as _Lock, \
+    Condition as _Condition
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor, \
+    wait as _wait, FIRST_COMPLETED as _FIRST_COMPLETED
 from qtpy.QtCore import Signal, QThread
 from siriuspy.namesys import SiriusPVName as PVName
 from siriuspy.search import PSSearch
@@ -12,6 +19,16 @@ from siriuspy.cycle import PSCycler, LinacPSCycler, PSCyclerFBP, FOFBPSCycler,\
 TIMEOUT_CHECK = 10
 TIMEOUT_SLEEP = 0.1
 TIMEOUT_CONN = 0.5
+TIMEOUT_RECHECK = 1
+
+# cycler properties each check depends on, checks are reevaluated when
+# they change. All cycler properties are monitored for other methods.
+CHECK_PROPTIES = {
+    'check_on': ('PwrState-Sts', 'PwrState-Sel'),
+    'check_intlks': (
+        'IntlkSoft-Mon', 'IntlkHard-Mon', 'StatusIntlk-Mon',
+        'IntlkWarn-Mon', 'AlarmsAmp-Mon'),
+}
 
 
 class BaseTask(QThread):
@@ -42,6 +59,7 @@ class BaseTask(QThread):
                 BaseTask._controller.timing = timing
                 BaseTask._controller.logger = self
         self._quit_task = False
+        self._timing_stats = dict()
 
     def size(self):
         """Return task size."""
@@ -71,6 +89,23 @@ class BaseTask(QThread):
         """Must be reimplemented in each class."""
         raise NotImplementedError
 
+    @property
+    def timing_stats(self):
+        """Return timing statistics of the last check phases.
+
+        Returns:
+            dict: for each cycler method, a dict with the phase elapsed
+                time ('total') and the time each power supply took to
+                pass the check ('devices') [s].
+        """
+        return _dcopy(self._timing_stats)
+
+    def slowest_devices(self, method, nr=5):
+        """Return (psname, time) of the nr slowest devices in a phase."""
+        stats = self._timing_stats.get(method, dict())
+        devs = stats.get('devices', dict())
+        return sorted(devs.items(), key=lambda x: x[1], reverse=True)[:nr]
+
     def _set(self, method, **kwargs):
         """Set."""
         for ps in self._psnames:
@@ -87,29 +122,91 @@ class BaseTask(QThread):
                 break
 
     def _check(self, method, timeout=TIMEOUT_CHECK, **kwargs):
-        """Check."""
+        """Check.
+
+        The cycler method is evaluated for all power supplies when the
+        check starts and, for the ones that did not pass, again only
+        when one of the PVs it depends on changes (see CHECK_PROPTIES).
+        All pending power supplies are reevaluated every TIMEOUT_RECHECK
+        seconds in case an update was missed.
+        """
         self._interrupted = False
-        need_check = _dcopy(self._psnames)
-        t = _time.time()
-        while _time.time() - t < timeout:
-            for ps in self._psnames:
-                if ps not in need_check:
-                    continue
-                cycler = BaseTask._cyclers[ps]
-                func = getattr(cycler, method)
-                if func(**kwargs):
-                    self.currentItem.emit(ps)
-                    need_check.remove(ps)
-                    self.itemDone.emit(ps, True)
+        tini = _time.time()
+        devices = dict()
+        pending = set(self._psnames)
+        dirty = set(self._psnames)
+        cond = _Condition()
+
+        def _changed(ps, **kws):
+            with cond:
+                dirty.add(ps)
+                cond.notify()
+
+        callbacks = self._add_check_callbacks(method, _changed)
+        try:
+            trecheck = tini
+            while pending:
                 if self._quit_task:
                     self._interrupted = True
                     break
-            if (not need_check) or (self._quit_task):
-                break
-            _time.sleep(TIMEOUT_SLEEP)
-        for ps in need_check:
+                now = _time.time()
+                if now - tini >= timeout:
+                    break
+                with cond:
+                    if now - trecheck >= TIMEOUT_RECHECK:
+                        trecheck = now
+                        dirty.update(pending)
+                    todo = dirty & pending
+                    dirty.clear()
+                    if not todo:
+                        cond.wait(min(
+                            timeout - (now - tini),
+                            TIMEOUT_RECHECK - (now - trecheck)))
+                        continue
+                for ps in self._psnames:
+                    if ps not in todo:
+                        continue
+                    func = getattr(BaseTask._cyclers[ps], method)
+                    if func(**kwargs):
+                        pending.remove(ps)
+                        devices[ps] = _time.time() - tini
+                        self.currentItem.emit(ps)
+                        self.itemDone.emit(ps, True)
+                    if self._quit_task:
+                        break
+        finally:
+            for pvobj, index in callbacks:
+                pvobj.remove_callback(index)
+
+        for ps in self._psnames:
+            if ps not in pending:
+                continue
+            devices[ps] = _time.time() - tini
             self.currentItem.emit(ps)
             self.itemDone.emit(ps, False)
+        self._save_timing_stats(method, tini, devices)
+
+    def _add_check_callbacks(self, method, callback):
+        propties = CHECK_PROPTIES.get(method)
+        callbacks = list()
+        for ps in self._psnames:
+            cycler = BaseTask._cyclers[ps]
+            for prop in cycler.properties:
+                if propties is not None and prop not in propties:
+                    continue
+                pvobj = cycler[prop]
+                index = pvobj.add_callback(_partial(callback, ps))
+                callbacks.append((pvobj, index))
+        return callbacks
+
+    def _save_timing_stats(self, method, tini, devices):
+        total = _time.time() - tini
+        self._timing_stats[method] = {'total': total, 'devices': devices}
+        slowest = ', '.join(
+            '{0} ({1:.2f}s)'.format(ps, dur)
+            for ps, dur in self.slowest_devices(method, 3))
+        _log.info('%s on %d power supplies took %.2fs, slowest: %s',
+                  method, len(devices), total, slowest)
 
 
 class CreateCyclers(BaseTask):
@@ -145,7 +242,9 @@ class VerifyPS(BaseTask):
     def function(self):
         """Verify if PS is ready for cycle."""
         self._check(method='check_on')
-        self._check(method='check_intlks')
+        # checks are reevaluated on interlock updates, so there is no
+        # need to wait long on each evaluation
+        self._check(method='check_intlks', wait=2*TIMEOUT_SLEEP)
 
 
 class SaveTiming(BaseTask):
@@ -316,3 +415,164 @@ class RestoreTiming(BaseTask):
 
     def function(self):
         self._controller.restore_timing_initial_state()
+
+
+class PreparationPipeline(QThread):
+    """Run preparation tasks as a dependency graph.
+
+    Steps whose dependencies are satisfied run concurrently, so the
+    timing chain runs alongside the first power supplies steps. Steps
+    not selected are considered already done. A step that fails makes
+    all steps that depend on it to be skipped.
+
+    Log messages are emitted with the step that produced them, so
+    concurrent steps can report progress on their own lines.
+
+    Completion is computed from the per-device counts reported by the
+    cycle controller ('Sent i/n', 'Successfully checked i/n').
+    """
+
+    STEP_2_TASK = {
+        'save_timing': SaveTiming,
+        'timing': PrepareTiming,
+        'ps_idffmode': PreparePSIDFFMode,
+        'ps_om_slowref': PreparePSOpModeSlowRef,
+        'ps_current': PreparePSCurrentZero,
+        'ps_params': PreparePSParams,
+        'ps_om_cycle': PreparePSOpModeCycle,
+    }
+    # the power supplies steps share the controller check state,
+    # so they must run in sequence. Power supplies can only be put in
+    # cycle mode after timing disabled their triggers.
+    DEPENDENCIES = {
+        'save_timing': (),
+        'timing': ('save_timing', ),
+        'ps_idffmode': (),
+        'ps_om_slowref': ('ps_idffmode', ),
+        'ps_current': ('ps_om_slowref', ),
+        'ps_params': ('ps_current', ),
+        'ps_om_cycle': ('ps_params', 'timing'),
+    }
+    _FRAC_PATTERN = _re.compile(r'(\d+)/(\d+)')
+
+    updated = Signal(str, str, bool, bool, bool)
+    stepStarted = Signal(str)
+    stepFinished = Signal(str, bool)
+    progressChanged = Signal(float)
+
+    def __init__(self, parent=None, steps=(), psnames=list(), timing=None,
+                 isadv=False):
+        super().__init__(parent)
+        self._steps = [stp for stp in self.STEP_2_TASK if stp in steps]
+        self._tasks = {
+            stp: self.STEP_2_TASK[stp](
+                psnames=psnames, timing=timing, isadv=isadv)
+            for stp in self._steps}
+        BaseTask._controller.logger = self
+        self._weights = {
+            stp: max(tsk.size(), 1) for stp, tsk in self._tasks.items()}
+        self._fractions = {stp: 0.0 for stp in self._steps}
+        self._failed = {stp: False for stp in self._steps}
+        self._durations = dict()
+        self._thread2step = dict()
+        self._lock = _Lock()
+        self._quit_task = False
+
+    @property
+    def steps(self):
+        """Return steps to run, in canonical order."""
+        return list(self._steps)
+
+    @property
+    def durations(self):
+        """Return elapsed time of each finished step [s]."""
+        return dict(self._durations)
+
+    def exit_task(self):
+        """Do not start new steps and ask running steps to quit."""
+        self._quit_task = True
+        for tsk in self._tasks.values():
+            tsk.exit_task()
+
+    def run(self):
+        """Run steps."""
+        pending = list(self._steps)
+        running = dict()
+        status = dict()
+        with _ThreadPoolExecutor(max_workers=len(pending) or 1) as executor:
+            while pending or running:
+                for stp in list(pending):
+                    deps = [
+                        dep for dep in self.DEPENDENCIES[stp]
+                        if dep in self._steps]
+                    if any(status.get(dep) is False for dep in deps):
+                        pending.remove(stp)
+                        status[stp] = False
+                        self.update(
+                            'Skipping ' + stp + ', a dependency failed.',
+                            False, True, False)
+                        self.stepFinished.emit(stp, False)
+                    elif self._quit_task:
+                        pending.remove(stp)
+                    elif all(status.get(dep) for dep in deps):
+                        pending.remove(stp)
+                        fut = executor.submit(self._run_step, stp)
+                        running[fut] = stp
+                if not running:
+                    continue
+                done, _ = _wait(running, return_when=_FIRST_COMPLETED)
+                for fut in done:
+                    stp = running.pop(fut)
+                    status[stp] = fut.result()
+                    self.stepFinished.emit(stp, status[stp])
+
+    def update(self, message, done, warning, error):
+        """Receive cycle controller log messages."""
+        stp = self._thread2step.get(_get_ident(), '')
+        with self._lock:
+            if error and stp:
+                self._failed[stp] = True
+            if not done:
+                self._update_fraction(stp, message)
+        now = _datetime.now().strftime('%Y/%m/%d-%H:%M:%S')
+        self.updated.emit(stp, now+'  '+message, done, warning, error)
+
+    def _run_step(self, stp):
+        self._thread2step[_get_ident()] = stp
+        self.stepStarted.emit(stp)
+        tini = _time.time()
+        try:
+            self._tasks[stp].function()
+        except Exception as err:
+            self.update(stp + ' raised ' + repr(err), False, False, True)
+        self._durations[stp] = _time.time() - tini
+        with self._lock:
+            ok = not self._failed[stp]
+            if ok:
+                self._fractions[stp] = 1.0
+            self._emit_progress()
+        return ok
+
+    def _update_fraction(self, stp, message):
+        if stp not in self._fractions:
+            return
+        mat = self._FRAC_PATTERN.search(message)
+        if not mat:
+            return
+        val, tot = int(mat.group(1)), int(mat.group(2))
+        frac = val/tot if tot else 1.0
+        # each device is first set and then checked
+        if message.startswith('Successfully checked'):
+            frac = 0.5 + frac/2
+        elif message.startswith('Sent '):
+            frac = frac/2
+        self._fractions[stp] = max(self._fractions[stp], min(frac, 1.0))
+        self._emit_progress()
+
+    def _emit_progress(self):
+        total = sum(self._weights.values())
+        if not total:
+            return
+        value = sum(
+            self._weights[stp]*self._fractions[stp] for stp in self._steps)
+        self.progressChanged.emit(value/total)
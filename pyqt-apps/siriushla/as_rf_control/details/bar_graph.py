@@ -4,6 +4,7 @@ from pyqtgraph import BarGraphItem, PlotWidget
 from qtpy.QtCore import QTimer
 
 from ...widgets import SiriusConnectionSignal as _ConnSignal
+from ...widgets.windows import register_plot_widget
 
 
 class BarGraph(PlotWidget):
@@ -12,6 +13,7 @@ class BarGraph(PlotWidget):
     def __init__(self, channels=list(), xLabels=list(), yLabel='', title=''):
         """Init."""
         super().__init__()
+        register_plot_widget(self)
         self._channels = list()
         for chn in channels:
             self._channels.append(_ConnSignal(chn))
@@ -40,7 +40,7 @@ class BucketListLineEdit(PyDMLineEdit):
 
 class BucketListLabel(SiriusLabel):
 
-    def value_changed(self, value):
+    def format_value(self, value):
         maxele = 20
         if isinstance(value, _np.ndarray):
             zeros = _np.where(value == 0)[0]
@@ -48,9 +48,8 @@ class BucketListLabel(SiriusLabel):
                 value = value[:zeros[0]]
             txt = '[ ' + ' '.join([str(i) for i in value[:maxele]])
             txt += ' ...]' if value.size > maxele else ']'
-            self.setText(txt)
-        else:
-            super().value_changed(value)
+            return txt
+        return super().format_value(value)
 
 
 class EVG(BaseWidget):
@@ -862,6 +861,11 @@ class EVG(BaseWidget):
 class BucketListGraph(BaseWidget):
     """Bucket List Graph."""
 
+    NR_BUCKETS = 864
+    # Each bucket n is drawn as a step from n-0.5 to n+0.5, so curves
+    # have two points per bucket and the same x vector for all updates.
+    _STEP_X = _np.repeat(_np.arange(NR_BUCKETS + 1) + 0.5, 2)[1:-1]
+
     def __init__(self, parent=None, device='', prefix=''):
         if not device:
             device = LLTimeSearch.get_evg_name()
@@ -901,6 +905,8 @@ class BucketListGraph(BaseWidget):
         self._curves['Mon'] = self.graph.curveAtIndex(2)
         self._curves['Mon'].setFillLevel(0)
         self._curves['Mon'].setBrush(QBrush(QColor('green')))
+        for curve in self._curves.values():
+            curve.receiveXWaveform(self._STEP_X)
 
         # Show
         self.show_sp = QCheckBox('SP')
@@ -940,18 +946,21 @@ class BucketListGraph(BaseWidget):
         self._ch_mn.new_value_signal[_np.ndarray].connect(self._update_curves)
         self._ch_mn.new_value_signal[int].connect(self._update_curves)
 
+        self._channel2curve = {
+            self._ch_sp: self._curves['SP'],
+            self._ch_rb: self._curves['RB'],
+            self._ch_mn: self._curves['Mon'],
+        }
+
     @Slot(int)
     @Slot(_np.ndarray)
     def _update_curves(self, new_array):
-        new_array = _np.asarray(new_array)
-
-        for k in self._curves:
-            if self.sender().address.endswith(k):
-                curve = self._curves[k]
-                break
+        curve = self._channel2curve.get(self.sender())
+        if curve is None:
+            return
 
-        org_bunch = _np.arange(1, 864) - 0.5
-        org_curve = _np.zeros(864)
+        new_array = _np.asarray(new_array, dtype=int)
+        org_curve = _np.zeros(self.NR_BUCKETS)
         # trying to catch bug observed where new_array
         # had strange values greater than 864
         try:
@@ -962,15 +971,7 @@ class BucketListGraph(BaseWidget):
                 f'{self.sender().address} with values out of [1, 864]')
             _log.warning(f'IndexError: new_array: {new_array}')
 
-        new_bunch = _np.linspace(1, 864, 10000) - 0.5
-        new_bunch_indices = _np.searchsorted(
-            _np.nextafter(org_bunch, -_np.inf), new_bunch, side='left')
-        new_bunch_indices = new_bunch_indices.clip(
-            1, len(org_bunch)).astype(_np.int_)
-        new_curve = org_curve[new_bunch_indices-1]
-
-        curve.receiveXWaveform(new_bunch)
-        curve.receiveYWaveform(new_curve)
+        curve.receiveYWaveform(_np.repeat(org_curve, 2))
 
 
 class BucketList(BaseWidget):
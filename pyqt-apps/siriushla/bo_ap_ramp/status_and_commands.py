@@ -1,10 +1,11 @@
 """Booster Ramp Control HLA: General Status Module."""
 
 from functools import partial as _part
-import time as _time
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+import numpy as _np
 from qtpy.QtWidgets import QGroupBox, QLabel, QPushButton, QGridLayout, \
     QMessageBox, QVBoxLayout, QComboBox
-from qtpy.QtCore import Qt, Slot, Signal, QThread
+from qtpy.QtCore import Qt, Slot, Signal, QThread, QTimer
 import qtawesome as qta
 
 from siriuspy.ramp import ramp
@@ -17,12 +18,15 @@ from siriushla.widgets import PyDMLedMultiChannel, PyDMLedMultiConnection
 from siriushla.widgets.dialog import ProgressDialog
 
 EVT_LIST = ['Linac', 'InjBO', 'InjSI', 'Study']
+WFM_ABS_TOL = 1e-5  # [A], same tolerance used by ConnPS to check waveforms
+TI_LISTEN_TIME = 3000  # [ms], time TI readbacks are followed after apply
 
 
 class StatusAndCommands(QGroupBox):
     """Widget to show general Booster timing and power supplies status."""
 
     inj_eje_times = Signal(float, float)
+    _tiTimesChanged = Signal()
 
     def __init__(self, parent=None, prefix='', ramp_config=None):
         """Initialize object."""
@@ -33,6 +37,16 @@ class StatusAndCommands(QGroupBox):
         self.conn_ps = None
         self.conn_rf = None
         self.conn_ti = None
+        self._inj_eje_times = None
+        self._ti_listen = QTimer(self)
+        self._ti_listen.setSingleShot(True)
+        self._ti_listen.setInterval(TI_LISTEN_TIME)
+        self._ti_listen.timeout.connect(self._emit_inj_eje_times)
+        c = _ConnTI.Const
+        self._inj_eje_propties = {
+            c.EvtInjBO_Delay, c.TrgEGunSglBun_Delay, c.TrgEGunMultBun_Delay,
+            c.LinacEgun_SglBun_State, c.EvtInjSI_Delay, c.TrgEjeKckr_Delay}
+        self._tiTimesChanged.connect(self._update_inj_eje_times)
         th = _createConnectorsThread(self, prefix)
         th.start()
 
@@ -169,45 +183,92 @@ class StatusAndCommands(QGroupBox):
         dlg = ProgressDialog('Preparing TI to ramp...', task, self)
         dlg.exec_()
 
-    def _apply_ps(self, psnames=list(), dialog_parent=None):
-        if dialog_parent is None:
-            dialog_parent = self
-        task = _CommandThread(
-            parent=self, conn=self.conn_ps, use_log=True, size=len(psnames),
-            cmds=_part(self.conn_ps.cmd_wfm, psnames),
-            warn_msgs='Failed to set waveform!')
-        dlg = ProgressDialog(
-            'Setting magnets waveforms...', task, dialog_parent)
-        dlg.exec_()
+    def _get_psnames_to_apply(self, psnames):
+        """Return power supplies whose waveforms differ from the machine."""
+        return [psn for psn in psnames if not self._check_wfm_applied(psn)]
 
-    def _apply_rf(self, dialog_parent=None):
-        if dialog_parent is None:
-            dialog_parent = self
-        task = _CommandThread(
-            parent=self, conn=self.conn_rf, use_log=True,
-            cmds=self.conn_rf.cmd_config_ramp,
-            warn_msgs='Failed to set RF parameters!')
-        dlg = ProgressDialog('Setting RF parameters...', task, dialog_parent)
-        dlg.exec_()
+    def _check_wfm_applied(self, psname):
+        """Check whether ramp config waveform is applied to power supply."""
+        wfm = self.ramp_config.ps_waveform_get_currents(psname)
+        rdb = self.conn_ps.get_readback(psname + ':Wfm-SP')
+        if rdb is None:
+            return False
+        return len(rdb) == len(wfm) and \
+            _np.allclose(rdb, wfm, rtol=0, atol=WFM_ABS_TOL)
 
-    def _apply_ti(self, dialog_parent=None):
+    def _apply(self, psnames=list(), rf=False, ti=False, dialog_parent=None):
+        """Apply configuration to PS, RF and TI concurrently."""
         if dialog_parent is None:
             dialog_parent = self
-        events_inj, events_eje = self._get_inj_eje_events()
-        task = _CommandThread(
-            conn=self.conn_ti, parent=self,
-            cmds=[_part(self.conn_ti.cmd_config_ramp,
-                        events_inj, events_eje),
-                  self.conn_ti.cmd_update_evts],
-            warn_msgs=['Failed to set TI parameters!',
-                       'Failed to update events!'])
-        dlg = ProgressDialog('Setting TI parameters...', task, dialog_parent)
+
+        jobs, labels = list(), list()
+        psnames = self._get_psnames_to_apply(psnames)
+        if psnames:
+            labels.append('magnets waveforms')
+            jobs.append(_CommandThread(
+                parent=self, conn=self.conn_ps, use_log=True,
+                size=len(psnames),
+                cmds=_part(self.conn_ps.cmd_wfm, psnames),
+                warn_msgs='Failed to set waveform!'))
+        if rf:
+            labels.append('RF parameters')
+            jobs.append(_CommandThread(
+                parent=self, conn=self.conn_rf,
+                cmds=self.conn_rf.cmd_config_ramp,
+                warn_msgs='Failed to set RF parameters!'))
+        if ti:
+            labels.append('TI parameters')
+            events_inj, events_eje = self._get_inj_eje_events()
+            jobs.append(_CommandThread(
+                conn=self.conn_ti, parent=self,
+                cmds=[_part(self.conn_ti.cmd_config_ramp,
+                            events_inj, events_eje),
+                      self.conn_ti.cmd_update_evts],
+                warn_msgs=['Failed to set TI parameters!',
+                           'Failed to update events!']))
+        if not jobs:
+            mb = QMessageBox(dialog_parent)
+            mb.setIcon(QMessageBox.Information)
+            mb.setWindowTitle('Message')
+            mb.setText('Waveforms already applied, nothing to do.')
+            mb.exec_()
+            return
+
+        task = _ConcurrentCommandsThread(jobs, parent=self)
+        dlg = ProgressDialog(
+            'Setting ' + ', '.join(labels) + '...', task, dialog_parent)
         dlg.exec_()
-        # update values of inj and eje times in fact implemented
-        _time.sleep(3)
-        inj_time = self.conn_ti.get_injection_time()/1000  # [ms]
-        eje_time = self.conn_ti.get_ejection_time()/1000  # [ms]
-        self.inj_eje_times.emit(inj_time, eje_time)
+        if ti:
+            # follow values in fact implemented while TI readbacks update;
+            # they are emitted at the end even if they did not change
+            self._inj_eje_times = None
+            self._ti_listen.start()
+
+    def _update_inj_eje_times(self):
+        """Emit inj and eje times if TI changes follow an apply."""
+        if self._ti_listen.isActive():
+            self._emit_inj_eje_times()
+
+    def _emit_inj_eje_times(self):
+        """Emit inj and eje times read back from TI subsystem."""
+        if self.ramp_config is None or self.conn_ti is None:
+            return
+        try:
+            times = (self.conn_ti.get_injection_time()/1000,  # [ms]
+                     self.conn_ti.get_ejection_time()/1000)  # [ms]
+        except TypeError:
+            # readbacks not available yet
+            return
+        if times == self._inj_eje_times:
+            return
+        self._inj_eje_times = times
+        self.inj_eje_times.emit(*times)
+
+    def _ti_callback(self, **kwargs):
+        """Notify changes of properties used to calc inj and eje times."""
+        name = kwargs['property'].name
+        if name in self._inj_eje_propties:
+            self._tiTimesChanged.emit()
 
     def apply_changes(self, dialog_parent=None):
         if self.ramp_config is None:
@@ -237,17 +298,13 @@ class StatusAndCommands(QGroupBox):
             psnames = self.conn_ps.psnames
 
         if 'Dipole' in sender_name:
-            self._apply_ps(psnames, dialog_parent)
-            self._apply_ti(dialog_parent)
+            self._apply(psnames, ti=True, dialog_parent=dialog_parent)
         elif 'Multipoles' in sender_name:
-            self._apply_ps(psnames, dialog_parent)
+            self._apply(psnames, dialog_parent=dialog_parent)
         elif 'RF' in sender_name:
-            self._apply_rf(dialog_parent)
-            self._apply_ti(dialog_parent)
+            self._apply(rf=True, ti=True, dialog_parent=dialog_parent)
         elif 'All' in sender_name:
-            self._apply_ps(psnames, dialog_parent)
-            self._apply_rf(dialog_parent)
-            self._apply_ti(dialog_parent)
+            self._apply(psnames, rf=True, ti=True, dialog_parent=dialog_parent)
 
     @Slot(str, list)
     def show_warning_message(self, msg, problems):
@@ -433,6 +490,48 @@ class _CommandThread(QThread):
         self.itemDone.emit(item)
 
 
+class _ConcurrentCommandsThread(QThread):
+    """Thread to perform commands of several _CommandThreads concurrently.
+
+    Each _CommandThread runs in its own worker thread, so commands of
+    different subsystems do not wait for each other.
+    """
+
+    currentItem = Signal(str)
+    itemDone = Signal(str)
+    completed = Signal()
+
+    def __init__(self, jobs, parent=None):
+        """Initialize."""
+        super().__init__(parent)
+        self._jobs = jobs
+        for job in jobs:
+            job.currentItem.connect(self.currentItem)
+            job.itemDone.connect(self.itemDone)
+
+    def size(self):
+        """Task size."""
+        return sum(job.size() for job in self._jobs)
+
+    def exit_task(self):
+        """Set quit flag."""
+        for job in self._jobs:
+            job.exit_task()
+
+    def run(self):
+        """Run."""
+        with _ThreadPoolExecutor(max_workers=len(self._jobs)) as executor:
+            futures = [executor.submit(job.run) for job in self._jobs]
+        for job, fut in zip(self._jobs, futures):
+            try:
+                fut.result()
+            except Exception as err:
+                job.sentWarning.emit(
+                    'Failed to run {} commands!'.format(job._subsystem),
+                    [repr(err), ])
+        self.completed.emit()
+
+
 class _createConnectorsThread(QThread):
     """Thread to create connectors and set leds channels."""
 
@@ -444,7 +543,8 @@ class _createConnectorsThread(QThread):
     def run(self):
         # Create connectors
         self.parent.conn_ps = _ConnPS(prefix=self.prefix)
-        self.parent.conn_ti = _ConnTI(prefix=self.prefix)
+        self.parent.conn_ti = _ConnTI(
+            prefix=self.prefix, callback=self.parent._ti_callback)
         self.parent.conn_rf = _ConnRF(prefix=self.prefix)
 
         # Build leds channels
@@ -9,6 +9,7 @@ from qtpy.QtCore import Qt, Slot, Signal, Property
 from pydm.widgets import PyDMImageView, PyDMPushButton, PyDMEnumComboBox, \
     PyDMLineEdit
 from pydm.widgets.channel import PyDMChannel
+from pyqtgraph import ImageItem
 
 from siriushla.widgets import PyDMStateButton, SiriusLedState, SiriusLabel, \
     SiriusSpinbox
@@ -43,6 +44,16 @@ class SiriusImageView(PyDMImageView):
         self._image_maxheight = 0
         self._maxheightchannel = None
         self._show_calibration_grid = False
+        self._calibration_grid_version = 0
+        self._calibration_grid_overlay_key = None
+        self._image_shape = None
+        self._calibration_grid_item = ImageItem()
+        self._calibration_grid_item.setOpts(axisOrder='row-major')
+        self._calibration_grid_item.setZValue(10)
+        self._calibration_grid_item.hide()
+        self.getView().addItem(self._calibration_grid_item)
+        self.getImageItem().sigImageChanged.connect(
+            self._update_calibration_grid_overlay)
         # Set live channels if requested on initialization
         if offsetx_channel:
             self.ROIOffsetXChannel = offsetx_channel
@@ -87,12 +98,13 @@ class SiriusImageView(PyDMImageView):
             roi[-border:, :] = np.full((border, roi.shape[1]), maxdata)
         self._calibration_grid_image = np.where(
             roi < self._calibration_grid_filterfactor*maxdata, True, False)
+        self._calibration_grid_version += 1
 
     @Slot(bool)
     def showCalibrationGrid(self, show):
         """Show calibration_grid_image over the current image_waveform."""
         self._show_calibration_grid = show
-        self.needs_redraw = True
+        self._update_calibration_grid_overlay()
 
     @property
     def calibrationGrid(self):
@@ -106,7 +118,7 @@ class SiriusImageView(PyDMImageView):
         self._calibration_grid_width = int(data[0])
         self._calibration_grid_maxdata = data[1:].max()
         self._update_calibration_grid_image()
-        self.needs_redraw = True
+        self._update_calibration_grid_overlay()
 
     @property
     def calibration_grid_filterfactor(self):
@@ -152,7 +164,7 @@ class SiriusImageView(PyDMImageView):
             self._calibration_grid_filterfactor = value
             if self._calibration_grid_image is not None:
                 self._update_calibration_grid_image()
-                self.needs_redraw = True
+                self._update_calibration_grid_overlay()
 
     def set_calibration_grid_border2remove(self, value):
         """Set factor used to remove border of the calibration grid.
@@ -166,29 +178,56 @@ class SiriusImageView(PyDMImageView):
         self._calibration_grid_removeborder = value
         if self._calibration_grid_image is not None:
             self._update_calibration_grid_image()
-            self.needs_redraw = True
+            self._update_calibration_grid_overlay()
 
     def process_image(self, image):
-        """Reimplement process_image method to add grid to image."""
+        """Reimplement process_image method to keep track of image shape.
+
+        The calibration grid is drawn as a separate overlay item, so the
+        frames are displayed without copying.
+        """
         self.receivedData.emit()
-        image2process = _dcopy(image)
-        if ((self._show_calibration_grid) and
-                (self._calibration_grid_image is not None)):
-            try:
-                grid = self._adjust_calibration_grid(image2process)
-                image2process[grid] = self._calibration_grid_maxdata
-            except Exception:
-                print('Grid dimentions do not match image dimentions!')
-        return image2process
+        self._image_shape = image.shape
+        return image
 
-    def _adjust_calibration_grid(self, img):
-        height = np.size(img, 0)
-        width = np.size(img, 1)
+    def _adjust_calibration_grid(self, shape):
+        height, width = shape[:2]
         grid = self._calibration_grid_image[
             self._image_roi_offsety:(self._image_roi_offsety+height),
             self._image_roi_offsetx:(self._image_roi_offsetx+width)]
         return grid
 
+    @Slot()
+    def _update_calibration_grid_overlay(self):
+        """Update calibration grid overlay, only if its inputs changed."""
+        item = self._calibration_grid_item
+        if not self._show_calibration_grid or \
+                self._calibration_grid_image is None or \
+                self._image_shape is None:
+            item.hide()
+            return
+
+        key = (
+            self._image_shape[:2], self._image_roi_offsetx,
+            self._image_roi_offsety, self._calibration_grid_version,
+            self.colorMap)
+        if key != self._calibration_grid_overlay_key:
+            grid = self._adjust_calibration_grid(self._image_shape)
+            if grid.shape != tuple(self._image_shape[:2]):
+                print('Grid dimentions do not match image dimentions!')
+                item.hide()
+                return
+            lut = self.getImageItem().lut
+            color = (255, 255, 255)
+            if isinstance(lut, np.ndarray) and lut.ndim == 2:
+                color = lut[-1][:3]
+            overlay = np.zeros(grid.shape + (4, ), dtype=np.uint8)
+            overlay[grid, :3] = color
+            overlay[grid, 3] = 255
+            item.setImage(overlay, autoLevels=False)
+            self._calibration_grid_overlay_key = key
+        item.show()
+
     def roioffsetx_connection_state_changed(self, conn):
         """
         Run when the ROIOffsetX Channel connection state changes.
@@ -1,6 +1,6 @@
 """Task module init."""
 
-from .getter import EpicsGetter
+from .getter import EpicsGetter, EpicsBulkGetter
 from .setter import EpicsSetter
 from .checker import EpicsChecker
 from .connector import EpicsConnector
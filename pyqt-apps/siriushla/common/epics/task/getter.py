@@ -1,4 +1,5 @@
 """Epics Getter."""
+import time
 from qtpy.QtCore import Signal, QVariant
 from .task import EpicsTask
 from ..wrapper import PyEpicsWrapper
@@ -30,3 +31,59 @@ class EpicsGetter(EpicsTask):
                 if self._quit_task:
                     break
         self.completed.emit()
+
+
+class EpicsBulkGetter(EpicsTask):
+    """Get value of a set of PVs, connecting to all of them at once.
+
+    All PVs are created before the first read, so they connect
+    concurrently, and reads share a single deadline. Reads after the
+    deadline still wait MIN_TIMEOUT, so PVs that connected but have no
+    value cached yet can be read. Values are emitted in batches through
+    `itemsRead`, as lists of (index, value) tuples, where index is the
+    position of the PV in the list of PV names.
+    """
+
+    itemsRead = Signal(list)
+    itemNotRead = Signal(str)
+
+    BATCH_SIZE = 200
+    BATCH_INTERVAL = 0.1
+    MIN_TIMEOUT = 0.05
+
+    def __init__(self, pvs, defvals=None, cls_epics=PyEpicsWrapper,
+                 parent=None, timeout=2.0):
+        super().__init__(pvs, defvals, None, cls_epics, parent, timeout)
+
+    def run(self):
+        """Thread execution."""
+        if not self._quit_task:
+            self.currentItem.emit('Connecting to PVs...')
+            pvs = [self.get_pv(pvn) for pvn in self._pvnames]
+
+            batch = list()
+            tini = tbatch = time.time()
+            for i, pvn in enumerate(self._pvnames):
+                self.currentItem.emit(pvn)
+                if pvn.endswith('-Cmd') and self._values is not None:
+                    value = self._values[i]
+                else:
+                    remain = max(
+                        self._timeout - (time.time() - tini),
+                        self.MIN_TIMEOUT)
+                    value = pvs[i].get(remain)
+                if value is not None:
+                    batch.append((i, value))
+                else:
+                    self.itemNotRead.emit(pvn)
+                now = time.time()
+                if len(batch) >= self.BATCH_SIZE or \
+                        now - tbatch >= self.BATCH_INTERVAL:
+                    self.itemsRead.emit(batch)
+                    batch, tbatch = list(), now
+                self.itemDone.emit()
+                if self._quit_task:
+                    break
+            if batch:
+                self.itemsRead.emit(batch)
+        self.completed.emit()
@@ -1,12 +1,15 @@
 """Custom widgets."""
 
+from functools import partial as _part
+
 import numpy as np
 from pydm.widgets import PyDMLineEdit
 from pydm.widgets.waveformplot import WaveformCurveItem
-from qtpy.QtCore import Slot
+from qtpy.QtCore import Slot, Signal, QObject
 from siriuspy.search import IDSearch
 
 from ..as_ap_configdb import LoadConfigDialog as _LoadConfigDialog
+from ..widgets import SiriusConnectionSignal
 
 
 class ConfigLineEdit(PyDMLineEdit):
@@ -25,29 +28,73 @@ class ConfigLineEdit(PyDMLineEdit):
         self.value_changed(configname)
 
 
-class SectionedWaveformCurveItem(WaveformCurveItem):
+class IDFFTable(QObject):
+    """Feedforward tables of an ID, shared by the table curves.
 
-    def __init__(self, idname, section, **kwargs):
-        """Sectioned waveform curve item."""
-        super().__init__(**kwargs)
-        self.section = section
+    Table-SP and Table-RB waveforms have the tables of the 4 correctors
+    in sequence. Each new waveform is reshaped once into a (4, npts)
+    array, so curves only take views of their sections.
+    """
+
+    NR_SECTIONS = 4
+    tableChanged = Signal(str)
 
+    def __init__(self, idname, kind2pvname, parent=None):
+        """Init."""
+        super().__init__(parent)
         # NOTE: Up to now FF tables in beaglebones
         # interpolate from zero to maximum gap (kparam),
         # instead of using the actual gap values.
         param = IDSearch.conv_idname_2_parameters(idname)
         self.kparam_min = 0  # [mm]
         self.kparam_max = param.KPARAM_MAX
+        self._xdata = np.zeros(0)
+        self._tables = dict()
+        self._chans = list()
+        for kind, pvname in kind2pvname.items():
+            self._tables[kind] = np.zeros((self.NR_SECTIONS, 0))
+            chan = SiriusConnectionSignal(pvname)
+            chan.new_value_signal[np.ndarray].connect(
+                _part(self._receive_table, kind))
+            self._chans.append(chan)
+
+    @property
+    def xdata(self):
+        """Return kparam values of table points [mm]."""
+        return self._xdata
+
+    def section(self, kind, section):
+        """Return table of a section."""
+        table = self._tables[kind]
+        if section >= len(table):
+            return np.zeros(0)
+        return table[section]
+
+    def _receive_table(self, kind, value):
+        npts = value.size // self.NR_SECTIONS
+        self._tables[kind] = value[:npts*self.NR_SECTIONS].reshape(
+            self.NR_SECTIONS, npts)
+        if self._xdata.size != npts:
+            grid = np.arange(npts) / max(npts - 1, 1)
+            kmin, kmax = self.kparam_min, self.kparam_max
+            self._xdata = kmin + (kmax - kmin) * grid
+        self.tableChanged.emit(kind)
+
+
+class SectionedWaveformCurveItem(WaveformCurveItem):
+    """Curve of a section of a shared IDFFTable."""
+
+    def __init__(self, table, kind, section, **kwargs):
+        """Sectioned waveform curve item."""
+        super().__init__(**kwargs)
+        self.table = table
+        self.kind = kind
+        self.section = section
+        table.tableChanged.connect(self._update_data)
 
-    @Slot(np.ndarray)
-    def receiveYWaveform(self, new_waveform):
-        size = len(new_waveform) / 4
-        mini = int(size * self.section)
-        maxi = int(size * (self.section + 1))
-        ydata = new_waveform[mini:maxi]
-        npts = len(ydata)
-        kmin, kmax = self.kparam_min, self.kparam_max
-        grid = np.arange(0, npts) / (npts - 1)
-        xdata = kmin + (kmax - kmin) * grid
-        super().receiveXWaveform(xdata)
-        super().receiveYWaveform(ydata)
+    @Slot(str)
+    def _update_data(self, kind):
+        if kind != self.kind:
+            return
+        super().receiveXWaveform(self.table.xdata)
+        super().receiveYWaveform(self.table.section(kind, self.section))
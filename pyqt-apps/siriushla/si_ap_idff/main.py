@@ -1,6 +1,10 @@
 """Main window."""
 
+import time as _time
 from time import strftime, localtime
+from threading import Event as _Event
+
+import numpy as np
 
 from qtpy.QtCore import Qt, Signal, QObject, QThread
 from qtpy.QtWidgets import QLabel, QGridLayout, QSizePolicy as QSzPlcy, \
@@ -27,7 +31,8 @@ from ..widgets.dialog import StatusDetailDialog
 from ..as_ps_control.control_widget.ControlWidgetFactory import \
     ControlWidgetFactory
 from ..as_ps_control import PSDetailWindow
-from .custom_widgets import ConfigLineEdit, SectionedWaveformCurveItem
+from .custom_widgets import ConfigLineEdit, SectionedWaveformCurveItem, \
+    IDFFTable
 from .util import get_idff_icon
 
 
@@ -165,6 +170,11 @@ class IDFFWindow(SiriusMainWindow):
 
         self.stack = QStackedWidget()
         self.plot_dict = {}
+        self.ff_table = IDFFTable(
+            self.idname, {
+                'SP': self.dev_pref.substitute(propty='Table-SP'),
+                'RB': self.dev_pref.substitute(propty='Table-RB')},
+            parent=self)
         for idx, name in enumerate(corrs):
             channel_btn = QRadioButton(name)
             vlay.addWidget(channel_btn)
@@ -218,9 +228,9 @@ class IDFFWindow(SiriusMainWindow):
             color_sp, color_rb = 'green', 'darkGreen'
 
         curve_sp = SectionedWaveformCurveItem(
-            idname=self.idname,
+            table=self.ff_table,
+            kind='SP',
             section=section,
-            y_addr=self.dev_pref.substitute(propty='Table-SP'),
             name="SP",
             color=QColor(color_sp),
         )
@@ -229,9 +239,9 @@ class IDFFWindow(SiriusMainWindow):
         curve_sp.data_changed.connect(plt.set_needs_redraw)
 
         curve_rb = SectionedWaveformCurveItem(
-            idname=self.idname,
+            table=self.ff_table,
+            kind='RB',
             section=section,
-            y_addr=self.dev_pref.substitute(propty='Table-RB'),
             name="RB",
             color=QColor(color_rb),
         )
@@ -553,6 +563,18 @@ class IDFFWindow(SiriusMainWindow):
         self.btn_rampdowncorr.setStyleSheet(
             '#rmpbtndown{min-width:25px; max-width:25px; icon-size:20px;}')
 
+        self.btn_rampcancel = QPushButton('', self)
+        self.btn_rampcancel.clicked.connect(self._cancel_ramp)
+        self.btn_rampcancel.setIcon(qta.icon('fa5s.stop'))
+        self.btn_rampcancel.setToolTip('Stop ramp at current step')
+        self.btn_rampcancel.setObjectName('rmpcancelbtn')
+        self.btn_rampcancel.setStyleSheet(
+            '#rmpcancelbtn{min-width:25px; max-width:25px; icon-size:20px;}')
+        self.btn_rampcancel.setEnabled(False)
+
+        self.lb_rampsts = QLabel('', self, alignment=Qt.AlignCenter)
+        self.lb_rampsts.setWordWrap(True)
+
         self.rampup_initial_icon = self.btn_rampupcorr.icon()
         self.rampdown_initial_icon = self.btn_rampdowncorr.icon()
 
@@ -560,7 +582,7 @@ class IDFFWindow(SiriusMainWindow):
             "Nr. Points:", self, alignment=Qt.AlignRight
         )
         self.sb_rampnrpts = QSpinBox()
-        self.sb_rampnrpts.setRange(1, 10000)
+        self.sb_rampnrpts.setRange(2, 10000)
         self.sb_rampnrpts.setValue(50)
 
         self.lb_rampintvl = QLabel(
@@ -590,6 +612,10 @@ class IDFFWindow(SiriusMainWindow):
         lay.addWidget(self.btn_rampupcorr, 3, 1, alignment=Qt.AlignHCenter)
         lay.addWidget(self.lb_rampdowncorr, 4, 0)
         lay.addWidget(self.btn_rampdowncorr, 4, 1, alignment=Qt.AlignHCenter)
+        lay.addWidget(QLabel(
+            "Stop:", self, alignment=Qt.AlignRight), 5, 0)
+        lay.addWidget(self.btn_rampcancel, 5, 1, alignment=Qt.AlignHCenter)
+        lay.addWidget(self.lb_rampsts, 6, 0, 1, 2)
         # lay.addWidget(
         #     self.btn_rampcorr, 3, 0, 1, 2, alignment=Qt.AlignHCenter
         # )
@@ -618,6 +644,8 @@ class IDFFWindow(SiriusMainWindow):
         self.thread.finished.connect(self.thread.deleteLater)
 
         self.worker.error.connect(self._handle_ramp_error)
+        self.worker.progress.connect(self._update_ramp_progress)
+        self.worker.report.connect(self._show_ramp_report)
         self.worker.finished.connect(self._ramp_finished)
 
         self.thread.start()
@@ -629,6 +657,10 @@ class IDFFWindow(SiriusMainWindow):
         self.btn_rampdowncorr.setEnabled(not running)
         self.sb_rampnrpts.setEnabled(not running)
         self.sb_rampintvl.setEnabled(not running)
+        self.btn_rampcancel.setEnabled(running)
+        if running:
+            self.lb_rampsts.setText('')
+            self.lb_rampsts.setToolTip('')
 
         button = \
             self.btn_rampupcorr if self._is_rampup else self.btn_rampdowncorr
@@ -656,16 +688,38 @@ class IDFFWindow(SiriusMainWindow):
 
         self._error_popup.show()
 
+    def _cancel_ramp(self):
+        if self._is_rampup is not None:
+            self.worker.cancel()
+
+    def _update_ramp_progress(self, step, nrpts, elapsed):
+        self.lb_rampsts.setText(
+            f'Step {step}/{nrpts}, {elapsed:.1f}s '
+            f'/ {self.sb_rampintvl.value():.1f}s')
+
+    def _show_ramp_report(self, text, details):
+        self.lb_rampsts.setText(text)
+        self.lb_rampsts.setToolTip(details)
+
     def _ramp_finished(self):
         self._set_ramp_running(False)
         self._is_rampup = None  # indicates ramp is not running
 
 
 class RampCorrWorker(QObject):
-    """."""
+    """Ramp correctors currents to feedforward (ramp-up) or zero values.
+
+    The ramp is run by IDFF.rampup_corr_currents and rampdown_corr_currents
+    on a proxy of the IDFF device whose correctors report each set to the
+    worker. The time of each step and of each corrector set is recorded,
+    so correctors that make the ramp miss its time interval can be
+    identified, and the ramp can be stopped between steps.
+    """
 
     finished = Signal()
     error = Signal(str)
+    progress = Signal(int, int, float)
+    report = Signal(str, str)
 
     def __init__(self, idffdev, nrpts, time_interval, is_rampup):
         """."""
@@ -674,6 +728,17 @@ class RampCorrWorker(QObject):
         self._idffdev = idffdev
         self._nrpts = nrpts
         self._time_interval = time_interval
+        self._cancel = _Event()
+        self._tini = 0.0
+        self._tstep = None
+        self._tlast = None
+        self._step_corrs = set()
+        self.step_times = list()
+        self.corr_times = dict()
+
+    def cancel(self):
+        """Stop ramp after current step."""
+        self._cancel.set()
 
     def run(self):
         """."""
@@ -688,15 +753,7 @@ class RampCorrWorker(QObject):
                     if configname != self._idffdev.idffconfig.name:
                         self._idffdev.load_config(configname)
                 # run correctors' ramp
-                if self._is_rampup:
-                    ramp_func = self._idffdev.rampup_corr_currents
-                else:
-                    ramp_func = self._idffdev.rampdown_corr_currents
-                ramp_func(
-                    nrpts=self._nrpts,
-                    time_interval=self._time_interval,
-                    dry_run=False
-                )
+                self._ramp()
             else:
                 self.error.emit("Loop is running. Cannot ramp correctors.")
 
@@ -705,3 +762,118 @@ class RampCorrWorker(QObject):
 
         finally:
             self.finished.emit()
+
+    def _ramp(self):
+        if self._is_rampup:
+            ramp_func = IDFF.rampup_corr_currents
+        else:
+            ramp_func = IDFF.rampdown_corr_currents
+        self._tini = _time.time()
+        self._tstep = None
+        self._tlast = None
+        self._step_corrs = set()
+        self.step_times = list()
+        self.corr_times = dict()
+        try:
+            ramp_func(
+                _RampIDFF(self._idffdev, self),
+                nrpts=self._nrpts,
+                time_interval=self._time_interval,
+                dry_run=False
+            )
+        except _RampCancelled:
+            pass
+        else:
+            self._finish_step()
+        period = self._time_interval / max(self._nrpts - 1, 1)
+        self.report.emit(*self._get_report(_time.time() - self._tini, period))
+
+    def _corr_set_started(self, psname):
+        # steps set each corrector once, so a repeated one starts a step
+        if psname in self._step_corrs:
+            self._finish_step()
+            if self._cancel.is_set():
+                raise _RampCancelled()
+        if self._tstep is None:
+            self._tstep = _time.time()
+        self._step_corrs.add(psname)
+
+    def _corr_set_finished(self, psname, duration):
+        self._tlast = _time.time()
+        self.corr_times.setdefault(psname, list()).append(duration)
+
+    def _finish_step(self):
+        # the step ends with its last set, not when the next one starts
+        if self._tstep is None or self._tlast is None:
+            return
+        self.step_times.append(self._tlast - self._tstep)
+        self._tstep = None
+        self._step_corrs = set()
+        self.progress.emit(
+            len(self.step_times), self._nrpts, self._tlast - self._tini)
+
+    def _get_report(self, elapsed, period):
+        nrsteps = len(self.step_times)
+        if nrsteps == self._nrpts:
+            text = 'Ramp done'
+        else:
+            text = f'Ramp cancelled at step {nrsteps}/{self._nrpts}'
+        text += f' in {elapsed:.2f}s (requested {self._time_interval:.2f}s)'
+        lines = list()
+        if nrsteps:
+            steps = np.array(self.step_times)
+            lines.append(
+                f'Step time: mean {steps.mean():.3f}s, '
+                f'max {steps.max():.3f}s, period {period:.3f}s, '
+                f'{np.sum(steps > period)} steps over period')
+            corrs = sorted(
+                self.corr_times.items(), key=lambda x: -np.mean(x[1]))
+            for psname, times in corrs:
+                lines.append(
+                    f'{psname}: mean {np.mean(times):.3f}s, '
+                    f'max {np.max(times):.3f}s')
+            text += f', slowest: {corrs[0][0]}'
+        return text, '\n'.join(lines)
+
+
+class _RampCancelled(Exception):
+    """Raised to stop an IDFF ramp between steps."""
+
+
+class _RampCorr:
+    """Corrector device proxy that reports its sets to RampCorrWorker."""
+
+    def __init__(self, devcorr, worker):
+        """."""
+        self._devcorr = devcorr
+        self._worker = worker
+
+    def __getattr__(self, name):
+        """."""
+        return getattr(self._devcorr, name)
+
+    def set_current(self, *args, **kwargs):
+        """Set corrector current, recording the time it takes."""
+        psname = self._devcorr.devname
+        self._worker._corr_set_started(psname)
+        tini = _time.time()
+        ret = self._devcorr.set_current(*args, **kwargs)
+        self._worker._corr_set_finished(psname, _time.time() - tini)
+        return ret
+
+
+class _RampIDFF:
+    """IDFF device proxy whose correctors are wrapped by _RampCorr."""
+
+    _CORRDEVS = ('chdevs', 'cvdevs', 'qsdevs', 'lcdevs', 'qndevs', 'ccdevs')
+
+    def __init__(self, idffdev, worker):
+        """."""
+        self._idffdev = idffdev
+        for attr in self._CORRDEVS:
+            setattr(self, attr, [
+                _RampCorr(dev, worker) for dev in getattr(idffdev, attr)])
+
+    def __getattr__(self, name):
+        """."""
+        return getattr(self._idffdev, name)
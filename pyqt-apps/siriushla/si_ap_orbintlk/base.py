@@ -65,11 +65,18 @@ class BaseObject(BaseOrbitIntlk):
 
     # --- pv handler methods ---
 
-    def _create_pvs(self, propty):
+    def _get_pvname(self, propty):
         if 'SlowSum' in propty:
-            pvname = SiriusPVName('SI-Glob:AP-SOFB').substitute(propty=propty)
-        else:
-            pvname = self.hlprefix.substitute(propty=propty)
+            return SiriusPVName('SI-Glob:AP-SOFB').substitute(propty=propty)
+        return self.hlprefix.substitute(propty=propty)
+
+    @staticmethod
+    def _is_symbol_propty(propty):
+        return propty in ['Intlk-Mon', 'IntlkLtc-Mon'] or \
+            'Lower' in propty or 'Upper' in propty
+
+    def _create_pvs(self, propty):
+        pvname = self._get_pvname(propty)
         if pvname in self._pvs:
             return
         auto_monitor = True
@@ -78,10 +85,7 @@ class BaseObject(BaseOrbitIntlk):
         self._pvs[pvname] = new_pv
 
     def _get_values(self, propty):
-        if 'SlowSum' in propty:
-            pvname = SiriusPVName('SI-Glob:AP-SOFB').substitute(propty=propty)
-        else:
-            pvname = self.hlprefix.substitute(propty=propty)
+        pvname = self._get_pvname(propty)
         self._pvs[pvname].wait_for_connection()
 
         try:
@@ -90,8 +94,7 @@ class BaseObject(BaseOrbitIntlk):
             values = None
         if values is None:
             values = _np.zeros(len(self.BPM_NAMES), dtype=float)
-        elif propty in ['Intlk-Mon', 'IntlkLtc-Mon'] or \
-                'Lower' in propty or 'Upper' in propty:
+        elif self._is_symbol_propty(propty):
             values = 1 * _np.logical_not(values)
         return values
 
@@ -1,6 +1,8 @@
 """Graph Widgets."""
 
 import time as _time
+from threading import Lock as _Lock
+
 import numpy as _np
 
 from qtpy.QtCore import Qt, Slot, Signal, QSize, QThread
@@ -434,7 +436,10 @@ class Graph(BaseObject, SiriusWaveformPlot):
         self._pen_max, self._brush_max = self._set_symbols(new)
 
     def _set_y_data(self, new):
-        if new is None or any([n is None for n in new]):
+        if new is None:
+            return _np.array([0, ])
+        if not isinstance(new, _np.ndarray) and \
+                any([n is None for n in new]):
             return _np.array([0, ])
         return _np.array(new)
 
@@ -564,6 +569,16 @@ class _BaseGraphWidget(BaseObject, QWidget):
         setattr(self.graph, 'symbols_'+curve, symb)
         setattr(self.graph, 'y_data_'+curve, data)
 
+    def showEvent(self, event):
+        """Resume graph updates when widget is shown."""
+        self._thread.set_visible(True)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Suspend graph updates while widget is hidden."""
+        self._thread.set_visible(False)
+        super().hideEvent(event)
+
     def closeEvent(self, event):
         """Finish thread on close."""
         self._thread.exit_task()
@@ -581,8 +596,94 @@ class _BaseGraphWidget(BaseObject, QWidget):
             pass
 
 
-class _UpdateGraphThread(BaseObject, QThread):
-    """Update Graph Thread."""
+class _GraphDataHub(BaseObject):
+    """Shared monitor-based data layer for all interlock graphs.
+
+    Each property PV is created once, with a callback that copies its
+    value into a preallocated array and increments a version counter.
+    Limit readbacks rarely change, so their arrays are kept cached and
+    consumers only recompute when a version changes.
+    """
+
+    _instances = dict()
+    _instances_lock = _Lock()
+
+    def __init__(self, prefix=_vaca_prefix):
+        super().__init__(prefix)
+        self._lock = _Lock()
+        self._data = dict()
+        self._versions = dict()
+        self._pvname2propty = dict()
+
+    @classmethod
+    def get_instance(cls, prefix=_vaca_prefix):
+        """Return data hub shared by all graphs with the same prefix."""
+        with cls._instances_lock:
+            if prefix not in cls._instances:
+                cls._instances[prefix] = cls(prefix)
+            return cls._instances[prefix]
+
+    def subscribe(self, propty):
+        """Create monitored PV for propty, if not created yet."""
+        with self._lock:
+            if propty in self._data:
+                return
+            dtype = int if self._is_symbol_propty(propty) else float
+            self._data[propty] = _np.zeros(len(self.BPM_NAMES), dtype=dtype)
+            self._versions[propty] = 0
+            pvname = self._get_pvname(propty)
+            self._pvname2propty[pvname] = propty
+        self._create_pvs(propty)
+        self._pvs[pvname].add_callback(self._callback_value)
+        # monitor may already have a value if PV was created elsewhere
+        value = self._pvs[pvname].value
+        if value is not None:
+            self._callback_value(pvname, value)
+
+    def version(self, propty):
+        """Return number of value changes of propty."""
+        return self._versions.get(propty, -1)
+
+    def copy_value(self, propty, out):
+        """Copy current value of propty to out array."""
+        with self._lock:
+            value = self._data[propty]
+            if value.size == out.size:
+                out[:] = value
+            else:
+                out[:] = 0
+                size = min(value.size, out.size)
+                out[:size] = value[:size]
+        return out
+
+    def _callback_value(self, pvname, value, **kws):
+        if value is None:
+            return
+        propty = self._pvname2propty.get(pvname)
+        if propty is None:
+            return
+        value = _np.asarray(value)
+        if self._is_symbol_propty(propty):
+            value = 1 * _np.logical_not(value)
+        with self._lock:
+            data = self._data[propty]
+            if data.size == value.size:
+                if _np.array_equal(data, value):
+                    return
+                data[:] = value
+            else:
+                self._data[propty] = value.astype(data.dtype)
+            self._versions[propty] += 1
+
+
+class _UpdateGraphThread(QThread):
+    """Update Graph Thread.
+
+    Data comes from the shared _GraphDataHub. A curve is only
+    recomputed and emitted when one of its properties, or the graph
+    configuration, changed since last emission, and only while the
+    graph is visible.
+    """
 
     UPDATE_FREQ = 2  # [Hz]
     dataChanged = Signal(list)
@@ -591,9 +692,9 @@ class _UpdateGraphThread(BaseObject, QThread):
                  min_data, min_symb, max_data, max_symb,
                  propintlktype, propcomptype, reforb,
                  prefix='', parent=None):
-        BaseObject.__init__(self, prefix='')
         QThread.__init__(self, parent)
 
+        self._hub = _GraphDataHub.get_instance(prefix)
         self.intlktype = intlktype
         self.metric = intlktype[:-1].lower()
         self.meas_data = meas_data
@@ -605,24 +706,45 @@ class _UpdateGraphThread(BaseObject, QThread):
         self._propintlktype = propintlktype
         self._propcomptype = propcomptype
         self._reforb = reforb
-        self._refmetric = _np.array(self.calc_intlk_metric(
-            self._reforb, metric=self.metric))
+        self._refmetric = _np.array(self._hub.calc_intlk_metric(
+            self._reforb, metric=self.metric), dtype=float)
+
+        # preallocated buffers, two per curve so that the emitted array
+        # is not overwritten before the GUI thread consumes it.
+        nrbpms = len(self._hub.BPM_NAMES)
+        self._buffers = {
+            curve: [_np.zeros(nrbpms, dtype=float) for _ in range(2)]
+            for curve in ['meas', 'min', 'max']}
+        self._symb_buffers = {
+            curve: [_np.zeros(nrbpms, dtype=int) for _ in range(2)]
+            for curve in ['meas', 'min', 'max']}
+        self._buffer_idx = {curve: 0 for curve in ['meas', 'min', 'max']}
+        self._last_state = dict()
+        self._config_version = 0
+        self._visible = False
 
         self._quit_task = False
 
     def set_propintlktype(self, new):
         """Update property intlktype."""
         self._propintlktype = new
+        self._config_version += 1
 
     def set_propcomptype(self, new):
         """Update property comptype."""
         self._propcomptype = new
+        self._config_version += 1
 
     def set_reforb(self, new):
         """Update reference orbit."""
         self._reforb = new
-        self._refmetric = _np.array(self.calc_intlk_metric(
-            self._reforb, metric=self.metric))
+        self._refmetric = _np.array(self._hub.calc_intlk_metric(
+            self._reforb, metric=self.metric), dtype=float)
+        self._config_version += 1
+
+    def set_visible(self, visible):
+        """Enable or disable computation, according to graph visibility."""
+        self._visible = bool(visible)
 
     def exit_task(self):
         """Set flag to quit thread."""
@@ -632,7 +754,8 @@ class _UpdateGraphThread(BaseObject, QThread):
         """Run task."""
         while not self._quit_task:
             _t0 = _time.time()
-            self._update_data()
+            if self._visible:
+                self._update_data()
             _dt = _time.time() - _t0
 
             sleep = 1/self.UPDATE_FREQ - _dt
@@ -641,79 +764,67 @@ class _UpdateGraphThread(BaseObject, QThread):
 
     def _update_data(self):
         if self.meas_data:
-            # symb meas
+            symb = None
             if self.meas_symb:
-                symb_propty = self.meas_symb[
+                symb = self.meas_symb[
                     self._propintlktype][self._propcomptype]
-                if isinstance(symb_propty, dict):
-                    for var in symb_propty['var']:
-                        self._create_pvs(var)
-                    vals = [_np.array(self._get_values(var))
-                            for var in symb_propty['var']]
-                    symb_values = list(symb_propty['op'](*vals))
-                else:
-                    self._create_pvs(symb_propty)
-                    symb_values = self._get_values(symb_propty)
-                symbols_meas = symb_values
-            else:
-                symbols_meas = None
-
-            # data meas
-            self._create_pvs(self.meas_data)
-            vals = _np.array(self._get_values(self.meas_data), dtype=float)
-            if self.metric in ['pos', 'ang']:
-                vals -= self._refmetric
-                vals *= self.CONV_NM2M
-            else:
-                # sum case
-                vals *= self.monitsum2intlksum_factor
-            y_data_meas = list(vals)
-
-            self.dataChanged.emit(['meas', symbols_meas, y_data_meas])
+            self._update_curve('meas', self.meas_data, symb)
 
         if self.min_data:
-            # symb min
-            self._create_pvs(self.min_data)
+            symb = None
             if self.min_symb and self._propintlktype in self.min_symb:
-                symb_propty = self.min_symb[self._propintlktype]
-                if symb_propty:
-                    self._create_pvs(symb_propty)
-                    symbols_min = self._get_values(symb_propty)
-                else:
-                    symbols_min = None
-            else:
-                symbols_min = None
-
-            # data min
-            vals = _np.array(self._get_values(self.min_data), dtype=float)
-            if self.metric in ['pos', 'ang']:
-                vals -= self._refmetric
-                vals *= self.CONV_NM2M
-            y_data_min = list(vals)
-
-            self.dataChanged.emit(['min', symbols_min, y_data_min])
+                symb = self.min_symb[self._propintlktype] or None
+            self._update_curve('min', self.min_data, symb)
 
         if self.max_data:
-            # symb max
-            self._create_pvs(self.max_data)
+            symb = None
             if self.max_symb and self._propintlktype in self.max_symb:
-                symb_propty = self.max_symb[self._propintlktype]
-                if symb_propty:
-                    self._create_pvs(symb_propty)
-                    symbols_max = self._get_values(symb_propty)
-                else:
-                    symbols_max = None
-            else:
-                symbols_max = None
-
-            # data max
-            vals = _np.array(self._get_values(self.max_data), dtype=float)
-            if self.metric in ['pos', 'ang']:
-                vals -= self._refmetric
-                vals *= self.CONV_NM2M
-            y_data_max = list(vals)
-
-            self.dataChanged.emit(['max', symbols_max, y_data_max])
+                symb = self.max_symb[self._propintlktype] or None
+            self._update_curve('max', self.max_data, symb)
+
+    def _update_curve(self, curve, data_propty, symb_propty):
+        if isinstance(symb_propty, dict):
+            symb_vars = list(symb_propty['var'])
+        elif symb_propty:
+            symb_vars = [symb_propty, ]
+        else:
+            symb_vars = []
+
+        propties = [data_propty, ] + symb_vars
+        for propty in propties:
+            self._hub.subscribe(propty)
+
+        # only recompute if something changed since last emission
+        state = tuple(self._hub.version(p) for p in propties) + \
+            (self._config_version, self._hub.monitsum2intlksum_factor)
+        if self._last_state.get(curve) == state:
+            return
+        self._last_state[curve] = state
+
+        idx = self._buffer_idx[curve]
+        self._buffer_idx[curve] = 1 - idx
+
+        # symbols
+        if not symb_vars:
+            symbols = None
+        elif isinstance(symb_propty, dict):
+            vals = [self._hub.copy_value(var, _np.zeros_like(
+                self._symb_buffers[curve][idx])) for var in symb_vars]
+            symbols = _np.asarray(symb_propty['op'](*vals))
+        else:
+            symbols = self._hub.copy_value(
+                symb_propty, self._symb_buffers[curve][idx])
+
+        # data
+        vals = self._hub.copy_value(data_propty, self._buffers[curve][idx])
+        if self.metric in ['pos', 'ang']:
+            vals -= self._refmetric
+            vals *= self._hub.CONV_NM2M
+        elif curve == 'meas':
+            # sum case
+            vals *= self._hub.monitsum2intlksum_factor
+
+        self.dataChanged.emit([curve, symbols, vals])
 
 
 class MinSumGraphWidget(_BaseGraphWidget):
@@ -5,9 +5,12 @@ import logging as _log
 from threading import Thread
 import pathlib as _pathlib
 
-from qtpy.QtCore import Qt
+import numpy as _np
+
+from qtpy.QtCore import Qt, Signal
 from qtpy.QtWidgets import QWidget, QPushButton, QGridLayout, QSpinBox, \
-    QLabel, QGroupBox, QDoubleSpinBox, QComboBox, QFileDialog, QMessageBox
+    QLabel, QGroupBox, QDoubleSpinBox, QComboBox, QFileDialog, \
+    QMessageBox, QCheckBox, QProgressBar
 
 import qtawesome as qta
 
@@ -19,6 +22,8 @@ from siriushla.widgets import SiriusMainWindow, SiriusLogDisplay, \
 from siriushla.widgets.windows import create_window_from_widget
 from siriushla.as_ap_configdb import LoadConfigDialog, SaveConfigDialog
 
+from .worker import EqualizeWorker
+
 
 class BPMsEqualizeSwitching(SiriusMainWindow):
     """."""
@@ -30,6 +35,17 @@ class BPMsEqualizeSwitching(SiriusMainWindow):
     DEFAULT_DIR = _pathlib.Path.home().as_posix()
     DEFAULT_DIR += _os.path.sep + _os.path.join(
         'shared', 'screens-iocs', 'data_by_day')
+    # button name: (EqualizeBPMs plot method, window title)
+    PLOTS = {
+        'dorb': ('plot_orbit_distortion', 'Orbit Variation'),
+        'gains': ('plot_gains', 'Gains'),
+        'mean': ('plot_antennas_mean', 'Antennas Mean'),
+        'idcs': ('plot_semicycle_indices', 'Cycle Indices'),
+        'check': ('plot_antennas_for_check', 'Check Equalization'),
+    }
+
+    progressChanged = Signal(int, int)
+    figureReady = Signal(str, object)
 
     def __init__(self, parent=None):
         """."""
@@ -46,8 +62,11 @@ class BPMsEqualizeSwitching(SiriusMainWindow):
         self.bpms_eq = EqualizeBPMs(logger=root)
         self._last_dir = self.DEFAULT_DIR
         self._thread = Thread()
+        self._worker = EqualizeWorker()
         self._orbits = None
         self.setupui()
+        self.progressChanged.connect(self._update_progress)
+        self.figureReady.connect(self._show_figure)
         self.setObjectName('SIApp')
         color = util.get_appropriate_color('SI')
         icon = qta.icon(
@@ -161,10 +180,18 @@ class BPMsEqualizeSwitching(SiriusMainWindow):
         pusb_proc.clicked.connect(self._start_activity)
         pusb_proc.setObjectName('proc')
 
+        self.cb_outproc = QCheckBox(
+            'Process and plot in separate process', wid)
+        self.cb_outproc.setToolTip(
+            'Run processing and figures creation in a worker process,\n'
+            'keeping this window responsive.')
+        self.cb_outproc.setChecked(True)
+
         lay.addWidget(QLabel('Process Method:', wid), 0, 0)
         lay.addWidget(self.cb_procmeth, 0, 1)
         lay.addWidget(pusb_proc, 0, 3)
         lay.addWidget(self.lb_procmeth, 1, 0, 1, 4)
+        lay.addWidget(self.cb_outproc, 2, 0, 1, 4)
         lay.setColumnStretch(2, 2)
         lay.setColumnStretch(4, 2)
         return wid
@@ -199,7 +226,16 @@ class BPMsEqualizeSwitching(SiriusMainWindow):
 
         self.log_label = SiriusLogDisplay(wid, level=_log.INFO)
         self.log_label.logFormat = '%(message)s'
-        lay.addWidget(self.log_label, 0, 0)
+
+        self.pb_progress = QProgressBar(wid)
+        self.pb_progress.setValue(0)
+        pusb_cancel = QPushButton(qta.icon('mdi.stop'), 'Cancel', wid)
+        pusb_cancel.setToolTip('Cancel processing in separate process')
+        pusb_cancel.clicked.connect(self._worker.cancel)
+
+        lay.addWidget(self.log_label, 0, 0, 1, 2)
+        lay.addWidget(self.pb_progress, 1, 0)
+        lay.addWidget(pusb_cancel, 1, 1)
         return wid
 
     def get_application_widget(self, parent):
@@ -330,12 +366,38 @@ class BPMsEqualizeSwitching(SiriusMainWindow):
         _log.info('Processing data')
         self.bpms_eq.proc_method = int(self.cb_procmeth.currentIndex())
         try:
-            self.bpms_eq.process_data()
+            if self.cb_outproc.isChecked():
+                self._process_data_in_worker()
+            else:
+                self.bpms_eq.process_data()
         except Exception as err:
             _log.error('Problem processing data.')
             _log.error(str(err))
         _log.info('Processing Done!')
 
+    def _process_data_in_worker(self):
+        data = self.bpms_eq.data
+        if 'antennas' not in data:
+            _log.error('There is no data to process. Acquire first.')
+            return
+        self.progressChanged.emit(0, len(self.bpms_eq.bpm_names))
+        ret = self._worker.process_data(
+            data, self.bpms_eq.bpm_names, self.bpms_eq.proc_method,
+            progress=self.progressChanged.emit)
+        if ret is None:
+            return
+        times = ret.pop('proc_times')
+        data.update(ret)
+        _log.info('Processing time per BPM: mean {0:.1f} ms, slowest:'.format(
+            1000*_np.mean(times)))
+        for idx in _np.argsort(times)[::-1][:3]:
+            _log.info('    {0:s}: {1:.1f} ms'.format(
+                self.bpms_eq.bpm_names[idx], 1000*times[idx]))
+
+    def _update_progress(self, value, maximum):
+        self.pb_progress.setMaximum(maximum)
+        self.pb_progress.setValue(value)
+
     def _apply_new(self):
         gains = self.bpms_eq.data.get('gains_new')
         if gains is None:
@@ -388,22 +450,30 @@ class BPMsEqualizeSwitching(SiriusMainWindow):
 
     def _plot(self):
         name = self.sender().objectName()
-        fig = None
-        if name.startswith('dorb'):
-            fig, axs = self.bpms_eq.plot_orbit_distortion()
-            winname = 'Orbit Variation'
-        elif name.startswith('gains'):
-            fig, axs = self.bpms_eq.plot_gains()
-            winname = 'Gains'
-        elif name.startswith('mean'):
-            fig, axs = self.bpms_eq.plot_antennas_mean()
-            winname = 'Antennas Mean'
-        elif name.startswith('idcs'):
-            fig, axs = self.bpms_eq.plot_semicycle_indices()
-            winname = 'Cycle Indices'
-        elif name.startswith('check'):
-            fig, axs = self.bpms_eq.plot_antennas_for_check()
-            winname = 'Check Equalization'
+        method, winname = self.PLOTS[name]
+        if not self.cb_outproc.isChecked():
+            fig, _ = getattr(self.bpms_eq, method)()
+            self._show_figure(winname, fig)
+            return
+        if self._thread.is_alive():
+            _log.error('There is another measurement happening.')
+            return
+        self._thread = Thread(
+            target=self._make_figure_in_worker, args=(method, winname),
+            daemon=True)
+        self._thread.start()
+
+    def _make_figure_in_worker(self, method, winname):
+        try:
+            fig = self._worker.make_figure(
+                self.bpms_eq.data, self.bpms_eq.bpm_names, method)
+        except Exception as err:
+            _log.error('Problem creating figure.')
+            _log.error(str(err))
+            return
+        self.figureReady.emit(winname, fig)
+
+    def _show_figure(self, winname, fig):
         if fig is None:
             _log.error('Error with plot.')
             return
@@ -456,3 +526,8 @@ class BPMsEqualizeSwitching(SiriusMainWindow):
             return
         _save(confname)
         _log.info('Configuration saved.')
+
+    def closeEvent(self, event):
+        """Stop analysis worker process."""
+        self._worker.shutdown()
+        super().closeEvent(event)
@@ -0,0 +1,232 @@
+"""Out of process analysis of BPMs switching equalization."""
+
+import time as _time
+import pickle as _pickle
+import logging as _logging
+import multiprocessing as _mp
+from multiprocessing import shared_memory as _shared_memory
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool as \
+    _BrokenProcessPool
+from queue import Empty as _Empty
+
+import numpy as _np
+
+from siriuspy.devices import EqualizeBPMs as _EqualizeBPMs
+
+# large arrays, passed to the worker process in shared memory
+SHARED_KEYS = ('antennas', 'antennas_for_check')
+
+# axis of the BPMs in per BPM arrays used or produced by the processing
+_BPM_AXIS = {
+    'antennas': 1, 'gains_init': 1, 'gains_acq': 1, 'gains_new': 1,
+    'antennas_mean': 1, 'idcs_direct': 0, 'idcs_inverse': 0,
+    'posx_gain': 0, 'posy_gain': 0, 'posx_offset': 0, 'posy_offset': 0,
+    'orbx_init': 0, 'orby_init': 0, 'orbx_new': 0, 'orby_new': 0,
+    'dorbx': 0, 'dorby': 0}
+_PROC_KEYS = (
+    'antennas_mean', 'idcs_direct', 'idcs_inverse', 'gains_new',
+    'orbx_init', 'orby_init', 'orbx_new', 'orby_new', 'dorbx', 'dorby')
+
+# set in the worker process by _init_worker
+_QUEUE = None
+_CANCEL = None
+
+
+class _OfflineEqualizeBPMs(_EqualizeBPMs):
+    """EqualizeBPMs processing and plots, without connecting to BPMs."""
+
+    def __init__(self, bpmnames, data, proc_method=None, prefix='',
+                 verbose=True):
+        """."""
+        # do not call base class constructor, which creates PVs
+        self._logger = None
+        self._proc_method = proc_method
+        self.bpms = list(bpmnames)
+        self.data = data
+        self.prefix = prefix
+        self.verbose = verbose
+
+    def _log(self, message, *args, level='INFO', **kwrgs):
+        if message.startswith('WARN:'):
+            level, message = _logging.WARNING, message[5:]
+        elif message.startswith('ERR:'):
+            level, message = _logging.ERROR, self.prefix + message[4:]
+        else:
+            level = _logging.INFO
+        if self.verbose or level == _logging.ERROR:
+            _QUEUE.put(('log', level, message))
+
+
+def _init_worker(queue, cancel):
+    global _QUEUE, _CANCEL
+    _QUEUE, _CANCEL = queue, cancel
+    import matplotlib.pyplot as _mplt
+    _mplt.switch_backend('Agg')
+
+
+def _run_task(func, shared, data, *args):
+    """Run func with shared arrays in data (worker process)."""
+    shms, arrays = list(), dict()
+    try:
+        for key, (name, shape, dtype) in shared.items():
+            shm = _shared_memory.SharedMemory(name=name)
+            shms.append(shm)
+            arrays[key] = _np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        return func(dict(data, **arrays), *args)
+    finally:
+        arrays.clear()
+        _QUEUE.put(('done', ))
+        for shm in shms:
+            try:
+                shm.close()
+            except BufferError:
+                # views are still referenced by an exception traceback
+                pass
+
+
+def _process_data(data, bpmnames, proc_method):
+    """Process data of each BPM, reporting progress."""
+    nbpm = len(bpmnames)
+    parts = {key: list() for key in _PROC_KEYS}
+    times = _np.zeros(nbpm)
+    for idx, bpm in enumerate(bpmnames):
+        if _CANCEL.is_set():
+            _QUEUE.put(('log', _logging.WARNING, 'Processing canceled.'))
+            return None
+        tini = _time.time()
+        sub = {
+            key: _np.take(val, [idx], axis=_BPM_AXIS[key])
+            if key in _BPM_AXIS else val for key, val in data.items()}
+        proc = _OfflineEqualizeBPMs(
+            [bpm], sub, proc_method, prefix=bpm+': ', verbose=not idx)
+        mean = proc.calc_switching_levels(**sub)
+        if mean is None:
+            return None
+        proc.calc_gains(mean)
+        proc.estimate_orbit_variation()
+        for key in _PROC_KEYS:
+            parts[key].append(proc.data[key])
+        times[idx] = _time.time() - tini
+        _QUEUE.put(('progress', idx+1, nbpm))
+
+    ret = {
+        key: _np.concatenate(val, axis=_BPM_AXIS[key])
+        for key, val in parts.items()}
+    ret['proc_method'] = proc_method
+    ret['proc_times'] = times
+    return ret
+
+
+def _make_figure(data, bpmnames, method):
+    """Return pickled figure created by EqualizeBPMs plot method."""
+    import matplotlib.pyplot as _mplt
+    proc = _OfflineEqualizeBPMs(bpmnames, data)
+    fig, _ = getattr(proc, method)()
+    if fig is None:
+        return None
+    ret = _pickle.dumps(fig)
+    _mplt.close(fig)
+    return ret
+
+
+class EqualizeWorker:
+    """Run EqualizeBPMs analysis in a separate process.
+
+    The heavy NumPy processing and the creation of figures run in a
+    worker process, so they do not hold the GUI process GIL. Antennas
+    data are passed in shared memory and log messages and progress are
+    streamed back while the task runs. The worker process is started on
+    first use and reused by the following tasks.
+
+    Methods block until the task is finished, so they must be called
+    from a thread other than the GUI thread.
+    """
+
+    def __init__(self):
+        """."""
+        self._ctx = _mp.get_context('spawn')
+        self._queue = self._ctx.Queue()
+        self._cancel = self._ctx.Event()
+        self._executor = None
+
+    def process_data(self, data, bpmnames, proc_method, progress=None):
+        """Process acquired data.
+
+        Returns dict with processed data, including the processing time
+        of each BPM in 'proc_times', or None if processing failed or was
+        canceled.
+        """
+        return self._run(
+            _process_data, data, bpmnames, proc_method, progress=progress)
+
+    def make_figure(self, data, bpmnames, method):
+        """Return figure created by EqualizeBPMs plot method or None."""
+        fig = self._run(_make_figure, data, bpmnames, method)
+        return None if fig is None else _pickle.loads(fig)
+
+    def cancel(self):
+        """Cancel running processing."""
+        self._cancel.set()
+
+    def shutdown(self):
+        """Stop worker process."""
+        self._cancel.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self, func, data, *args, progress=None):
+        if self._executor is None:
+            self._executor = _ProcessPoolExecutor(
+                max_workers=1, mp_context=self._ctx,
+                initializer=_init_worker, initargs=(self._queue, self._cancel))
+        self._cancel.clear()
+        # discard messages left by a previous task that did not finish
+        while True:
+            try:
+                self._queue.get_nowait()
+            except _Empty:
+                break
+
+        shms, shared = list(), dict()
+        data = dict(data)
+        try:
+            for key in SHARED_KEYS:
+                arr = data.pop(key, None)
+                if arr is None:
+                    continue
+                arr = _np.ascontiguousarray(arr)
+                shm = _shared_memory.SharedMemory(
+                    create=True, size=max(arr.nbytes, 1))
+                shms.append(shm)
+                buf = _np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+                buf[:] = arr
+                del buf
+                shared[key] = (shm.name, arr.shape, arr.dtype.str)
+
+            fut = self._executor.submit(_run_task, func, shared, data, *args)
+            while True:
+                try:
+                    msg = self._queue.get(timeout=0.1)
+                except _Empty:
+                    # worker process died before finishing the task
+                    if fut.done() and fut.exception() is not None:
+                        break
+                    continue
+                if msg[0] == 'done':
+                    break
+                elif msg[0] == 'log':
+                    _logging.getLogger().log(msg[1], msg[2])
+                elif msg[0] == 'progress' and progress is not None:
+                    progress(*msg[1:])
+            return fut.result()
+        except _BrokenProcessPool:
+            # worker process died, start a new one in the next task
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            raise
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
@@ -31,3 +31,4 @@ from .waveformtable import SiriusWaveformTable
 from .selection_matrix import SelectionMatrixWidget
 from .relative_widget import RelativeWidget
 from .scale import BaseScale, SiriusScaleIndicator
+from .smoothing_buffer import SmoothingBuffer
@@ -8,6 +8,8 @@ import pyqtgraph as pg
 from pydm.widgets.channel import PyDMChannel
 from qtpy.QtCore import QTimer, QSize
 
+from .windows import register_plot_widget
+
 logging.basicConfig(level=logging.DEBUG)
 
 
@@ -222,6 +224,11 @@ class BaseBarGraphWidget(pg.PlotWidget):
         set_brush - set brush color.
     """
 
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        register_plot_widget(self)
+
     # Public Interface
     def set_scale(self, scale):
         """Set scale."""
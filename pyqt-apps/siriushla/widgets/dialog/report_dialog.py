@@ -7,10 +7,11 @@ from qtpy.QtWidgets import QLabel, QPushButton, QListWidget, QVBoxLayout, \
 class ReportDialog(QDialog):
     """Show a list of items."""
 
-    def __init__(self, items, parent=None):
+    def __init__(self, items, parent=None, header='Failed PVs'):
         """Constructor."""
         super().__init__(parent)
         self._items = items
+        self._header = header
         self._setup_ui()
         self.setWindowTitle('Report')
 
@@ -19,7 +20,7 @@ class ReportDialog(QDialog):
         self.setLayout(self.layout)
 
         if self._items:
-            self.header = QLabel('Failed PVs', self)
+            self.header = QLabel(self._header, self)
             self.layout.addWidget(self.header)
             self.items_list = QListWidget(self)
             self.items_list.addItems(self._items)
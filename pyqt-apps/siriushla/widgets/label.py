@@ -2,7 +2,7 @@
 
 from pyqtgraph import functions as func
 from qtpy.QtWidgets import QLabel, QApplication
-from qtpy.QtCore import Qt, Property, Q_ENUMS
+from qtpy.QtCore import Qt, Property, Q_ENUMS, QObject, QTimer
 from pydm.utilities import units
 from pydm.widgets.base import PyDMPrimitiveWidget
 from pydm.widgets.display_format import DisplayFormat, parse_value_for_display
@@ -31,9 +31,16 @@ class SiriusLabel(QLabel, TextFormatter, PyDMWidget, DisplayFormat):
     DisplayFormat.Time = 6
     DisplayFormat.BSMPUDCVersion = 7
 
+    # format values and set texts in a shared refresh tick, skipping
+    # hidden labels, instead of on every channel update
+    COALESCE_UPDATES = True
+    _update_counters = dict.fromkeys(
+        ('received', 'coalesced', 'hidden', 'unchanged', 'performed'), 0)
+
     def __init__(self, parent=None, init_channel=None, keep_unit=False, **kws):
         """Init."""
         QLabel.__init__(self, parent, **kws)
+        self._needs_refresh = False
         PyDMWidget.__init__(self, init_channel=init_channel)
         self.app = QApplication.instance()
         self.setTextFormat(Qt.PlainText)
@@ -93,32 +100,97 @@ class SiriusLabel(QLabel, TextFormatter, PyDMWidget, DisplayFormat):
                 self.format_string += " {}"+"{}".format(unt_si)
         return self.format_string
 
+    @classmethod
+    def get_update_counters(cls):
+        """Return counters of text updates of all labels, for profiling.
+
+        Returns
+        -------
+        counters : dict
+            'received': values received from channels;
+            'coalesced': values replaced by a newer one before formatting;
+            'hidden': refreshes postponed because label was not visible;
+            'unchanged': refreshes that resulted in the same text;
+            'performed': refreshes that changed the label text.
+        """
+        return dict(SiriusLabel._update_counters)
+
+    @classmethod
+    def reset_update_counters(cls):
+        """Reset text update counters."""
+        for key in SiriusLabel._update_counters:
+            SiriusLabel._update_counters[key] = 0
+
     def value_changed(self, new_value):
         """
         Callback invoked when the Channel value is changed.
-        Sets the value of new_value accordingly at the Label.
+        Schedules the Label text update to the next refresh tick.
 
         Parameters
         ----------
         new_value : str, int, float, bool or np.ndarray
             The new value from the channel. The type depends on the channel.
         """
-        super(SiriusLabel, self).value_changed(new_value)
+        # format string is updated only when text is refreshed
+        PyDMWidget.value_changed(self, new_value)
+        counters = SiriusLabel._update_counters
+        counters['received'] += 1
+        if self._needs_refresh:
+            counters['coalesced'] += 1
+            return
+        self._needs_refresh = True
+        if self.COALESCE_UPDATES and not is_qt_designer():
+            _LabelRefresher.get_instance().schedule(self)
+        else:
+            self._refresh_text()
+
+    def showEvent(self, event):
+        """Refresh text postponed while label was hidden."""
+        super().showEvent(event)
+        if self._needs_refresh:
+            _LabelRefresher.get_instance().schedule(self)
+
+    def _refresh_text(self):
+        if not self._needs_refresh:
+            return
+        counters = SiriusLabel._update_counters
+        if self.COALESCE_UPDATES and not self.isVisible():
+            # refreshed on showEvent
+            counters['hidden'] += 1
+            return
+        self._needs_refresh = False
+        self.update_format_string()
+        text = self.format_value(self.value)
+        if text == self.text():
+            counters['unchanged'] += 1
+            return
+        counters['performed'] += 1
+        self.setText(text)
+
+    def format_value(self, new_value):
+        """
+        Return text to display for a value.
+
+        Parameters
+        ----------
+        new_value : str, int, float, bool or np.ndarray
+            The value from the channel. The type depends on the channel.
+
+        Returns
+        -------
+        text : str
+        """
         # If it is a DiaplayFormat.Time, parse with siriuspy.clientarch.Time
         if self._display_format_type == self.DisplayFormat.Time:
-            time = _Time(int(new_value)).time().isoformat() \
+            return _Time(int(new_value)).time().isoformat() \
                 if new_value is not None else ''
-            self.setText(time)
-            return
 
         # If it is a version string, replace multiple whitespaces with a
         # single one
         if self._display_format_type == self.DisplayFormat.BSMPUDCVersion:
             version = new_value[:16] + " " + new_value[16:] \
                 if new_value is not None else ''
-            version = " ".join(version.split())
-            self.setText(version)
-            return
+            return " ".join(version.split())
 
         new_value = parse_value_for_display(
             value=new_value, precision=self.precision,
@@ -129,29 +201,63 @@ class SiriusLabel(QLabel, TextFormatter, PyDMWidget, DisplayFormat):
         if isinstance(new_value, str):
             if self._show_units and self._unit != "":
                 new_value = "{} {}".format(new_value, self._unit)
-            self.setText(new_value)
-            return
+            return new_value
         # If the value is an enum, display the appropriate enum string for
         # the value.
         if self.enum_strings and isinstance(new_value, (int, float)):
             try:
-                self.setText(self.enum_strings[int(new_value)])
+                return self.enum_strings[int(new_value)]
             except IndexError:
-                self.setText(f'Index Overflow [{new_value}]')
-            return
+                return f'Index Overflow [{new_value}]'
         # If the value is a number (float or int), display it using a
         # format string if necessary.
         if isinstance(new_value, (int, float)):
             if self._show_units and self._unit != '' and not self._keep_unit:
                 new_value *= self._conv
                 sc, prf = func.siScale(new_value)
-                self.setText(self.format_string.format(sc*new_value, prf))
-            else:
-                self.setText(self.format_string.format(new_value))
-            return
+                return self.format_string.format(sc*new_value, prf)
+            return self.format_string.format(new_value)
         # If you made it this far, just turn whatever the heck the value
         # is into a string and display it.
-        self.setText(str(new_value))
+        return str(new_value)
+
+
+class _LabelRefresher(QObject):
+    """Refresh texts of SiriusLabels in a tick shared by all windows."""
+
+    INTERVAL = 100  # [ms]
+    _instance = None
+
+    def __init__(self):
+        super().__init__()
+        self._pending = dict()
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.INTERVAL)
+        self._timer.timeout.connect(self._refresh)
+
+    @classmethod
+    def get_instance(cls):
+        """Return refresher instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def schedule(self, label):
+        """Refresh label text in next tick."""
+        self._pending[label] = None
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _refresh(self):
+        pending, self._pending = self._pending, dict()
+        for label in pending:
+            try:
+                label._refresh_text()
+            except RuntimeError:
+                # label was deleted
+                continue
+        if not self._pending:
+            self._timer.stop()
 
 
 class CALabel(QLabel, PyDMPrimitiveWidget):
@@ -1,7 +1,16 @@
 """Log label."""
 
-from qtpy.QtWidgets import QListWidget, QListWidgetItem
-from qtpy.QtCore import Property, Q_ENUMS
+import os as _os
+import json as _json
+import re as _re
+import fcntl as _fcntl
+import logging as _log
+from collections import deque as _deque
+from functools import partial as _partial
+
+from qtpy.QtWidgets import QListView
+from qtpy.QtCore import Property, Q_ENUMS, Qt, QAbstractListModel, \
+    QModelIndex
 from qtpy.QtGui import QColor
 
 from pydm.data_plugins import plugin_for_address
@@ -11,9 +20,106 @@ from pydm.widgets.display_format import DisplayFormat, parse_value_for_display
 from siriuspy.clientarch import Time as _Time
 
 
-class PyDMLogLabel(QListWidget, TextFormatter, PyDMWidget, DisplayFormat):
+LOGDIR = _os.path.join(
+    _os.path.expanduser('~'), '.local', 'state', 'hla', 'loglabel')
+
+
+def _close_file(fil, *args):
+    """Close log file of a destroyed widget."""
+    fil.close()
+
+
+class _LogModel(QAbstractListModel):
+    """Fixed capacity list model.
+
+    Entries are (text, level) tuples. When the capacity is reached the
+    oldest entry is removed for each new one.
     """
-    A QListWidget with support for Channels and more from PyDM.
+
+    def __init__(self, capacity, colors, parent=None):
+        """."""
+        super().__init__(parent)
+        self._entries = _deque(maxlen=capacity)
+        self._colors = colors
+
+    @property
+    def capacity(self):
+        """Return maximum number of entries."""
+        return self._entries.maxlen
+
+    @capacity.setter
+    def capacity(self, value):
+        value = max(int(value), 1)
+        exceed = len(self._entries) - value
+        if exceed > 0:
+            self.beginRemoveRows(QModelIndex(), 0, exceed-1)
+            self._entries = _deque(
+                list(self._entries)[exceed:], maxlen=value)
+            self.endRemoveRows()
+        else:
+            self._entries = _deque(self._entries, maxlen=value)
+
+    def rowCount(self, parent=QModelIndex()):
+        """."""
+        if parent.isValid():
+            return 0
+        return len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """."""
+        if not index.isValid() or index.row() >= len(self._entries):
+            return None
+        text, level = self._entries[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return text
+        if role == Qt.ForegroundRole and level:
+            return self._colors[level]
+        return None
+
+    def entry(self, row):
+        """Return (text, level) of entry at `row`."""
+        return self._entries[row]
+
+    def text(self, row):
+        """Return text of entry at `row`."""
+        return self._entries[row][0]
+
+    def append(self, text, level=''):
+        """Append entry, removing the oldest one if full."""
+        if len(self._entries) == self._entries.maxlen:
+            self.beginRemoveRows(QModelIndex(), 0, 0)
+            self._entries.popleft()
+            self.endRemoveRows()
+        row = len(self._entries)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._entries.append((text, level))
+        self.endInsertRows()
+
+    def replace_last(self, text, level=''):
+        """Replace last entry."""
+        if not self._entries:
+            self.append(text, level)
+            return
+        self._entries[-1] = (text, level)
+        idx = self.index(len(self._entries)-1)
+        self.dataChanged.emit(idx, idx)
+
+    def clear(self):
+        """Remove all entries."""
+        self.beginResetModel()
+        self._entries.clear()
+        self.endResetModel()
+
+
+class PyDMLogLabel(QListView, TextFormatter, PyDMWidget, DisplayFormat):
+    """
+    A QListView with support for Channels and more from PyDM.
+
+    Only the last `bufferSize` entries are kept. If `persistLog` is
+    enabled, entries are also appended to a file per channel in LOGDIR
+    and reloaded when a new widget is created for the same channel.
+    The file is locked by the widget writing to it, other widgets of the
+    same channel, in this or other processes, only load its history.
 
     Parameters
     ----------
@@ -21,6 +127,11 @@ class PyDMLogLabel(QListWidget, TextFormatter, PyDMWidget, DisplayFormat):
         The parent widget for the Label
     init_channel : str, optional
         The channel to be used by the widget.
+    replace : list of str, optional
+        If a new message and the last one both contain one of these
+        strings (case insensitive), the last entry is replaced.
+    persist : bool, optional
+        Whether to persist the log on disk. Default is False.
     """
 
     DisplayFormat = DisplayFormat
@@ -29,18 +140,44 @@ class PyDMLogLabel(QListWidget, TextFormatter, PyDMWidget, DisplayFormat):
     errorcolor = QColor(255, 0, 0)
     warncolor = QColor(200, 200, 0)
 
-    def __init__(self, parent=None, init_channel=None, replace=None):
-        QListWidget.__init__(self, parent)
+    def __init__(self, parent=None, init_channel=None, replace=None,
+                 persist=False):
+        QListView.__init__(self, parent)
+        self._model = _LogModel(
+            1000, {'err': self.errorcolor, 'warn': self.warncolor}, self)
+        self.setModel(self._model)
+        self.setUniformItemSizes(True)
         PyDMWidget.__init__(self, init_channel=init_channel)
-        self._buffer_size = 1000
         self._prepend_date_time = True
         self._display_format_type = DisplayFormat.String
         self._string_encoding = "utf_8"
         self._date_time_fmt = '%Y/%m/%d-%H:%M:%S'
         self._replace = list() if replace is None else replace
+        self._replace_pats = [
+            _re.compile(_re.escape(r), _re.I) for r in self._replace]
+        self._last_matches = frozenset()
+        self._logfile = None
+        self._logfile_closer = None
+        self._restored_stamp = None
 
         channel = '' if init_channel is None else init_channel
         self._plugin_conns = plugin_for_address(channel).connections
+        if persist:
+            self.persistLog = True
+
+    def count(self):
+        """Return number of entries."""
+        return self._model.rowCount()
+
+    def text(self, row):
+        """Return text of entry at `row`."""
+        return self._model.text(row)
+
+    def clear(self):
+        """Remove all entries."""
+        self._model.clear()
+        self._last_matches = frozenset()
+        self._write_record('c')
 
     def value_changed(self, new_value):
         """
@@ -62,53 +199,155 @@ class PyDMLogLabel(QListWidget, TextFormatter, PyDMWidget, DisplayFormat):
             string_encoding=self._string_encoding,
             widget=self)
 
-        if self.count() > self._buffer_size:
-            self.clear()
+        timestamp = None
+        if self._prepend_date_time or self._logfile is not None:
+            timestamp = self._plugin_conns[self.channel].pv.timestamp
+        if self._restored_stamp is not None:
+            # value received on connection may already be in the history
+            restored, self._restored_stamp = self._restored_stamp, None
+            if timestamp is not None and timestamp <= restored:
+                return
 
         prefix = ''
         if self._prepend_date_time:
-            timestamp = self._plugin_conns[self.channel].pv.timestamp
             prefix += _Time(timestamp).strftime(self._date_time_fmt)
             prefix += ' '
+        level, matches = '', frozenset()
         # If the value is a string, just display it as-is, no formatting
         # needed.
-        item = None
         if isinstance(new_value, str):
-            if self._replace:
-                last_item = self.item(self.count()-1)
-                if last_item is not None:
-                    last_text = last_item.text().lower()
-                    for r in self._replace:
-                        if r.lower() in new_value.lower() and \
-                                r.lower() in last_text.lower():
-                            item = last_item
-                            item.setText(prefix + new_value)
-                            return
-            if item is None:
-                item = QListWidgetItem(prefix + new_value)
-            if new_value.lower().startswith(('err', 'fatal')):
-                item.setForeground(self.errorcolor)
-            elif new_value.lower().startswith('warn'):
-                item.setForeground(self.warncolor)
+            text = prefix + new_value
+            matches = self._get_replace_matches(new_value)
+            start = new_value[:5].lower()
+            if start.startswith(('err', 'fatal')):
+                level = 'err'
+            elif start.startswith('warn'):
+                level = 'warn'
         # If the value is an enum, display the appropriate enum string for
         # the value.
         elif self.enum_strings is not None and isinstance(new_value, int):
             try:
-                item = QListWidgetItem(prefix + self.enum_strings[new_value])
+                text = prefix + self.enum_strings[new_value]
             except IndexError:
-                item = QListWidgetItem("**INVALID**")
+                text = "**INVALID**"
         # If the value is a number (float or int), display it using a
         # format string if necessary.
         elif isinstance(new_value, (int, float)):
-            item = QListWidgetItem(prefix+self.format_string.format(new_value))
+            text = prefix + self.format_string.format(new_value)
         # If you made it this far, just turn whatever the heck the value
         # is into a string and display it.
         else:
-            item = QListWidgetItem(prefix + str(new_value))
+            text = prefix + str(new_value)
 
-        if item is not None:
-            self.addItem(item)
+        op = 'r' if matches & self._last_matches else 'a'
+        self._last_matches = matches
+        if op == 'r':
+            self._model.replace_last(text, level)
+        else:
+            self._model.append(text, level)
+            self.scrollToBottom()
+        self._write_record(op, level, timestamp, text)
+
+    def _get_replace_matches(self, text):
+        return frozenset(
+            i for i, pat in enumerate(self._replace_pats) if pat.search(text))
+
+    def _get_logfile_name(self):
+        name = _re.sub(r'[^\w.-]+', '_', self.channel or '')
+        if not name:
+            return None
+        return _os.path.join(LOGDIR, name + '.log')
+
+    def _open_logfile(self):
+        fname = self._get_logfile_name()
+        if fname is None:
+            return
+        try:
+            _os.makedirs(LOGDIR, exist_ok=True)
+            fil = open(fname, 'a+')
+        except OSError as err:
+            _log.warning('Could not open log file %s: %s', fname, err)
+            return
+        try:
+            # only one widget, in any process, writes to the file
+            _fcntl.flock(fil, _fcntl.LOCK_EX | _fcntl.LOCK_NB)
+        except OSError:
+            if self._model.rowCount() == 0:
+                self._load_logfile(fil)
+            fil.close()
+            _log.info('Log file %s is in use, it will not be written.', fname)
+            return
+        try:
+            nr_lines = 0
+            if self._model.rowCount() == 0:
+                nr_lines = self._load_logfile(fil)
+            if nr_lines > 2*self._model.capacity:
+                # keep file size bounded by rewriting only what is shown
+                fil.truncate(0)
+                for row in range(self._model.rowCount()):
+                    text, level = self._model.entry(row)
+                    fil.write(self._format_record(
+                        'a', level, self._restored_stamp, text))
+                fil.flush()
+        except OSError as err:
+            _log.warning('Could not read log file %s: %s', fname, err)
+            fil.close()
+            return
+        self._logfile = fil
+        # widget methods can not be called once it is destroyed
+        self._logfile_closer = _partial(_close_file, self._logfile)
+        self.destroyed.connect(self._logfile_closer)
+
+    def _close_logfile(self):
+        if self._logfile is None:
+            return
+        self.destroyed.disconnect(self._logfile_closer)
+        self._logfile_closer = None
+        self._logfile.close()
+        self._logfile = None
+
+    def _load_logfile(self, fil):
+        nr_lines = 0
+        stamp = None
+        fil.seek(0)
+        for line in fil:
+            nr_lines += 1
+            try:
+                op, level, stmp, text = line.rstrip('\n').split('\t', 3)
+                text = _json.loads(text) if text else ''
+            except ValueError:
+                continue
+            if op == 'c':
+                self._model.clear()
+                continue
+            if op == 'r':
+                self._model.replace_last(text, level)
+            else:
+                self._model.append(text, level)
+            stamp = float(stmp) if stmp else stamp
+        if self._model.rowCount():
+            self._last_matches = self._get_replace_matches(
+                self._model.text(-1))
             self.scrollToBottom()
+        self._restored_stamp = stamp
+        return nr_lines
+
+    @staticmethod
+    def _format_record(op, level='', timestamp=None, text=''):
+        stmp = '' if timestamp is None else '{:.6f}'.format(timestamp)
+        text = _json.dumps(text) if text else ''
+        return '\t'.join((op, level, stmp, text)) + '\n'
+
+    def _write_record(self, op, level='', timestamp=None, text=''):
+        if self._logfile is None:
+            return
+        try:
+            self._logfile.write(
+                self._format_record(op, level, timestamp, text))
+            self._logfile.flush()
+        except (OSError, ValueError) as err:
+            _log.warning('Could not write log file: %s', err)
+            self._close_logfile()
 
     @Property(DisplayFormat)
     def displayFormat(self):
@@ -143,26 +382,26 @@ class PyDMLogLabel(QListWidget, TextFormatter, PyDMWidget, DisplayFormat):
         """
         The maximum number of entries to show.
 
-        When maximum is exceeded the widget is cleared.
+        When maximum is exceeded the oldest entries are removed.
 
         Returns
         -------
         int
         """
-        return int(self._buffer_size)
+        return self._model.capacity
 
     @bufferSize.setter
     def bufferSize(self, value):
         """
         The maximum number of entries to show.
 
-        When maximum is exceeded the widget is cleared.
+        When maximum is exceeded the oldest entries are removed.
 
         Parameters
         ----------
         value : int
         """
-        self._buffer_size = int(value)
+        self._model.capacity = value
 
     @Property(bool)
     def prependDateTime(self):
@@ -207,3 +446,30 @@ class PyDMLogLabel(QListWidget, TextFormatter, PyDMWidget, DisplayFormat):
         value : str
         """
         self._date_time_fmt = str(value)
+
+    @Property(bool)
+    def persistLog(self):
+        """
+        Define if the log is appended to a file and restored from it.
+
+        Returns
+        -------
+        bool
+        """
+        return self._logfile is not None
+
+    @persistLog.setter
+    def persistLog(self, value):
+        """
+        Define if the log is appended to a file and restored from it.
+
+        Parameters
+        ----------
+        value : bool
+        """
+        if bool(value) == self.persistLog:
+            return
+        if value:
+            self._open_logfile()
+        else:
+            self._close_logfile()
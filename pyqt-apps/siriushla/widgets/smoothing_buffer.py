@@ -0,0 +1,91 @@
+"""Ring buffer of frames with running sum."""
+
+import numpy as _np
+
+
+class SmoothingBuffer:
+    """Ring buffer of frames, smoothed by average or median.
+
+    Frames, waveforms or images, are kept in a preallocated array
+    together with their running sum, so the average costs one frame per
+    update regardless of the buffer size. The median is only computed
+    when requested. A frame with a different shape restarts the buffer.
+    """
+
+    def __init__(self, size=1):
+        """Init."""
+        self._size = max(int(size), 1)
+        self._buffer = None
+        self._sum = None
+        self._idx = 0
+        self._count = 0
+
+    @property
+    def size(self):
+        """Maximum number of frames."""
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = max(int(value), 1)
+        if self._buffer is None:
+            return
+        # keep the newest frames
+        count = min(self._count, self._size)
+        idcs = (self._idx - count + _np.arange(count)) % len(self._buffer)
+        buffer = _np.zeros((self._size, ) + self._buffer.shape[1:])
+        buffer[:count] = self._buffer[idcs]
+        self._buffer = buffer
+        self._count = count
+        self._idx = count % self._size
+        _np.sum(buffer[:count], axis=0, out=self._sum)
+
+    @property
+    def shape(self):
+        """Shape of frames in buffer, None if no frame was added."""
+        return None if self._buffer is None else self._buffer.shape[1:]
+
+    @property
+    def count(self):
+        """Number of frames in buffer."""
+        return self._count
+
+    def append(self, data):
+        """Add frame, dropping the oldest one if buffer is full."""
+        data = _np.asarray(data)
+        if self._buffer is None or \
+                self._buffer.shape != (self._size, ) + data.shape:
+            self._buffer = _np.zeros((self._size, ) + data.shape)
+            self._sum = _np.zeros(data.shape)
+            self._idx = 0
+            self._count = 0
+
+        slot = self._buffer[self._idx]
+        if self._count == self._size:
+            self._sum -= slot
+        slot[:] = data
+        self._sum += slot
+        self._count = min(self._count + 1, self._size)
+        self._idx = (self._idx + 1) % self._size
+        if not self._idx:
+            # avoid accumulation of rounding errors in running sum
+            _np.sum(self._buffer[:self._count], axis=0, out=self._sum)
+
+    def reset(self):
+        """Remove all frames."""
+        self._idx = 0
+        self._count = 0
+        if self._sum is not None:
+            self._sum[:] = 0
+
+    def last(self):
+        """Return newest frame."""
+        return self._buffer[(self._idx - 1) % self._size].copy()
+
+    def average(self):
+        """Return average of frames."""
+        return self._sum / self._count
+
+    def median(self):
+        """Return median of frames."""
+        return _np.median(self._buffer[:self._count], axis=0)
@@ -16,6 +16,8 @@ from pydm.widgets.colormaps import cmaps, cmap_names, PyDMColorMap
 from pydm.widgets.base import PyDMWidget
 from pydm.widgets.image import ReadingOrder
 
+from .windows import register_plot_widget
+
 logger = logging.getLogger(__name__)
 
 
@@ -257,6 +259,7 @@ class SiriusSpectrogramView(
         """Initialize widget."""
         GraphicsLayoutWidget.__init__(self, parent)
         PyDMWidget.__init__(self)
+        register_plot_widget(self)
         self.thread = None
         self._imagechannel = None
         self._xaxischannel = None
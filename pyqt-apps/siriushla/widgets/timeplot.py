@@ -13,6 +13,8 @@ from pydm.widgets.timeplot import TimePlotCurveItem, PyDMTimePlot, \
 
 from siriuspy.clientarch import ClientArchiver, Time
 
+from .windows import register_plot_widget
+
 
 class SiriusTimePlotItem(TimePlotCurveItem):
     """Reimplement to do not receive inf values."""
@@ -100,6 +102,7 @@ class SiriusTimePlot(PyDMTimePlot):
         super().__init__(*args, **kws)
         self._filled_with_arch_data = dict()
         self._show_tooltip = show_tooltip
+        register_plot_widget(self)
 
         self.vb2 = ViewBox()
         self.plotItem.scene().addItem(self.vb2)
@@ -259,7 +262,17 @@ class SiriusTimePlot(PyDMTimePlot):
             return
         datax, datay = data
         self.fill_curve_buffer(curve, datax, datay, factor)
+        self.register_archdata_curve(
+            curve, pvname, factor, process_type, process_bin_intvl)
+
+    def register_archdata_curve(
+            self, curve, pvname, factor=None, process_type='',
+            process_bin_intvl=None):
+        """Register curve to be filled with archiver data on time span change.
 
+        Use it for curves filled with archiver data by other means than
+        fill_curve_with_archdata.
+        """
         self._filled_with_arch_data[pvname] = dict(
             curve=curve, factor=factor, process_type=process_type,
             process_bin_intvl=process_bin_intvl)
@@ -269,21 +282,110 @@ class SiriusTimePlot(PyDMTimePlot):
         nrpts = len(datax)
         if not nrpts:
             return
-        buff = _np.zeros((2, self.bufferSize), order='f', dtype=float)
         if nrpts > self.bufferSize:
             smpls2discard = nrpts - self.bufferSize
             datax = datax[smpls2discard:]
             datay = datay[smpls2discard:]
             nrpts = len(datax)
+        buff = self._get_curve_buffer(curve)
         firstsmpl2fill = self.bufferSize - nrpts
+        buff[:, :firstsmpl2fill] = 0
         buff[0, firstsmpl2fill:] = datax
         buff[1, firstsmpl2fill:] = datay
         if factor:
-            buff[1, :] /= factor
+            buff[1, firstsmpl2fill:] /= factor
+        self._set_curve_buffer_info(curve, buff, nrpts)
+
+    def update_curve_buffer(self, curve, datax, datay, factor=None):
+        """Update curve buffer with a new window of data.
+
+        The samples of the window already in the buffer are kept and only
+        the samples with newer timestamps are appended. Timestamps of
+        samples in the buffer are matched within half the sampling
+        interval. If the window does not continue the buffer, the buffer
+        is filled again.
+        """
+        nrpts = len(datax)
+        if nrpts > self.bufferSize:
+            smpls2discard = nrpts - self.bufferSize
+            datax = datax[smpls2discard:]
+            datay = datay[smpls2discard:]
+            nrpts = len(datax)
+        nracc = curve.points_accumulated
+        buff = curve.data_buffer
+        if nrpts < 2 or not nracc or buff.shape != (2, self.bufferSize):
+            self.fill_curve_buffer(curve, datax, datay, factor)
+            return
+
+        oldx = buff[0, -nracc:]
+        oldy = buff[1, -nracc:]
+        tol = (datax[1] - datax[0]) / 2
+        first = _np.searchsorted(oldx, datax[0] - tol)
+        nrkeep = nracc - first
+        nrnew = nrpts - nrkeep
+        match = 0 < nrkeep <= nrpts
+        if match:
+            # compare first and last kept samples
+            ends = _np.array([datay[0], datay[nrkeep-1]], dtype=float)
+            if factor:
+                ends /= factor
+            match = abs(oldx[first] - datax[0]) <= tol and \
+                abs(oldx[-1] - datax[nrkeep-1]) <= tol and \
+                oldy[first] == ends[0] and oldy[-1] == ends[1]
+        if match and nrnew:
+            match = datax[nrkeep] > oldx[-1]
+        if not match:
+            self.fill_curve_buffer(curve, datax, datay, factor)
+            return
+        if not first and not nrnew:
+            return
+
+        # extrema are updated with the new samples, unless they were in
+        # the discarded samples
+        ymin, ymax = curve._min_y_value, curve._max_y_value
+        newmin = newmax = ymin is None
+        if first and ymin is not None:
+            drop = oldy[:first]
+            newmin = _np.nanmin(drop) <= ymin
+            newmax = _np.nanmax(drop) >= ymax
+
+        size = self.bufferSize
+        if nrnew:
+            buff[:, size-nrpts:size-nrnew] = buff[:, size-nrkeep:]
+            buff[0, size-nrnew:] = datax[nrkeep:]
+            buff[1, size-nrnew:] = datay[nrkeep:]
+            if factor:
+                buff[1, size-nrnew:] /= factor
+        if nracc > nrpts:
+            buff[:, size-nracc:size-nrpts] = 0
+        ally, newy = buff[1, size-nrpts:], buff[1, size-nrnew:]
+        if newmin:
+            ymin = _np.nanmin(ally)
+        elif nrnew:
+            ymin = min(ymin, _np.nanmin(newy))
+        if newmax:
+            ymax = _np.nanmax(ally)
+        elif nrnew:
+            ymax = max(ymax, _np.nanmax(newy))
+        self._set_curve_buffer_info(curve, buff, nrpts, ymin, ymax)
+
+    def _get_curve_buffer(self, curve):
+        buff = curve.data_buffer
+        if buff.shape != (2, self.bufferSize):
+            buff = _np.zeros((2, self.bufferSize), order='f', dtype=float)
+        return buff
+
+    @staticmethod
+    def _set_curve_buffer_info(curve, buff, nrpts, ymin=None, ymax=None):
+        datay = buff[1, -nrpts:]
+        if ymin is None:
+            ymin = _np.nanmin(datay)
+        if ymax is None:
+            ymax = _np.nanmax(datay)
         curve.data_buffer = buff
         curve.points_accumulated = nrpts
-        curve._min_y_value = min(datay)
-        curve._max_y_value = max(datay)
+        curve._min_y_value = ymin
+        curve._max_y_value = ymax
         curve.latest_value = datay[-1]
 
     def _resetBuffers(self):
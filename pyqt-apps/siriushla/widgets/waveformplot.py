@@ -1,8 +1,67 @@
 """Waveform plot widget."""
 
+import numpy as _np
+
+from qtpy.QtCore import Property
 from pyqtgraph import ViewBox
 
 from pydm.widgets import PyDMWaveformPlot
+from pydm.widgets.waveformplot import WaveformCurveItem
+
+from .windows import register_plot_widget
+
+
+class SiriusWaveformCurveItem(WaveformCurveItem):
+    """Waveform curve decimated for display.
+
+    When the curve has more points in view than pixels, each pixel shows
+    the min/max envelope of the points it spans (pyqtgraph 'peak'
+    downsampling), so peaks are preserved. Only points in the view range
+    are processed and the envelope is recomputed only on new data, zoom
+    or pan. Decimation requires increasing x values and is not applied
+    to curves with symbols, which show each sample.
+    """
+
+    DECIMATION_FACTOR = 1.0  # min/max pairs per pixel
+
+    def __init__(self, *args, **kwargs):
+        """Init."""
+        super().__init__(*args, **kwargs)
+        self.opts['autoDownsampleFactor'] = self.DECIMATION_FACTOR
+        self.opts['downsampleMethod'] = 'peak'
+        self._decimation = True
+        self._x_checked = None
+        self._x_increasing = True
+
+    @property
+    def decimation(self):
+        """Whether curve is decimated for display."""
+        return self._decimation
+
+    @decimation.setter
+    def decimation(self, value):
+        self._decimation = bool(value)
+        decim = self._can_decimate()
+        self.setDownsampling(auto=decim)
+        self.setClipToView(decim)
+
+    def redrawCurve(self):
+        """Update decimation state and redraw curve."""
+        decim = self._can_decimate()
+        self.opts['autoDownsample'] = decim
+        self.opts['clipToView'] = decim
+        super().redrawCurve()
+
+    def _can_decimate(self):
+        if not self._decimation or self.opts['symbol'] is not None:
+            return False
+        xwfm = self.x_waveform
+        if xwfm is None:
+            return True
+        if xwfm is not self._x_checked:
+            self._x_checked = xwfm
+            self._x_increasing = bool(_np.all(_np.diff(xwfm) > 0))
+        return self._x_increasing
 
 
 class SiriusWaveformPlot(PyDMWaveformPlot):
@@ -10,6 +69,7 @@ class SiriusWaveformPlot(PyDMWaveformPlot):
 
     def __init__(self, *args, **kwargs):
         """Init and change some configurations."""
+        self._decimation = True
         super().__init__(*args, **kwargs)
 
         # show auto adjust button
@@ -18,7 +78,28 @@ class SiriusWaveformPlot(PyDMWaveformPlot):
         # use pan mouse mode (3-button)
         self.plotItem.getViewBox().setMouseMode(ViewBox.PanMode)
 
+        register_plot_widget(self)
+
     @property
     def legend(self):
         """Legend object."""
         return self._legend
+
+    def getDecimation(self):
+        """Whether curves are decimated for display."""
+        return self._decimation
+
+    def setDecimation(self, value):
+        """Set whether curves are decimated for display."""
+        self._decimation = bool(value)
+        for curve in self._curves:
+            if isinstance(curve, SiriusWaveformCurveItem):
+                curve.decimation = self._decimation
+
+    decimation = Property(bool, getDecimation, setDecimation)
+
+    def createCurveItem(self, *args, **kwargs):
+        """Create curve decimated for display."""
+        curve = SiriusWaveformCurveItem(*args, **kwargs)
+        curve.decimation = self._decimation
+        return curve
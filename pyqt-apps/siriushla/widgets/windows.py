@@ -1,8 +1,10 @@
 """Sirius Windows module."""
+from weakref import WeakSet as _WeakSet
+
 from qtpy.QtGui import QKeySequence
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QEvent
 from qtpy.QtWidgets import QMainWindow, QDialog, QHBoxLayout, QApplication, \
-    QWidget, QLabel, QMenu, QPushButton, QGraphicsView, QScrollArea
+    QLabel, QMenu, QPushButton, QGraphicsView, QScrollArea
 import pyqtgraph as pg
 from pydm.connection_inspector import ConnectionInspector
 
@@ -11,6 +13,46 @@ from ..util import get_package_version
 from .matplotlib import MatplotlibCanvas
 
 
+_PLOT_WIDGETS = _WeakSet()
+
+
+def register_plot_widget(widget):
+    """Register pyqtgraph based widget to have its labels resized.
+
+    Fonts of other widgets follow the window font, but pyqtgraph labels
+    have their sizes defined in their styles. Sirius windows update the
+    registered widgets they contain when the font size is changed.
+    """
+    _PLOT_WIDGETS.add(widget)
+
+
+def _set_plot_fontsize(widget, fontsize_str):
+    if isinstance(widget, pg.PlotWidget):
+        # axes labels
+        for ax in widget.getPlotItem().axes.values():
+            sty = ax['item'].labelStyle
+            sty['font-size'] = fontsize_str
+            ax['item'].setLabel(text=None, **sty)
+        # legend
+        if widget.plotItem.legend:
+            legw = 0
+            for item in widget.plotItem.legend.items:
+                item[1].opts['size'] = fontsize_str
+                item[1].setText(text=item[1].text, **item[1].opts)
+                legw = max(legw, 20+item[1].width())
+            widget.plotItem.legend.updateSize()
+            widget.plotItem.legend.setFixedWidth(legw)
+        # title
+        wtitle = widget.plotItem.titleLabel
+        wtitle.opts['size'] = fontsize_str
+        wtitle.setText(text=wtitle.text, **wtitle.opts)
+    elif isinstance(widget, pg.GraphicsLayoutWidget):
+        for axis in (widget.xaxis, widget.yaxis):
+            sty = axis.labelStyle
+            sty['font-size'] = fontsize_str
+            axis.setLabel(text=None, **sty)
+
+
 def _create_siriuswindow(qt_type):
     """Create a _SiriusWindow that inherits from qt_type."""
     class _SiriusWindow(qt_type):
@@ -86,44 +128,44 @@ def _create_siriuswindow(qt_type):
             c.show()
 
         def changeFontSize(self):
-            """."""
+            """Apply application font size to window and its plots.
+
+            The font is set only on the window and propagated by Qt to
+            the children that do not define their own font size. The
+            central widget of main windows is hidden while the new
+            geometries are computed, so the window is repainted once.
+            """
             fontsize = self.app.font().pointSize()
+            fontsize_str = str(fontsize)+'pt'
             self.ensurePolished()
-            for w in self.findChildren(QWidget):
-                font = w.font()
+            central = self.centralWidget() \
+                if isinstance(self, QMainWindow) else None
+            if central is not None and not central.isVisible():
+                central = None
+            focus = self.app.focusWidget()
+            if central is not None:
+                central.hide()
+            try:
+                font = self.font()
                 font.setPointSize(fontsize)
-                w.setFont(font)
+                self.setFont(font)
+
+                # handle resizing of pyqtgraph plots labels
+                for wid in list(_PLOT_WIDGETS):
+                    try:
+                        if self.isAncestorOf(wid):
+                            _set_plot_fontsize(wid, fontsize_str)
+                    except RuntimeError:
+                        # underlying C++ object was deleted
+                        _PLOT_WIDGETS.discard(wid)
+                self.app.sendPostedEvents(None, QEvent.LayoutRequest)
+            finally:
+                if central is not None:
+                    central.show()
+                    if focus is not None and self.isAncestorOf(focus):
+                        focus.setFocus()
             self.adjustSize()
 
-            # handle resizing of pyqtgraph plots labels
-            fontsize_str = str(fontsize)+'pt'
-            for w in self.findChildren(pg.PlotWidget):
-                # axes labels
-                for ax in w.getPlotItem().axes.values():
-                    sty = ax['item'].labelStyle
-                    sty['font-size'] = fontsize_str
-                    ax['item'].setLabel(text=None, **sty)
-                # legend
-                if w.plotItem.legend:
-                    legw = 0
-                    for item in w.plotItem.legend.items:
-                        item[1].opts['size'] = fontsize_str
-                        item[1].setText(text=item[1].text, **item[1].opts)
-                        legw = max(legw, 20+item[1].width())
-                    w.plotItem.legend.updateSize()
-                    w.plotItem.legend.setFixedWidth(legw)
-                # title
-                wtitle = w.plotItem.titleLabel
-                wtitle.opts['size'] = fontsize_str
-                wtitle.setText(text=wtitle.text, **wtitle.opts)
-            for w in self.findChildren(pg.GraphicsLayoutWidget):
-                sty = w.xaxis.labelStyle
-                sty['font-size'] = fontsize_str
-                w.xaxis.setLabel(text=None, **sty)
-                sty = w.yaxis.labelStyle
-                sty['font-size'] = fontsize_str
-                w.yaxis.setLabel(text=None, **sty)
-
     return _SiriusWindow
 
 
@@ -0,0 +1,90 @@
+"""Test DCCTMonitor raw readings X axis."""
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from siriushla.sirius_application import SiriusApplication
+from siriushla.widgets import SiriusConnectionSignal
+
+EVG = 'AS-RaMO:TI-EVG'
+path = 'siriuspy.search.LLTimeSearch.get_evg_name'
+
+with mock.patch(path, return_value=EVG):
+    from siriushla.as_di_dccts.graphics import DCCTMonitor
+
+
+def _no_get(*args, **kws):
+    raise AssertionError('synchronous get during redraw')
+
+
+class TestRawXAxis(unittest.TestCase):
+    """Test X axis is computed from monitored values only."""
+
+    def setUp(self):
+        """Create monitor with fake PVs, fed through monitor slots."""
+        self._app = SiriusApplication.instance() or SiriusApplication()
+        with mock.patch(path, return_value=EVG):
+            self.mon = DCCTMonitor(prefix='FAKE-', device='BO-35D:DI-DCCT')
+        self.curve = self.mon.wavecurve
+        self.curve.receiveXWaveform = mock.Mock()
+
+        # no CA get, direct or through the cached channel values
+        for target in ('epics.ca.get', 'epics.PV.get'):
+            patch = mock.patch(target, side_effect=_no_get)
+            self.addCleanup(patch.stop)
+            patch.start()
+        patch = mock.patch.object(
+            SiriusConnectionSignal, 'getvalue', side_effect=_no_get)
+        self.addCleanup(patch.stop)
+        patch.start()
+
+    def _monitor(self, chan, value):
+        chan._value_slot(value)
+
+    def _set_all(self):
+        self._monitor(self.mon._evnt_dly, 1000.0)
+        self._monitor(self.mon._trig_dly, 500.0)
+        self._monitor(self.mon._meas_per, 0.002)
+        self._monitor(self.mon._smpl_cnt, 100)
+
+    def test_axis_from_monitors(self):
+        """Axis is built once all inputs are received."""
+        self._set_all()
+        self.curve.receiveXWaveform.assert_called_once()
+        xdata = self.curve.receiveXWaveform.call_args[0][0]
+        np.testing.assert_allclose(xdata, np.linspace(1.5, 3.5, 100))
+
+    def test_no_rebuild_on_same_values(self):
+        """Repeated values do not rebuild the axis."""
+        self._set_all()
+        self._set_all()
+        self.mon.updateRawXAxis()
+        self.assertEqual(self.curve.receiveXWaveform.call_count, 1)
+
+    def test_rebuild_on_change(self):
+        """Axis is rebuilt when an input or the axis type changes."""
+        self._set_all()
+        self._monitor(self.mon._smpl_cnt, 200)
+        self.assertEqual(self.curve.receiveXWaveform.call_count, 2)
+        self.assertEqual(
+            len(self.curve.receiveXWaveform.call_args[0][0]), 200)
+        self.mon.cb_timeaxis.setChecked(False)
+        self.assertEqual(self.curve.receiveXWaveform.call_count, 3)
+        np.testing.assert_array_equal(
+            self.curve.receiveXWaveform.call_args[0][0], np.arange(200))
+
+    def test_redraw_without_get(self):
+        """New raw readings are drawn without synchronous gets."""
+        self._set_all()
+        self.mon._acq_mode = 1
+        self.mon._acq_fastnrsamp = 100
+        self.mon._acq_normalnrsamp = 100
+        for _ in range(3):
+            self.mon._updateRawBuffer(np.ones(100))
+        self.mon.wavegraph.redrawPlot()
+        self.assertEqual(self.mon.smoothBufferSize, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Test quadrupole scan record and replay."""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+EVG = 'AS-RaMO:TI-EVG'
+path = 'siriuspy.search.LLTimeSearch.get_evg_name'
+
+with mock.patch(path, return_value=EVG):
+    from siriushla.as_ap_measure.quadscan import QuadScanEngine, \
+        QuadScanReplaySource, ScanRecorder, load_scan_record
+
+
+class _FakeSource:
+    """Scan source whose beam size depends on the current."""
+
+    def __init__(self, no_frames_at=()):
+        self._no_frames_at = no_frames_at
+        self._curr = None
+
+    @property
+    def initial_current(self):
+        return 0.0
+
+    def set_current(self, value):
+        self._curr = value
+
+    def wait_settled(self, timeout):
+        return True
+
+    def wait_sample(self, timeout):
+        if self._curr in self._no_frames_at:
+            return None
+        sig = 1e-4 * (1 + self._curr**2)
+        return self._curr + 1e-3, (0.0, sig, 0.0, 2*sig)
+
+    def close(self):
+        pass
+
+
+class TestQuadScanReplay(unittest.TestCase):
+    """Test a recorded scan is replayed through the scan engine."""
+
+    CURRENTS = [1.0, 2.0, 3.0, 4.0]
+
+    def setUp(self):
+        """Record a scan where the second step has no frames."""
+        fd, self.fname = tempfile.mkstemp(suffix='.qscan')
+        os.close(fd)
+        self.addCleanup(os.remove, self.fname)
+
+        recorder = ScanRecorder(self.fname, meta=dict(
+            plane='y', initial_current=0.0))
+        self.rec_engine = QuadScanEngine(
+            _FakeSource(no_frames_at=(2.0, )), self.CURRENTS, samples=3,
+            outliers=0, max_size=1, plane='y', recorder=recorder,
+            sample_timeout=0, max_sample_fails=1)
+        self.assertTrue(self.rec_engine.run())
+        recorder.close()
+
+    def test_skipped_step_not_recorded(self):
+        """Only steps with samples are written to file."""
+        meta, data = load_scan_record(self.fname)
+        self.assertEqual(meta['plane'], 'y')
+        np.testing.assert_array_equal(np.unique(data['step']), [0, 2, 3])
+
+    def test_replay(self):
+        """Replay gives the same measurement, last step included."""
+        source = QuadScanReplaySource(self.fname)
+        np.testing.assert_allclose(source.currents, [1.0, 3.0, 4.0])
+        engine = QuadScanEngine(
+            source, source.currents, samples=3, outliers=0, max_size=1,
+            plane=source.meta['plane'], sample_timeout=0,
+            max_sample_fails=1)
+        self.assertTrue(engine.run())
+        np.testing.assert_allclose(
+            engine.I_meas, self.rec_engine.I_meas, rtol=1e-6)
+        np.testing.assert_allclose(
+            engine.sigma, self.rec_engine.sigma, rtol=1e-6)
+        self.assertAlmostEqual(engine.I_meas[-1], 4.001, places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()